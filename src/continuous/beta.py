@@ -3,31 +3,40 @@ import numpy as np
 
 from src.continuous.gamma import GammaDist
 from src.prob_distribution import ProbDist
+from src.sampling.inversion import InterpolationTable
 from src.spaces.spaces1d_leafs import ContinuousSpace
+from src.special import betainc, gammaln, xlog1py, xlogy
 
 
 class BetaDist(ProbDist):
     """Simple beta distribution."""
 
-    def __init__(self, a = 1, b = 1):
+    # the quantile function is a table for scalar parameters
+    batch_ppf = False
+
+    def __init__(self, a = 1, b = 1, gen = None):
         """Create Beta(a,b) distribution.
 
         :param a First shape parameter of beta
         :param b Second shape parameter of beta
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
-        assert a > 0 and b > 0
+        assert np.all(np.greater(a, 0)) and np.all(np.greater(b, 0))
 
         # save params
         self.a = a
         self.b = b
 
-        # create two distributions when one wants to sample
-        self.GaG = GammaDist(self.a, 1)
-        self.GbG = GammaDist(self.b, 1)
+        # the interpolation table of the quantile function, created on first use
+        self.ppf_table = None
 
         # define the space of the distribution
-        super().__init__(ContinuousSpace(0, 1))
+        super().__init__(ContinuousSpace(0, 1), gen, (a, b))
+
+        # create two distributions when one wants to sample
+        self.GaG = GammaDist(np.broadcast_to(a, self.batch_shape), 1, gen=self.gen)
+        self.GbG = GammaDist(np.broadcast_to(b, self.batch_shape), 1, gen=self.gen)
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -44,7 +53,7 @@ class BetaDist(ProbDist):
 
         a = self.a
         b = self.b
-        t = m.gamma(a + b) * m.gamma(a + k) / (m.gamma(a + k + b) * m.gamma(a))
+        t = np.exp(gammaln(a + b) + gammaln(a + k) - gammaln(a + k + b) - gammaln(a))
         return t
 
     def var(self):
@@ -56,32 +65,66 @@ class BetaDist(ProbDist):
         b = self.b
         return (a*b) / ((a + b) ** 2 * (a + b + 1))
 
-    def c_pdf(self, x):
+    def c_pdf(self, x, out = None):
         """This method calculates the density Beta(x|a,b).
 
         :param x Which value should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability this element occurs.
         """
 
-        assert np.all([np.logical_and(np.greater_equal(x, 0), np.greater_equal(1, x))])
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density Beta(x|a,b).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
 
         a = self.a
         b = self.b
-        bab = m.gamma(a + b) / (m.gamma(a) * m.gamma(b))
-        xa = np.power(x, (a - 1))
-        xb = np.power(1 - x, (b - 1))
-        return bab * xa * xb
+        lbab = gammaln(a) + gammaln(b) - gammaln(a + b)
+        return xlogy(a - 1, x) + xlog1py(b - 1, np.negative(x)) - lbab
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from Beta(a,b) by using acceptance rejection distributions.
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ Beta(a,b).
         """
 
+        out = self.buffer(num_samples, out, dtype)
+
         # create gamma distributed vars
-        y1 = self.GaG.sample(num_samples)
-        y2 = self.GaG.sample(num_samples)
+        y1 = self.GaG.sample(num_samples, out)
+        y2 = self.GbG.sample(num_samples)
+
+        # transform in place
+        y2 += y1
+        return np.divide(y1, y2, out=y1)
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Beta(a,b).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        return betainc(self.a, self.b, np.clip(x, 0, 1))
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Beta(a,b).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        # the table is built for scalar parameters
+        assert self.batch_shape == ()
+        if self.ppf_table is None:
+            self.ppf_table = InterpolationTable(self.cdf, self._density, 0, 1, self.expectation(), m.sqrt(self.var()))
 
-        # transform
-        return y1 / (y1 + y2)
+        return self.ppf_table.ppf(u)
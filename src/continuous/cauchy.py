@@ -1,4 +1,3 @@
-import math as m
 import numpy as np
 
 from src.continuous.normal import NormalDist
@@ -9,11 +8,12 @@ from src.spaces.spaces1d_leafs import ContinuousSpace
 class CauchyDist(ProbDist):
     """Simple cauchy distribution."""
 
-    def __init__(self, loc = 1, scale = 1):
+    def __init__(self, loc = 1, scale = 1, gen = None):
         """Creates Cauchy(loc, scale) distribution.
 
         :param loc Location of the distribution.
         :param scale Scale of the distribution
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
@@ -21,31 +21,68 @@ class CauchyDist(ProbDist):
         self.scale = scale
 
         # create generator
-        self.NG = NormalDist()
-        super().__init__(ContinuousSpace(-np.inf, np.inf))
+        super().__init__(ContinuousSpace(-np.inf, np.inf), gen, (loc, scale))
+        self.NG = NormalDist(gen=self.gen)
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from Cauchy(mean,scale) by using ratio of normals.
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ Cauchy(mean,scale).
         """
 
+        out = self.buffer(num_samples, out, dtype)
+
         # create gamma distributed vars
-        y1 = self.NG.sample(num_samples)
-        y2 = self.NG.sample(num_samples)
+        size = num_samples * self.batch_size
+        y1 = self.NG.sample(size)
+        y2 = self.NG.sample(size)
 
-        # transform
-        return self.scale * (y1 / y2) + self.loc
+        # transform in place
+        shape = self.sample_shape(num_samples)
+        X = np.divide(y1.reshape(shape), y2.reshape(shape), out=out)
+        X *= self.scale
+        X += self.loc
+        return X
 
-    def c_pdf(self, x):
+    def c_pdf(self, x, out = None):
         """This method calculates the density Cauchy(mean,scale).
 
         :param x Which value should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability this element occurs.
         """
 
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density Cauchy(mean,scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
+
         loc = self.loc
         scale = self.scale
-        v = m.pi * self.scale * (1 + np.square((x - loc) / scale))
-        return 1 / v
+        return -np.log(np.pi * scale) - np.log1p(np.square(np.subtract(x, loc) / scale))
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Cauchy(mean,scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        return 0.5 + np.arctan(np.subtract(x, self.loc) / self.scale) / np.pi
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Cauchy(mean,scale).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        x = self.loc + self.scale * np.tan(np.pi * np.subtract(u, 0.5))
+        return np.where(np.equal(u, 0), -np.inf, np.where(np.equal(u, 1), np.inf, x))
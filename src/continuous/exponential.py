@@ -1,7 +1,7 @@
 import math as m
 import numpy as np
 
-from src.continuous.uniform import UniformDist
+from src.continuous.ziggurat import exp_ziggurat
 from src.prob_distribution import ProbDist
 from src.spaces.spaces1d_leafs import ContinuousSpace
 
@@ -9,17 +9,20 @@ from src.spaces.spaces1d_leafs import ContinuousSpace
 class ExpDist(ProbDist):
     """Simple exponential distribution."""
 
-    def __init__(self, rate = 1):
+    def __init__(self, rate = 1, gen = None, method = 'inversion'):
         """Create Exp(rate) distribution.
 
         :param rate First shape parameter of exp
+        :param gen The uniform generator to sample from, None for the shared one.
+        :param method Either 'inversion' or 'ziggurat'.
         """
 
-        assert rate > 0
+        assert np.all(np.greater(rate, 0))
+        assert method in ['inversion', 'ziggurat']
 
         self.rate = rate
-        self.UG = UniformDist()
-        super().__init__(ContinuousSpace(0, np.inf, open_brackets=False))
+        self.method = method
+        super().__init__(ContinuousSpace(0, np.inf, open_brackets=False), gen, (rate,))
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -43,24 +46,66 @@ class ExpDist(ProbDist):
 
         return 1 / self.rate ** 2
 
-    def c_pdf(self, x):
+    def c_pdf(self, x, out = None):
         """This method calculates the density Exp(x|rate).
 
         :param x Which value should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability this element occurs.
         """
 
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density Exp(x|rate).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
+
         rate = self.rate
-        return rate * np.exp(-rate * x)
+        return np.log(rate) - np.multiply(rate, x)
 
-    def sample(self, num_samples = 1):
-        """Generate random numbers from Exp(rate) by using inverse-transform method.
+    def sample(self, num_samples = 1, out = None, dtype = None):
+        """Generate random numbers from Exp(rate) by using inverse-transform method
+        or the ziggurat method.
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns A random number from Exp(rate).
         """
 
-        # generate result list and uniform samples
+        out = self.buffer(num_samples, out, dtype)
+
         rate = self.rate
-        U = self.UG.sample(num_samples)
-        return (-1 / rate) * np.log(U)
+        if self.method == 'ziggurat':
+            E = exp_ziggurat().sample(self.gen, num_samples * self.batch_size)
+            X = self.write(E.reshape(self.sample_shape(num_samples)), out)
+            X /= rate
+            return X
+
+        # generate uniform samples and transform them in place
+        U = self.uniforms(num_samples, out)
+        np.log(U, out=U)
+        U *= -1 / rate
+        return U
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Exp(rate).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        return -np.expm1(-self.rate * np.maximum(x, 0))
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Exp(rate).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        with np.errstate(divide='ignore'):
+            return -np.log1p(np.negative(u)) / self.rate
@@ -1,26 +1,35 @@
-import math as m
 import numpy as np
 
 from src.continuous.beta import BetaDist
 from src.prob_distribution import ProbDist
+from src.sampling.inversion import InterpolationTable
 from src.spaces.spaces1d_leafs import ContinuousSpace
+from src.special import betainc, gammaln, xlogy
 
 
 class FDist(ProbDist):
     """Simple F distribution."""
 
-    def __init__(self, m = 1, n = 1):
+    # the quantile function is a table for scalar parameters
+    batch_ppf = False
+
+    def __init__(self, m = 1, n = 1, gen = None):
         """Create F(m,n) distribution.
 
         :param m Degrees of freedom
         :param n Degrees of freedom
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
         self.m = m
         self.n = n
-        self.BG = BetaDist(m / 2, n / 2)
-        super().__init__(ContinuousSpace(0, np.inf, open_brackets=False))
+
+        # the interpolation table of the quantile function, created on first use
+        self.ppf_table = None
+
+        super().__init__(ContinuousSpace(0, np.inf, open_brackets=False), gen, (m, n))
+        self.BG = BetaDist(np.divide(m, 2), np.divide(n, 2), gen=self.gen)
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -38,38 +47,74 @@ class FDist(ProbDist):
         m = self.m
         return (2 * n ** 2 * (m + n - 2)) / (m * (n - 2) ** 2 * (n - 4))
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from F(m,n) by using a beta generator.
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ F(m,n).
         """
 
+        out = self.buffer(num_samples, out, dtype)
+
         # generate samples
-        B = self.BG.sample(num_samples)
+        B = self.BG.sample(num_samples, out)
 
-        # transform
-        return self.n * B / (self.m * (1 - B))
+        # transform in place
+        D = np.subtract(1, B)
+        D *= self.m
+        B *= self.n
+        return np.divide(B, D, out=B)
 
-    def c_pdf(self, x):
+    def c_pdf(self, x, out = None):
         """This method calculates the density F(m,n).
 
         :param x Which value should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability this element occurs.
         """
 
-        # only support for positive x
-        assert x >= 0
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density F(m,n).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
 
         # shortcuts
-        m_dof = self.m
-        n_dof = self.n
-        m2 = m_dof / 2
-        n2 = n_dof / 2
+        m2 = self.m / 2
+        n2 = self.n / 2
         mn2 = m2 + n2
-        dmn = m_dof / n_dof
+        dmn = self.m / self.n
+
+        # normalization by the beta function
+        lb = gammaln(m2) + gammaln(n2) - gammaln(mn2)
+        return m2 * np.log(dmn) + xlogy(m2 - 1, x) - mn2 * np.log1p(np.multiply(dmn, x)) - lb
+
+    def cdf(self, x):
+        """This method calculates the distribution function of F(m,n).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        x = np.maximum(x, 0)
+        mx = np.multiply(self.m, x)
+        return betainc(self.m / 2, self.n / 2, mx / (mx + self.n))
+
+    def ppf(self, u):
+        """This method calculates the quantile function of F(m,n).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        # the table is built for scalar parameters
+        assert self.batch_shape == ()
+        if self.ppf_table is None:
+            self.ppf_table = InterpolationTable(self.cdf, self._density, 0, np.inf, 1, 1)
 
-        # compute all parts
-        t = m.gamma(mn2) * dmn ** m2 * np.power(x, m2 - 1)
-        b = m.gamma(m2) * m.gamma(n2) * (1 + np.multiply(dmn, x)) ** mn2
-        return t / b
+        return self.ppf_table.ppf(u)
@@ -1,24 +1,25 @@
-import math as m
 import numpy as np
 
 from src.prob_distribution import ProbDist
+from src.spaces.spaces1d_leafs import ContinuousSpace
+from src.special import gammaln
 
 
 class FrechetDist(ProbDist):
     """Simple Fréchet distribution."""
 
-    def __init__(self, shape = 1, loc = 0, scale = 1):
+    def __init__(self, shape = 1, loc = 0, scale = 1, gen = None):
         """Create Fréchet(shape) distribution.
 
         :param shape Define the shape of density
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
         self.shape = shape
         self.loc = loc
         self.scale = scale
-        self.UG = UniformDist()
-        super().__init__(ContinuousSpace(0, np.inf))
+        super().__init__(ContinuousSpace(0, np.inf), gen, (shape, loc, scale))
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -28,52 +29,95 @@ class FrechetDist(ProbDist):
         loc = self.loc
         shape = self.shape
         scale = self.scale
-        return scale * m.gamma(1 - shape ** -1) + loc
+
+        # infinite for shape <= 1
+        finite = np.greater(shape, 1)
+        g1 = np.exp(gammaln(1 - 1 / np.where(finite, shape, 2)))
+        return np.where(finite, scale * g1 + loc, np.inf)
 
     def var(self):
         """Calculates the variance for that distribution.
 
         :returns The variance of the distribution"""
 
+        shape = self.shape
         scale = self.scale
-        return scale ** 2 * (m.gamma(1 - 2 * self.shape ** -1) - m.gamma(1 - self.shape ** -1) ** 2)
 
-    def sample(self, num_samples = 1):
+        # infinite for shape <= 2
+        finite = np.greater(shape, 2)
+        g1 = np.exp(gammaln(1 - 1 / np.where(finite, shape, 3)))
+        g2 = np.exp(gammaln(1 - 2 / np.where(finite, shape, 3)))
+        return np.where(finite, scale ** 2 * (g2 - g1 ** 2), np.inf)
+
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from Fréchet(shape) by using a beta generator.
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ Fréchet(shape).
         """
 
+        out = self.buffer(num_samples, out, dtype)
+
         # generate samples
         loc = self.loc
         shape = self.shape
         scale = self.scale
 
         # sample data
-        U = self.UG.sample(num_samples)
-        X = (-np.log(U)) ** (-1/shape)
+        U = self.uniforms(num_samples, out)
+        np.log(U, out=U)
+        np.negative(U, out=U)
+        np.power(U, -1 / shape, out=U)
 
-        # transform
-        return scale * X + loc
+        # transform in place
+        U *= scale
+        U += loc
+        return U
 
-    def c_pdf(self, x):
+    def c_pdf(self, x, out = None):
         """This method calculates the density Fréchet(shape).
 
         :param x Which value should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability this element occurs.
         """
 
-        # only support for positive x
-        assert x > 0
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density Fréchet(shape).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
 
         # shortcuts
         loc = self.loc
         shape = self.shape
         scale = self.scale
 
-        # gen pdf
-        xn = (np.subtract(x, loc) / scale)
-        et = np.exp(-np.power(xn, -shape))
-        xt = np.power(xn, -shape - 1)
-        return shape / scale * et * xt
+        xn = np.subtract(x, loc) / scale
+        return np.log(shape / scale) - (shape + 1) * np.log(xn) - np.power(xn, -shape)
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Fréchet(shape).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        xn = np.maximum(np.subtract(x, self.loc) / self.scale, 0)
+        with np.errstate(divide='ignore'):
+            return np.exp(-np.power(xn, -self.shape))
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Fréchet(shape).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        with np.errstate(divide='ignore'):
+            return self.loc + self.scale * np.power(-np.log(u), -1 / self.shape)
@@ -2,26 +2,35 @@ import math as m
 import numpy as np
 
 from src.continuous.normal import NormalDist
-from src.continuous.uniform import UniformDist
 from src.prob_distribution import ProbDist
+from src.sampling.inversion import InterpolationTable
+from src.sampling.rejection import rejection_sample, rejection_sample_slots
 from src.spaces.spaces1d_leafs import ContinuousSpace
+from src.special import gammainc, gammaln, xlogy
 
 
 class GammaDist(ProbDist):
     """Simple gamma distribution."""
 
-    def __init__(self, shape = 1, scale = 1):
+    # the quantile function is a table for scalar parameters
+    batch_ppf = False
+
+    def __init__(self, shape = 1, scale = 1, gen = None):
         """Create Ga(shape,scale) distribution.
 
         :param shape Shape of Ga(shape,scale)
         :param scale Scale of Ga(shape,scale)
+        :param gen The uniform generator to sample from, None for the shared one.
         """
         self.shape = shape
         self.scale = scale
 
-        self.UG = UniformDist()
-        if shape >= 1: self.NG = NormalDist()
-        super().__init__(ContinuousSpace(0, np.inf, open_brackets=False))
+        # the interpolation table of the quantile function, created on first use
+        self.ppf_table = None
+
+        super().__init__(ContinuousSpace(0, np.inf, open_brackets=False), gen, (shape, scale))
+
+        if np.any(np.greater_equal(shape, 1)): self.NG = NormalDist(gen=self.gen)
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -37,22 +46,59 @@ class GammaDist(ProbDist):
 
         return self.shape / self.scale ** 2
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from Ga(shape,scale) by using acceptance rejection distributions.
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ Ga(shape,scale).
         """
 
+        out = self.buffer(num_samples, out, dtype)
+
         # extract vars
         shape = self.shape
 
+        # one shape per random number
+        if self.batch_shape != ():
+            shapes, = self.slot_params(num_samples, shape)
+            elements = self.sample_shapes(shapes).reshape(self.sample_shape(num_samples))
+            X = self.write(elements, out)
+            X /= self.scale
+            return X
+
         # when the shape is bigger than 1
         elements = self.rand_shp_gt_1(num_samples) \
             if shape >= 1 else \
             self.rand_shp_st_1(num_samples)
 
-        return elements / self.scale
+        X = self.write(elements, out)
+        X /= self.scale
+        return X
+
+    def sample_shapes(self, shapes):
+        """Generate one random number from Ga(shape,1) for each of the passed shapes.
+
+        :param shapes An array of positive shapes.
+        :returns Random numbers x_i ~ Ga(shapes_i,1).
+        """
+
+        shapes = np.asarray(shapes, dtype=np.float64)
+        X = np.empty(np.shape(shapes))
+
+        # both methods with the parameters of each slot
+        large = shapes >= 1
+        d, c = self.mt_params(shapes[large])
+        X[large] = rejection_sample_slots(lambda idx: self.mt_candidates(d[idx], c[idx], len(idx)),
+                                          len(d), 0.95)
+
+        small = shapes[~large]
+        d, b = self.best_params(small)
+        X[~large] = rejection_sample_slots(lambda idx: self.best_candidates(small[idx], d[idx], b[idx], len(idx)),
+                                           len(small), 0.7)
+
+        return X
 
     def rand_shp_gt_1(self, num_samples):
         """Creates random variables, if gamma has shape bigger or equal to one.
@@ -64,29 +110,42 @@ class GammaDist(ProbDist):
         Refs: [1] https://dl.acm.org/citation.cfm?id=358414.
         """
 
-        # some pre settings
-        elements = np.empty(num_samples)
-        shape = self.shape
+        d, c = self.mt_params(self.shape)
+        return rejection_sample(lambda k: self.mt_candidates(d, c, k), num_samples, 0.95)
+
+    @staticmethod
+    def mt_params(shape):
+        """Calculates the constants of Marsaglia and Tsang's method.
+
+        :param shape The shape, at least 1, or an array of them.
+        :returns The constants d and c.
+        """
+
         d = shape - 1 / 3
-        c = 1 / m.sqrt(9 * d)
+        c = 1 / np.sqrt(9 * d)
+        return d, c
 
-        # create all samples
-        for k in range(num_samples):
+    def mt_candidates(self, d, c, num_candidates):
+        """Proposes candidates of Marsaglia and Tsang's method, either for one
+        shape or for one shape per candidate.
 
-            # generate normal and unif
-            z = self.NG.sample()
-            u = self.UG.sample()
-            v = (1 + c * z) ** 3
+        :param d The constant d, or an array with the one of each candidate.
+        :param c The constant c, or an array with the one of each candidate.
+        :param num_candidates How many candidates should be proposed.
+        :returns The candidates and a mask of the accepted ones.
+        """
 
-            # first check
-            while z <= -(1 / c) or m.log(u) > 0.5 * z ** 2 + d - d * v + d * m.log(v):
-                z = self.NG.sample()
-                u = self.UG.sample()
-                v = (1 + c * z) ** 3
+        # generate normal and unif
+        z = self.NG.sample(num_candidates)
+        u = self.gen.random(num_candidates)
+        v = (1 + c * z) ** 3
 
-            elements[k] = d * v
+        # first check, the log is only evaluated where v is positive
+        ok = z > -(1 / c)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ok &= np.log(u) <= 0.5 * z ** 2 + d - d * v + d * np.log(v)
 
-        return elements
+        return d * v, ok
 
     def rand_shp_st_1(self, num_samples):
         """Creates random variables, if gamma has shape smaller than one.
@@ -98,59 +157,93 @@ class GammaDist(ProbDist):
         Refs: [1] https://link.springer.com/article/10.1007/BF02280789.
         """
 
-        # some pre settings
-        elements = np.empty(num_samples)
         shape = self.shape
+        d, b = self.best_params(shape)
+        return rejection_sample(lambda k: self.best_candidates(shape, d, b, k), num_samples, 0.7)
 
-        # some pre settings
-        d = 0.07 + 0.75 * m.sqrt(1 - shape)
-        b = 1 + m.exp(-d) * (shape / d)
+    @staticmethod
+    def best_params(shape):
+        """Calculates the constants of Best's method.
 
-        # create all samples
-        for k in range(num_samples):
-
-            found = False
-
-            # repeat till found
-            while not found:
+        :param shape The shape, smaller than 1, or an array of them.
+        :returns The constants d and b.
+        """
 
-                # two uniform ones
-                u1 = self.UG.sample()
-                u2 = self.UG.sample()
-                v = b * u1
+        d = 0.07 + 0.75 * np.sqrt(1 - shape)
+        b = 1 + np.exp(-d) * (shape / d)
+        return d, b
 
-                if v <= 1:
+    def best_candidates(self, shape, d, b, num_candidates):
+        """Proposes candidates of Best's method, either for one shape or for one
+        shape per candidate.
 
-                    # shorthand
-                    x = d * v ** (1 / shape)
+        :param shape The shape, or an array with the one of each candidate.
+        :param d The constant d, or an array with the one of each candidate.
+        :param b The constant b, or an array with the one of each candidate.
+        :param num_candidates How many candidates should be proposed.
+        :returns The candidates and a mask of the accepted ones.
+        """
 
-                    # acceptance check
-                    if u2 <= (2 - x) / (2 + x) or u2 <= m.exp(-x):
-                        elements[k] = x
-                        found = True
-                else:
+        # two uniform ones
+        u1 = self.gen.random(num_candidates)
+        u2 = self.gen.random(num_candidates)
+        v = b * u1
+        low = v <= 1
 
-                    # shorthand
-                    x = -m.log(d * (b - v) / shape)
-                    y = x / d
+        # shorthand, each branch only for its candidates
+        pick = lambda z, mask: z[mask] if np.ndim(z) > 0 else z
+        x = np.empty(num_candidates)
+        x[low] = pick(d, low) * v[low] ** (1 / pick(shape, low))
+        x[~low] = -np.log(pick(d, ~low) * (pick(b, ~low) - v[~low]) / pick(shape, ~low))
+        y = x / d
 
-                    # acceptance check
-                    if u2 * (shape + y * (1 - shape)) <= 1 or u2 < y ** (shape - 1):
-                        elements[k] = x
-                        found = True
+        # acceptance check
+        with np.errstate(divide='ignore'):
+            acc_low = (u2 <= (2 - x) / (2 + x)) | (u2 <= np.exp(-x))
+            acc_high = (u2 * (shape + y * (1 - shape)) <= 1) | (u2 < y ** (shape - 1))
 
-        return elements
+        return x, np.where(low, acc_low, acc_high)
 
-    def c_pdf(self, x):
+    def c_pdf(self, x, out = None):
         """This method calculates the density Ga(x|shape,scale).
 
         :param x Which value should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability this element occurs.
         """
 
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density Ga(x|shape,scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
+
         shape = self.shape
         scale = self.scale
-        z = scale ** shape / m.gamma(shape)
-        xa = np.power(x, (shape - 1))
-        ex = np.exp(np.multiply(-scale, x))
-        return z * xa * ex
+        return shape * np.log(scale) - gammaln(shape) + xlogy(shape - 1, x) - np.multiply(scale, x)
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Ga(shape,scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        return gammainc(self.shape, self.scale * np.maximum(x, 0))
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Ga(shape,scale).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        # the table is built for scalar parameters
+        assert self.batch_shape == ()
+        if self.ppf_table is None:
+            self.ppf_table = InterpolationTable(self.cdf, self._density, 0, np.inf, self.expectation(), m.sqrt(self.var()))
+
+        return self.ppf_table.ppf(u)
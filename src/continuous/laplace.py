@@ -9,11 +9,12 @@ from src.spaces.spaces1d_leafs import ContinuousSpace
 class LaplaceDist(ProbDist):
     """Simple Laplace distribution."""
 
-    def __init__(self, loc = 0, scale = 1):
+    def __init__(self, loc = 0, scale = 1, gen = None):
         """Creates Laplace(loc,scale) distribution.
 
         :param loc Location of the distribution.
         :param scale Scale of the distribution
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
@@ -21,9 +22,9 @@ class LaplaceDist(ProbDist):
         self.scale = scale
 
         # create generator
-        self.NG = NormalDist()
-        self.EG = ExpDist()
-        super().__init__(ContinuousSpace(-np.inf, np.inf))
+        super().__init__(ContinuousSpace(-np.inf, np.inf), gen, (loc, scale))
+        self.NG = NormalDist(gen=self.gen)
+        self.EG = ExpDist(gen=self.gen)
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -39,35 +40,76 @@ class LaplaceDist(ProbDist):
 
         return 2 * (self.scale ** 2)
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from Laplace(loc, scale) by using acceptance rejection distributions.
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ Laplace(loc, scale).
         """
 
+        out = self.buffer(num_samples, out, dtype)
+
         # shortcut
         loc = self.loc
         scale = self.scale
 
         # sample data
-        E = self.EG.sample(num_samples)
-        Y = self.NG.sample(num_samples)
-        X = Y * np.sqrt(2 * E)
-        return scale * X + loc
-
-    def c_pdf(self, x):
+        size = num_samples * self.batch_size
+        E = self.EG.sample(size)
+        Y = self.NG.sample(size)
+        E *= 2
+        np.sqrt(E, out=E)
+
+        # transform in place
+        shape = self.sample_shape(num_samples)
+        X = np.multiply(Y.reshape(shape), E.reshape(shape), out=out)
+        X *= scale
+        X += loc
+        return X
+
+    def c_pdf(self, x, out = None):
         """This method calculates the density Laplace(loc, scale).
 
         :param x Which value should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability that this element occurs.
         """
 
-        # shortcut
-        loc = self.loc
-        scale = self.scale
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density Laplace(loc, scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
+
+        xn = np.subtract(x, self.loc) / self.scale
+        return -np.abs(xn) - np.log(2 * self.scale)
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Laplace(loc, scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        xn = np.subtract(x, self.loc) / self.scale
+        e = 0.5 * np.exp(-np.abs(xn))
+        return np.where(xn < 0, e, 1 - e)
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Laplace(loc, scale).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        # each half is an exponential one
+        u = np.asarray(u, dtype=np.float64)
+        with np.errstate(divide='ignore'):
+            e = -np.log(2 * np.minimum(u, 1 - u))
 
-        # update x
-        xn = np.subtract(x, loc) / scale
-        f = 0.5 * np.exp(-np.abs(xn))
-        return f / scale
+        return self.loc + self.scale * np.where(u < 0.5, -e, e)
@@ -1,60 +1,96 @@
-import math as m
 import numpy as np
 
 from src.continuous.normal import NormalDist
 from src.prob_distribution import ProbDist
 from src.spaces.spaces1d_leafs import ContinuousSpace
+from src.special import ndtr, ndtri
 
 
 class LogNormalDist(ProbDist):
     """Simple log-normal distribution."""
 
-    def __init__(self, mean=0, var=1):
+    def __init__(self, mean=0, var=1, gen = None):
         """Create LogN(mean, var) distribution.
 
         :param mean Center of the gaussian
         :param var Variance around the center.
+        :param gen The uniform generator to sample from, None for the shared one.
         """
         self.mean = mean
         self.var = var
 
         # create random generators
-        self.NG = NormalDist(mean, var)
-        super().__init__(ContinuousSpace(0, np.inf))
+        super().__init__(ContinuousSpace(0, np.inf), gen, (mean, var))
+        self.NG = NormalDist(mean, var, gen=self.gen)
 
     def expectation(self):
         """Calculates the expectations for that distribution.
 
         :returns The expectation of the distribution"""
 
-        return m.exp(self.mean + self.var / 2)
+        return np.exp(np.add(self.mean, np.divide(self.var, 2)))
 
     def var(self):
         """Calculates the variance for that distribution.
 
         :returns The variance of the distribution"""
 
-        return m.exp(2 * self.mean + self.var) * (m.exp(self.var) - 1)
+        return np.exp(np.multiply(2, self.mean) + self.var) * np.expm1(self.var)
 
-    def sample(self, num_samples=1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from LogN(mean, var).
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers from LogN(mean, var).
         """
 
+        out = self.buffer(num_samples, out, dtype)
+
         # generate some samples
-        Y = self.NG.sample(num_samples)
-        return np.exp(Y)
+        Y = self.NG.sample(num_samples, out)
+        return np.exp(Y, out=Y)
 
-    def c_pdf(self, x):
+    def c_pdf(self, x, out = None):
         """This method calculates the density LogN(x|mean, var).
 
         :param x What values should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability this element occurs.
         """
 
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density LogN(x|mean, var).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
+
         var = self.var
         mean = self.mean
-        return 1 / (np.multiply(x, np.sqrt(2 * var * np.pi))) \
-               * np.exp(-0.5 * (np.subtract(np.log(x), mean) ** 2) / var)
+        lx = np.log(x)
+        return -lx - 0.5 * np.log(2 * np.pi * var) - 0.5 * np.square(lx - mean) / var
+
+    def cdf(self, x):
+        """This method calculates the distribution function of LogN(mean, var).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        with np.errstate(divide='ignore'):
+            lx = np.log(np.maximum(x, 0))
+
+        return ndtr((lx - self.mean) / np.sqrt(self.var))
+
+    def ppf(self, u):
+        """This method calculates the quantile function of LogN(mean, var).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        return np.exp(self.mean + np.sqrt(self.var) * ndtri(u))
@@ -1,7 +1,6 @@
 import math as m
 import numpy as np
 
-from src.continuous.uniform import UniformDist
 from src.prob_distribution import ProbDist
 from src.spaces.spaces1d_leafs import ContinuousSpace
 
@@ -9,20 +8,19 @@ from src.spaces.spaces1d_leafs import ContinuousSpace
 class LogisticDist(ProbDist):
     """Simple Logistic distribution."""
 
-    def __init__(self, loc = 0, scale = 1):
+    def __init__(self, loc = 0, scale = 1, gen = None):
         """Creates Logistic(loc,scale) distribution.
 
         :param loc Location of the distribution.
         :param scale Scale of the distribution
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
         self.loc = loc
         self.scale = scale
 
-        # create generator
-        self.UG = UniformDist()
-        super().__init__(ContinuousSpace(-np.inf, np.inf))
+        super().__init__(ContinuousSpace(-np.inf, np.inf), gen, (loc, scale))
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -38,36 +36,68 @@ class LogisticDist(ProbDist):
 
         return (m.pi ** 2 / 3) * (self.scale ** 2)
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from Logistic(loc, scale) by using acceptance rejection distributions.
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ Logistic(loc, scale).
         """
 
+        out = self.buffer(num_samples, out, dtype)
+
         # shortcut
         loc = self.loc
         scale = self.scale
 
         # sample data
-        U = self.UG.sample(num_samples)
-        X = np.log(U / (1 - U))
-        return scale * X + loc
+        U = self.uniforms(num_samples, out)
+        U /= 1 - U
+        np.log(U, out=U)
+
+        # transform in place
+        U *= scale
+        U += loc
+        return U
 
-    def c_pdf(self, x):
+    def c_pdf(self, x, out = None):
         """This method calculates the density Logistic(loc, scale).
 
         :param x Which value should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability that this element occurs.
         """
 
-        # shortcut
-        loc = self.loc
-        scale = self.scale
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density Logistic(loc, scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
+
+        # the density is symmetric, so only exp of negative values is needed
+        xn = np.abs(np.subtract(x, self.loc) / self.scale)
+        return -xn - 2 * np.log1p(np.exp(-xn)) - np.log(self.scale)
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Logistic(loc, scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        xn = np.subtract(x, self.loc) / self.scale
+        return np.exp(-np.logaddexp(0, -xn))
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Logistic(loc, scale).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
 
-        # update x
-        xn = np.subtract(x, loc) / scale
-        t = np.exp(-xn)
-        b = (1 + t) ** 2
-        f = t / b
-        return f / scale
+        with np.errstate(divide='ignore'):
+            return self.loc + self.scale * (np.log(u) - np.log1p(np.negative(u)))
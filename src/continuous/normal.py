@@ -1,27 +1,33 @@
 import numpy as np
 
 from src.continuous.exponential import ExpDist
-from src.continuous.uniform import UniformDist
+from src.continuous.ziggurat import normal_ziggurat
 from src.prob_distribution import ProbDist
+from src.sampling.rejection import rejection_sample
 from src.spaces.spaces1d_leafs import ContinuousSpace
+from src.special import ndtr, ndtri
 
 
 class NormalDist(ProbDist):
     """Simple gaussian distribution."""
 
-    def __init__(self, mean = 0, var = 1):
+    def __init__(self, mean = 0, var = 1, gen = None, method = 'ziggurat'):
         """Create N(mean, var) distribution.
 
         :param mean Center of the gaussian
         :param var Variance around the center.
+        :param gen The uniform generator to sample from, None for the shared one.
+        :param method Either 'ziggurat' or 'rejection' from Exp(1).
         """
+        assert method in ['ziggurat', 'rejection']
+
         self.mean = mean
         self.var = var
+        self.method = method
+        super().__init__(ContinuousSpace(-np.inf, np.inf), gen, (mean, var))
 
         # create random generators
-        self.EG = ExpDist()
-        self.UG = UniformDist()
-        super().__init__(ContinuousSpace(-np.inf, np.inf))
+        self.EG = ExpDist(gen=self.gen)
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -37,41 +43,90 @@ class NormalDist(ProbDist):
 
         return self.var
 
-    def sample(self, num_samples = 1):
-        """Generate random numbers from N(mean, var) by using an acceptance
-        rejection algorithm using Exp(1) and U(0,1).
+    def sample(self, num_samples = 1, out = None, dtype = None):
+        """Generate random numbers from N(mean, var) by using the ziggurat
+        method or an acceptance rejection algorithm using Exp(1) and U(0,1).
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers from N(mean, var).
         """
 
-        # generate some samples
-        elements = np.empty(num_samples)
+        out = self.buffer(num_samples, out, dtype)
 
-        for k in range(num_samples):
+        size = num_samples * self.batch_size
+        shape = self.sample_shape(num_samples)
+        if self.method == 'ziggurat':
+            elements = normal_ziggurat().sample(self.gen, size, symmetric=True)
+            return self.transform(elements.reshape(shape), out)
 
-            # generate sample
-            x = self.EG.sample()
-            un = self.UG.sample()
+        def propose(num_candidates):
 
-            # reject
-            while un > np.exp(-(x - 1) ** 2 / 2):
-                x = self.sample()
-                un = self.UG.sample()
+            # generate sample
+            x = self.EG.sample(num_candidates)
+            un = self.gen.random(num_candidates)
 
             # accept
-            u = self.UG.sample()
-            elements[k] = (1 - 2 * int(u <= 0.5)) * x
+            return x, un <= np.exp(-(x - 1) ** 2 / 2)
+
+        # generate half normal samples
+        elements = rejection_sample(propose, size, np.sqrt(np.pi / (2 * np.e)))
+
+        # choose the sign
+        u = self.gen.random(size)
+        elements[u <= 0.5] *= -1
+
+        return self.transform(elements.reshape(shape), out)
 
-        return np.sqrt(self.var) * elements + self.mean
+    def transform(self, Z, out):
+        """Moves standard normal random numbers to N(mean, var) in place.
 
-    def c_pdf(self, x):
+        :param Z Random numbers from N(0, 1).
+        :param out The output buffer, None to reuse Z.
+        :returns Random numbers from N(mean, var).
+        """
+
+        X = self.write(Z, out)
+        X *= np.sqrt(self.var)
+        X += self.mean
+        return X
+
+    def c_pdf(self, x, out = None):
         """This method calculates the density N(x|mean, var).
 
         :param x What values should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability this element occurs.
         """
 
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density N(x|mean, var).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
+
         var = self.var
         mean = self.mean
-        return 1 / np.sqrt(2 * var * np.pi) * np.exp(-0.5 * (np.subtract(x, mean) ** 2) / var)
+        return -0.5 * np.log(2 * np.pi * var) - 0.5 * np.square(np.subtract(x, mean)) / var
+
+    def cdf(self, x):
+        """This method calculates the distribution function of N(mean, var).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        return ndtr(np.subtract(x, self.mean) / np.sqrt(self.var))
+
+    def ppf(self, u):
+        """This method calculates the quantile function of N(mean, var).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        return self.mean + np.sqrt(self.var) * ndtri(u)
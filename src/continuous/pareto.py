@@ -1,34 +1,32 @@
 import numpy as np
 
-from src.continuous.uniform import UniformDist
 from src.prob_distribution import ProbDist
 from src.spaces.spaces1d_leafs import ContinuousSpace
 
 
 class ParetoDist(ProbDist):
-    """Simple Pareto distribution."""
+    """Simple Pareto distribution of the second kind (Lomax) on [0, inf)."""
 
-    def __init__(self, shape = 1, scale = 1):
+    def __init__(self, shape = 1, scale = 1, gen = None):
         """Creates Pareto(shape,scale) distribution.
 
         :param shape Shape of the distribution.
         :param scale Scale of the distribution
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
         self.shape = shape
         self.scale = scale
 
-        # create generator
-        self.UG = UniformDist()
-        super().__init__(ContinuousSpace(0, np.inf, open_brackets=False))
+        super().__init__(ContinuousSpace(0, np.inf, open_brackets=False), gen, (shape, scale))
 
     def expectation(self):
         """Calculates the expectations for that distribution.
 
         :returns The expectation of the distribution"""
 
-        return 1 / (self.scale * (self.shape - 1))
+        return self.scale / (self.shape - 1)
 
     def var(self):
         """Calculates the variance for that distribution.
@@ -37,34 +35,68 @@ class ParetoDist(ProbDist):
 
         shape = self.shape
         scale = self.scale
-        return shape / (scale ** 2 * (shape - 1) ** 2 * (shape - 2))
+        return scale ** 2 * shape / ((shape - 1) ** 2 * (shape - 2))
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from Pareto(shape,scale).
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ Pareto(shape,scale).
         """
 
+        out = self.buffer(num_samples, out, dtype)
+
         # shortcut
         shape = self.shape
         scale = self.scale
 
         # sample data
-        U = self.UG.sample(num_samples)
-        X = U ** (-1/shape) - 1
-        return scale * X
+        U = self.uniforms(num_samples, out)
+        np.power(U, -1 / shape, out=U)
+        U -= 1
+
+        # transform in place
+        U *= scale
+        return U
 
-    def c_pdf(self, x):
+    def c_pdf(self, x, out = None):
         """This method calculates the density Pareto(shape,scale).
 
         :param x Which value should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability that this element occurs.
         """
 
-        # shortcut
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density Pareto(shape,scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
+
         shape = self.shape
         scale = self.scale
+        return np.log(shape / scale) - (shape + 1) * np.log1p(np.divide(x, scale))
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Pareto(shape,scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        return -np.expm1(-self.shape * np.log1p(np.maximum(x, 0) / self.scale))
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Pareto(shape,scale).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
 
-        # update x
-        return shape * scale * (1 + np.multiply(scale, x)) ** (-(shape + 1))
+        with np.errstate(divide='ignore'):
+            return self.scale * np.expm1(-np.log1p(np.negative(u)) / self.shape)
@@ -1,18 +1,23 @@
-import math as m
 import numpy as np
 
-from src.continuous.uniform import UniformDist
 from src.prob_distribution import ProbDist
+from src.sampling.inversion import InterpolationTable
+from src.sampling.rejection import rejection_sample, rejection_sample_slots
 from src.spaces.spaces1d_leafs import ContinuousSpace
+from src.special import betainc, gammaln
 
 
 class StudentsTDist(ProbDist):
     """Simple student-t distribution."""
 
-    def __init__(self, v = 1, loc = 0, scale = 1):
+    # the quantile function is a table for scalar parameters
+    batch_ppf = False
+
+    def __init__(self, v = 1, loc = 0, scale = 1, gen = None):
         """Create t(v,loc,scale) distribution.
 
         :param v Degrees of Freedom
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
@@ -20,9 +25,10 @@ class StudentsTDist(ProbDist):
         self.loc = loc
         self.scale = scale
 
-        # create generator
-        self.UG = UniformDist()
-        super().__init__(ContinuousSpace(-np.inf, np.inf))
+        # the interpolation table of the quantile function, created on first use
+        self.ppf_table = None
+
+        super().__init__(ContinuousSpace(-np.inf, np.inf), gen, (v, loc, scale))
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -38,59 +44,108 @@ class StudentsTDist(ProbDist):
 
         return self.scale ** 2 * (self.v / (self.v - 2))
 
-    def sample(self, num_samples=1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from t(v,loc,scale).
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers from t(v,loc,scale).
         """
 
+        out = self.buffer(num_samples, out, dtype)
+
         # shortcut
         v = self.v
         loc = self.loc
         scale = self.scale
-        elements = np.empty(num_samples)
 
-        # create samples
-        for k in range(num_samples):
-
-            # iterate till found
-            found = False
-            while not found:
-
-                # generate some samples
-                u1 = self.UG.sample()
-                u2 = self.UG.sample()
+        # one degree of freedom per random number
+        if self.batch_shape != ():
+            vs, = self.slot_params(num_samples, v)
+            elements = rejection_sample_slots(lambda idx: self.candidates(vs[idx], len(idx)), len(vs), 0.6)
+            elements = elements.reshape(self.sample_shape(num_samples))
+        else:
+            elements = rejection_sample(lambda k: self.candidates(v, k), num_samples, 0.6)
+
+        # transform in place
+        X = self.write(elements, out)
+        X *= scale
+        X += loc
+        return X
+
+    def candidates(self, v, num_candidates):
+        """Proposes candidates of the polar rejection method for t(v), either for
+        one degree of freedom or for one per candidate.
+
+        :param v The degrees of freedom, or an array with the ones of each candidate.
+        :param num_candidates How many candidates should be proposed.
+        :returns The candidates and a mask of the accepted ones.
+        """
 
-                # set X and V
-                if u1 < 0.5:
-                    X = 1 / (4 * u1 - 1)
-                    V = u2 / X ** 2
-                else:
-                    X = 4 * u1 - 3
-                    V = u2
+        # generate some samples
+        u1 = self.gen.random(num_candidates)
+        u2 = self.gen.random(num_candidates)
 
-                # acceptance check
-                if V < 1 - abs(X) / 2 or V < (1 + (X ** 2) / v) ** (-(v+1) / 2):
-                    elements[k] = X
-                    found = True
+        # set X and V
+        left = u1 < 0.5
+        with np.errstate(divide='ignore'):
+            X = np.where(left, 1 / (4 * u1 - 1), 4 * u1 - 3)
+            V = np.where(left, u2 / X ** 2, u2)
 
-        return scale * elements + loc
+        # acceptance check
+        return X, (V < 1 - np.abs(X) / 2) | (V < (1 + (X ** 2) / v) ** (-(v+1) / 2))
 
-    def c_pdf(self, x):
+    def c_pdf(self, x, out = None):
         """This method calculates the density t(v,loc,scale).
 
         :param x What values should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability this element occurs.
         """
 
-        # shortcut
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density t(v,loc,scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
+
         v = self.v
-        loc = self.loc
         scale = self.scale
 
-        # update x
-        xn = np.subtract(x, loc) / scale
-        z = m.gamma((v + 1) / 2) / (np.sqrt(v * m.pi) * m.gamma(v / 2))
-        X = (1 + np.square(xn) / v) ** (-(v+1) / 2)
-        return (z * X) / scale
+        xn = np.subtract(x, self.loc) / scale
+        z = gammaln((v + 1) / 2) - gammaln(v / 2) - 0.5 * np.log(v * np.pi) - np.log(scale)
+        return z - (v + 1) / 2 * np.log1p(np.square(xn) / v)
+
+    def cdf(self, x):
+        """This method calculates the distribution function of t(v,loc,scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        v = self.v
+        xn = np.subtract(x, self.loc) / self.scale
+
+        # the mass of the tail beyond |x|, near the center from the mass within
+        x2 = np.square(xn)
+        tail = np.where(x2 < v, 0.5 - 0.5 * betainc(0.5, v / 2, x2 / (v + x2)),
+                        0.5 * betainc(v / 2, 0.5, v / (v + x2)))
+        return np.where(xn < 0, tail, 1 - tail)
+
+    def ppf(self, u):
+        """This method calculates the quantile function of t(v,loc,scale).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        # the table is built for scalar parameters
+        assert self.batch_shape == ()
+        if self.ppf_table is None:
+            self.ppf_table = InterpolationTable(self.cdf, self._density, -np.inf, np.inf, self.loc, self.scale)
+
+        return self.ppf_table.ppf(u)
@@ -1,36 +1,23 @@
 import numpy as np
-import random
 
-# some fixed numbers for good stochastic performance.
 from src.prob_distribution import ProbDist
 from src.spaces.spaces1d_leafs import ContinuousSpace
 
-mx = 2 ** 32 - 209
-my = 2 ** 21 - 22853
-axt1 = 1403580
-axt2 = 810728
-ayt0 = 527612
-ayt2 = 1370589
-
 
 class UniformDist(ProbDist):
     """Simple uniform distribution."""
 
-    def __init__(self, a = 0, b = 1):
+    def __init__(self, a = 0, b = 1, gen = None):
         """Create U(a, b) distribution.
 
         :param a The left boundary of the interval.
         :param b The right boundary of the interval.
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         self.a = a
         self.b = b
-
-        # variables
-        self.X = [random.randint(0, mx) for _ in range(3)]
-        self.Y = [random.randint(0, my) for _ in range(3)]
-
-        super().__init__(ContinuousSpace(a, b, open_brackets=False))
+        super().__init__(ContinuousSpace(a, b, open_brackets=False), gen, (a, b))
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -50,46 +37,62 @@ class UniformDist(ProbDist):
         b = self.b
         return (a - b) ** 2 / 12
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from U(a, b) by using a CMRG with parameters
         from [1] which is called MRG32k3a.
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns A random number from U(a,b).
 
 
         Refs: [1] https://pubsonline.informs.org/doi/pdf/10.1287/opre.47.1.159.
         """
 
+        out = self.buffer(num_samples, out, dtype)
+
         a = self.a
         b = self.b
 
-        elements = np.empty(num_samples)
-        for k in range(num_samples):
+        u = self.uniforms(num_samples, out)
+        u *= b - a
+        u += a
+        return u
 
-            # two MRG
-            x = (axt1 * self.X[1] + axt2 * self.X[2]) % mx
-            y = (ayt0 * self.Y[0] + ayt2 * self.Y[2]) % my
+    def c_pdf(self, x, out = None):
+        """This method calculates the density U(x|a,b)=U(a,b).
 
-            # combine
-            u = (x - y + (mx if x <= y else 0)) / (mx + 1)
-            elements[k] = a + u * (b - a)
+        :param x What values should be evaluated.
+        :param out An array to write to, None for a new one.
+        :returns The probability this element occurs.
+        """
 
-            # update state
-            self.X[1:] = self.X[:-1]
-            self.Y[1:] = self.Y[:-1]
-            self.X[0] = x
-            self.Y[0] = y
+        return np.exp(self._log_density(x), out=out)
 
-        return elements
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density U(x|a,b)=U(a,b).
 
-    def c_pdf(self, x):
-        """This method calculates the density U(x|a,b)=U(a,b).
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
 
-        :param x What values should be evaluated.
-        :returns The probability this element occurs.
+        return np.full(np.shape(x), -np.log(self.b - self.a))
+
+    def cdf(self, x):
+        """This method calculates the distribution function of U(a,b).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
         """
 
-        a = self.a
-        b = self.b
-        return 1 / (b - a) * np.ones(np.shape(x))
+        return np.clip(np.subtract(x, self.a) / (self.b - self.a), 0, 1)
+
+    def ppf(self, u):
+        """This method calculates the quantile function of U(a,b).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        return self.a + np.multiply(u, self.b - self.a)
@@ -1,29 +1,37 @@
+import math as m
 import numpy as np
 
 from src.continuous.normal import NormalDist
-from src.continuous.uniform import UniformDist
 from src.prob_distribution import ProbDist
+from src.sampling.inversion import InterpolationTable
 from src.spaces.spaces1d_leafs import ContinuousSpace
+from src.special import lgammainc, ndtr
 
 
 class WaldDist(ProbDist):
     """Simple Wald distribution."""
 
-    def __init__(self, loc = 0, scale = 1):
+    # the quantile function is a table for scalar parameters
+    batch_ppf = False
+
+    def __init__(self, loc = 0, scale = 1, gen = None):
         """Creates Wald(loc,scale) distribution.
 
         :param loc Location of the distribution.
         :param scale Scale of the distribution
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
         self.loc = loc
         self.scale = scale
 
+        # the interpolation table of the quantile function, created on first use
+        self.ppf_table = None
+
         # create generator
-        self.NG = NormalDist()
-        self.UG = UniformDist()
-        super().__init__(ContinuousSpace(0, np.inf))
+        super().__init__(ContinuousSpace(0, np.inf), gen, (loc, scale))
+        self.NG = NormalDist(gen=self.gen)
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -39,47 +47,91 @@ class WaldDist(ProbDist):
 
         return self.loc ** 3 / self.scale
 
-    def sample(self, num_samples = 1):
-        """Generate random numbers from Wald(loc,scale).
+    def sample(self, num_samples = 1, out = None, dtype = None):
+        """Generate random numbers from Wald(loc,scale) with the transformation of
+        Michael, Schucany and Haas from [1].
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ Wald(loc,scale).
+
+        Refs: [1] https://doi.org/10.1080/00031305.1976.10479147.
         """
 
+        out = self.buffer(num_samples, out, dtype)
+
         # shortcut
         loc = self.loc
         scale = self.scale
 
-        # some sampling
-        W = self.NG.sample(num_samples)
-        Y = W ** 2
-        Z = loc + (loc ** 2 * Y / 2 * scale) + (loc / 2 * scale) * np.sqrt(4 * loc * scale * Y + loc ** 2 * Y ** 2)
-        X = Z
-
-        # sample uniforms
-        bound = loc / (loc + Z)
-        B = self.UG.sample(num_samples)
-
-        # iterate
-        for k in range(num_samples):
-            if B[k] > bound: X[k] = loc ** 2 / Z[k]
-
-        return X
-
-    def c_pdf(self, x):
+        # the smaller root of the chi square transformation, in place
+        Y = self.NG.sample(num_samples * self.batch_size).reshape(self.sample_shape(num_samples))
+        np.square(Y, out=Y)
+        Y *= loc
+        Z = np.add(Y, 4 * scale, out=out)
+        Z *= Y
+        np.sqrt(Z, out=Z)
+        np.subtract(Y, Z, out=Z)
+        Z *= loc / (2 * scale)
+        Z += loc
+
+        # pick the other root with probability Z / (loc + Z)
+        B = self.uniforms(num_samples)
+        B *= loc + Z
+        other = B > loc
+        Z[other] = (loc ** 2 / Z)[other]
+        return Z
+
+    def c_pdf(self, x, out = None):
         """This method calculates the density Wald(loc,scale).
 
         :param x Which value should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability that this element occurs.
         """
 
-        assert x > 0
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density Wald(loc,scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
 
-        # shortcut
         loc = self.loc
         scale = self.scale
+        z = 0.5 * np.log(scale / (2 * np.pi)) - 1.5 * np.log(x)
+        return z - 0.5 * (scale / loc ** 2) * np.square(np.subtract(x, loc)) / x
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Wald(loc,scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        loc = self.loc
+        scale = self.scale
+        x = np.maximum(x, 1e-300)
+        s = np.sqrt(scale / x)
+
+        # the second part is exp(2 scale / loc) * Phi(-s (x / loc + 1)), evaluated in log space
+        z = s * (x / loc + 1) / np.sqrt(2)
+        second = np.exp(2 * scale / loc + np.log(0.5) + lgammainc(0.5, np.square(z))[1])
+        return ndtr(s * (x / loc - 1)) + second
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Wald(loc,scale).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        # the table is built for scalar parameters
+        assert self.batch_shape == ()
+        if self.ppf_table is None:
+            self.ppf_table = InterpolationTable(self.cdf, self._density, 0, np.inf, self.loc, m.sqrt(self.var()))
 
-        # update x
-        z = np.sqrt(scale / (2 * np.pi * np.power(x, 3)))
-        b = np.exp(-0.5 * (scale / loc ** 2) * (np.subtract(x, loc) ** 2) / x)
-        return z * b
+        return self.ppf_table.ppf(u)
@@ -1,20 +1,20 @@
-import math as m
 import numpy as np
 
-from src.continuous.uniform import UniformDist
 from src.prob_distribution import ProbDist
 from src.spaces.spaces1d_leafs import ContinuousSpace
+from src.special import gammaln, xlogy
 
 
 class WeibullDist(ProbDist):
     """Simple Weibull distribution."""
 
-    def __init__(self, shape = 1, loc = 1, scale = 1):
+    def __init__(self, shape = 1, loc = 1, scale = 1, gen = None):
         """Creates Weib(shape,loc,scale) distribution.
 
         :param shape Shape of the distribution.
         :param loc Location of the distribution.
         :param scale Scale of the distribution
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
@@ -22,57 +22,89 @@ class WeibullDist(ProbDist):
         self.loc = loc
         self.scale = scale
 
-        # create generator
-        self.UG = UniformDist()
-        super().__init__(ContinuousSpace(0, np.inf, open_brackets=False))
+        super().__init__(ContinuousSpace(0, np.inf, open_brackets=False), gen, (shape, loc, scale))
 
     def expectation(self):
         """Calculates the expectations for that distribution.
 
         :returns The expectation of the distribution"""
 
-        return (self.scale ** -1) * m.gamma(1 + self.shape ** -1) + self.loc
+        return self.scale * np.exp(gammaln(1 + 1 / self.shape)) + self.loc
 
     def var(self):
         """Calculates the variance for that distribution.
 
         :returns The variance of the distribution"""
 
-        return self.scale ** -2 \
-            * (m.gamma(1 + 2 * self.shape ** -1) - m.gamma(1 + self.shape ** -1) ** 2)
+        return self.scale ** 2 \
+            * (np.exp(gammaln(1 + 2 / self.shape)) - np.exp(gammaln(1 + 1 / self.shape)) ** 2)
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from Weib(shape,loc,scale).
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ Weib(shape,loc,scale).
         """
 
+        out = self.buffer(num_samples, out, dtype)
+
         # shortcut
         shape = self.shape
         loc = self.loc
         scale = self.scale
 
         # some sampling
-        U = self.UG.sample(num_samples)
-        X = 1 / scale * (-np.log(U)) ** (1 / shape)
-        return scale * X + loc
+        U = self.uniforms(num_samples, out)
+        np.log(U, out=U)
+        np.negative(U, out=U)
+        np.power(U, 1 / shape, out=U)
+
+        # transform in place
+        U *= scale
+        U += loc
+        return U
 
-    def c_pdf(self, x):
+    def c_pdf(self, x, out = None):
         """This method calculates the density Weib(shape,loc,scale).
 
         :param x Which value should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability that this element occurs.
         """
 
-        assert x > 0
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density Weib(shape,loc,scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
 
-        # shortcut
         shape = self.shape
-        loc = self.loc
         scale = self.scale
-        xn = np.subtract(x, loc) / scale
 
-        # update x
-        ft = shape * xn ** (shape - 1) * np.exp(-xn ** shape)
-        return ft / scale
+        xn = np.subtract(x, self.loc) / scale
+        return np.log(shape / scale) + xlogy(shape - 1, xn) - np.power(xn, shape)
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Weib(shape,loc,scale).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        xn = np.maximum(np.subtract(x, self.loc) / self.scale, 0)
+        return -np.expm1(-np.power(xn, self.shape))
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Weib(shape,loc,scale).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        with np.errstate(divide='ignore'):
+            return self.loc + self.scale * np.power(-np.log1p(np.negative(u)), 1 / self.shape)
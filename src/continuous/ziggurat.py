@@ -0,0 +1,139 @@
+import numpy as np
+
+from src.sampling.rejection import rejection_sample
+
+
+class Ziggurat:
+    """Layer tables of the ziggurat method from [1] for a decreasing density on [0, inf).
+
+    Refs: [1] https://www.jstatsoft.org/article/view/v005i08.
+    """
+
+    def __init__(self, f, f_inv, tail, r, v, layers):
+        """Create the layers, which all have the area v.
+
+        :param f The unnormalized density.
+        :param f_inv The inverse of the density.
+        :param tail Maps a generator and a number of samples to samples beyond r.
+        :param r The start of the tail.
+        :param v The area of each layer.
+        :param layers How many layers are used.
+        """
+
+        self.f = f
+        self.tail = tail
+        self.r = r
+        self.layers = layers
+
+        # X[i] is the width of layer i, layer 0 is the base strip including the tail
+        X = np.empty(layers + 1)
+        X[0] = v / f(r)
+        X[1] = r
+        for i in range(1, layers - 1):
+            X[i + 1] = f_inv(v / X[i] + f(X[i]))
+        X[layers] = 0
+
+        self.X = X
+        self.F = f(X)
+
+    def sample(self, gen, num_samples, symmetric = False):
+        """Generate random numbers from the density.
+
+        :param gen The uniform generator to sample from.
+        :param num_samples How many random numbers should be generated.
+        :param symmetric True if the density is mirrored to the negative axis.
+        :returns The random numbers.
+        """
+
+        X = self.X
+        F = self.F
+
+        def propose(num_candidates):
+
+            # one uniform selects the layer and the sign, one the position
+            j = (gen.random(num_candidates) * (2 * self.layers)).astype(np.intp)
+            i = j >> 1
+            x = gen.random(num_candidates) * X[i]
+
+            # fast path, the point lies in the inner rectangle
+            accept = x < X[i + 1]
+
+            # points of the base strip beyond r come from the tail
+            outer = np.flatnonzero(~accept)
+            base = outer[i[outer] == 0]
+            x[base] = self.tail(gen, len(base))
+            accept[base] = True
+
+            # the remaining ones are in a wedge and checked against the density
+            wedge = outer[i[outer] != 0]
+            k = i[wedge]
+            y = F[k] + gen.random(len(wedge)) * (F[k + 1] - F[k])
+            accept[wedge] = y < self.f(x[wedge])
+
+            if symmetric:
+                x[(j & 1) == 1] *= -1
+
+            return x, accept
+
+        return rejection_sample(propose, num_samples, 0.98)
+
+
+def normal_tail(gen, num_samples):
+    """Generate random numbers from the normal tail beyond r with Marsaglia's method.
+
+    :param gen The uniform generator to sample from.
+    :param num_samples How many random numbers should be generated.
+    :returns The random numbers.
+    """
+
+    r = normal_ziggurat().r
+
+    def propose(num_candidates):
+        x = -np.log(gen.random(num_candidates)) / r
+        y = -np.log(gen.random(num_candidates))
+        return r + x, 2 * y > x ** 2
+
+    return rejection_sample(propose, num_samples, 0.9)
+
+
+def exp_tail(gen, num_samples):
+    """Generate random numbers from the exponential tail beyond r, which is shifted Exp(1).
+
+    :param gen The uniform generator to sample from.
+    :param num_samples How many random numbers should be generated.
+    :returns The random numbers.
+    """
+
+    return exp_ziggurat().r - np.log(gen.random(num_samples))
+
+
+# tables for N(0, 1) and Exp(1), created on first use
+tables = {}
+
+
+def normal_ziggurat():
+    """Returns the tables for the standard normal with 128 layers.
+
+    :returns The ziggurat of exp(-x^2 / 2).
+    """
+
+    if 'normal' not in tables:
+        tables['normal'] = Ziggurat(lambda x: np.exp(-0.5 * np.square(x)),
+                                    lambda y: np.sqrt(-2 * np.log(y)),
+                                    normal_tail, 3.442619855899, 9.91256303526217e-3, 128)
+
+    return tables['normal']
+
+
+def exp_ziggurat():
+    """Returns the tables for the standard exponential with 256 layers.
+
+    :returns The ziggurat of exp(-x).
+    """
+
+    if 'exp' not in tables:
+        tables['exp'] = Ziggurat(lambda x: np.exp(-x),
+                                 lambda y: -np.log(y),
+                                 exp_tail, 7.69711747013104972, 3.949659822581572e-3, 256)
+
+    return tables['exp']
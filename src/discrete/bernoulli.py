@@ -1,26 +1,25 @@
 import numpy as np
 
-from src.continuous.uniform import UniformDist
 from src.prob_distribution import ProbDist
 from src.spaces.spaces1d_leafs import DiscreteSpace
+from src.special import xlog1py, xlogy
 
 
 class BernDist(ProbDist):
     """Simple bernoulli distribution."""
 
-    def __init__(self, p = 0.5):
+    def __init__(self, p = 0.5, gen = None):
         """Create Ber(p) distribution.
 
         :param p Probability that random var is true
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
-        assert 0 <= p <= 1
+        assert np.all(np.greater_equal(p, 0)) and np.all(np.less_equal(p, 1))
         self.p = p
 
-        # create distribution for sampling
-        self.UG = UniformDist()
-        super().__init__(DiscreteSpace([0, 1]))
+        super().__init__(DiscreteSpace(0, 2), gen, (p,))
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -36,26 +35,64 @@ class BernDist(ProbDist):
 
         return self.p * (1 - self.p)
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from Ber(p).
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ Ber(p).
         """
 
-        # create gamma distributed vars
-        U = self.UG.sample(num_samples)
-        for k in range(num_samples):
-            U[k] = int(U[k] <= self.p)
+        out = self.buffer(num_samples, out, dtype)
 
-        return U
+        # the comparison overwrites the uniforms or goes to an integer buffer
+        U = self.uniforms(num_samples, out)
+        return np.less_equal(U, self.p, out=U if out is None else out)
 
-    def __density(self, x):
-        """This method calculates the mass Ber(x|p).
+    def sample_packed(self, num_samples = 1, chunk_size = 2 ** 16):
+        """Generate random numbers from Ber(p) packed into bits, eight draws per
+        byte along the first axis. They equal the ones of sample() for the same
+        generator state, np.unpackbits(X, axis=0, count=num_samples) restores them.
 
-        :param x Which value should be evaluated.
-        :returns The probability this element occurs.
+        :param num_samples How many random numbers should be generated.
+        :param chunk_size How many draws are generated at once, which bounds the temporary memory.
+        :returns An uint8 array of shape sample_shape(ceil(num_samples / 8)).
+        """
+
+        X = np.empty(self.sample_shape((num_samples + 7) // 8), dtype=np.uint8)
+
+        # whole bytes per chunk, so that the chunks pack independently
+        step = 8 * max(1, chunk_size // 8)
+        for start in range(0, num_samples, step):
+            k = min(step, num_samples - start)
+            X[start // 8:(start + k + 7) // 8] = np.packbits(self.uniforms(k) <= self.p, axis=0)
+
+        return X
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the mass Ber(x|p).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the probabilities.
+        """
+
+        return xlogy(x, self.p) + xlog1py(np.subtract(1, x), -self.p)
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Ber(p).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        return np.where(np.less(x, 0), 0, np.where(np.less(x, 1), 1 - self.p, 1))
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Ber(p).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
         """
 
-        assert np.all([np.logical_or(np.equal(x, 0), np.equal(x, 1))])
-        return np.power(self.p, x) * np.power(1 - self.p, np.subtract(1, x))
+        return np.where(np.greater(u, 1 - self.p), 1.0, 0.0)
@@ -1,30 +1,42 @@
 import math as m
 import numpy as np
 
-from src.discrete.bernoulli import BernDist
+from functools import lru_cache
+
 from src.prob_distribution import ProbDist
+from src.sampling.inversion import DiscreteInversion, GuideTable, cache_size
+from src.sampling.rejection import rejection_sample, rejection_sample_slots
 from src.spaces.spaces1d_leafs import DiscreteSpace
+from src.special import betainc, gammaln, logbinom, xlog1py, xlogy
 
 
 class BinDist(ProbDist):
     """Simple binomial distribution."""
 
-    def __init__(self, n = 1, p = 0.5):
+    # the quantile function is a table for scalar parameters
+    batch_ppf = False
+
+    def __init__(self, n = 1, p = 0.5, gen = None):
         """Create Bin(n, p) distribution.
 
         :param n Which should be summed
         :param p Probability that random var is true
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
-        assert 0 <= p <= 1
-        assert 1 <= n
+        assert np.all(np.greater_equal(p, 0)) and np.all(np.less_equal(p, 1))
+        assert np.all(np.greater_equal(n, 1))
         self.p = p
         self.n = n
 
-        # create distribution for sampling
-        self.BG = BernDist(p)
-        super().__init__(DiscreteSpace(np.arange(n + 1)))
+        # the guide table of the inversion, created on first use
+        self.table = None
+
+        # the cdf table of the quantile function, created on first use
+        self.ppf_table = None
+
+        super().__init__(DiscreteSpace(0, np.add(n, 1)), gen, (n, p))
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -40,26 +52,218 @@ class BinDist(ProbDist):
 
         return self.n * self.p * (1 - self.p)
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from Bin(n, p).
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
+        :returns Random numbers x ~ Bin(n, p).
+        """
+
+        out = self.buffer(num_samples, out, dtype)
+
+        # one n and p per random number
+        if self.batch_shape != ():
+            ns, ps = self.slot_params(num_samples, self.n, self.p)
+            return self.write(self.sample_params(ns, ps).reshape(self.sample_shape(num_samples)), out)
+
+        # sample with the smaller probability and mirror afterwards
+        n = self.n
+        p = min(self.p, 1 - self.p)
+
+        # both methods have constant expected costs per sample
+        X = self.rand_inversion(num_samples, p) \
+            if n * p < 10 else \
+            self.rand_btrs(num_samples, p)
+
+        return self.write(X if p == self.p else n - X, out)
+
+    def sample_params(self, ns, ps):
+        """Generate one random number from Bin(n, p) for each of the passed pairs.
+
+        :param ns An array of the numbers of trials.
+        :param ps An array of the probabilities.
+        :returns Random numbers x_i ~ Bin(ns_i, ps_i).
+        """
+
+        ns = np.asarray(ns, dtype=np.float64)
+        q = np.minimum(ps, 1 - np.asarray(ps))
+        X = np.empty(len(ns))
+
+        # small means by a joint sequential search, large ones by BTRS
+        small = ns * q < 10
+        X[small] = self.rand_search(ns[small], q[small])
+        nl = ns[~small]
+        params = self.btrs_params(nl, q[~small])
+        X[~small] = rejection_sample_slots(lambda idx: self.btrs_candidates(nl[idx], [z[idx] for z in params], len(idx)),
+                                           len(nl), 0.85)
+
+        return np.where(q == ps, X, ns - X)
+
+    def rand_search(self, ns, ps):
+        """Creates random variables for small means by inversion, advancing the
+        sequential search of all uniforms together.
+
+        :param ns An array of the numbers of trials.
+        :param ps An array of the probabilities, at most 0.5.
+        :returns Random numbers x_i ~ Bin(ns_i, ps_i).
+        """
+
+        U = self.gen.random(len(ns))
+        X = np.zeros(len(ns))
+        f = (1 - ps) ** ns
+        F = f.copy()
+        ratio = ps / (1 - ps)
+
+        # only the ones which did not exceed their uniform yet
+        active = np.flatnonzero(U >= F)
+        k = 0
+        while len(active) > 0:
+            k += 1
+            f[active] *= (ns[active] - k + 1) / k * ratio[active]
+            F[active] += f[active]
+            X[active] = k
+            active = active[(U[active] >= F[active]) & (f[active] > 0)]
+
+        return np.minimum(X, ns)
+
+    def rand_inversion(self, num_samples, p):
+        """Creates random variables, if n * p is small, by inversion with a
+        precomputed guide table of the cdf.
+
+        :param num_samples How many random numbers should be generated.
+        :param p The probability, at most 0.5.
+        :returns Random numbers x ~ Bin(n, p).
+        """
+
+        # the cache needs hashable keys, 0-d arrays aren't
+        if self.table is None:
+            self.table = binomial_table(int(self.n), float(p))
+
+        return self.table.sample(self.gen, num_samples)
+
+    def rand_btrs(self, num_samples, p):
+        """Creates random variables, if n * p is bigger or equal to 10.
+        Hörmann's transformed rejection with squeeze (BTRS) from [1] implemented underneath.
+
+        :param num_samples How many random numbers should be generated.
+        :param p The probability, at most 0.5.
         :returns Random numbers x ~ Bin(n, p).
+
+        Refs: [1] https://doi.org/10.1080/00949659308811496.
+        """
+
+        n = self.n
+        params = self.btrs_params(n, p)
+        return rejection_sample(lambda k: self.btrs_candidates(n, params, k), num_samples, 0.85)
+
+    @staticmethod
+    def btrs_params(n, p):
+        """Calculates the constants of BTRS.
+
+        :param n The number of trials, or an array of them.
+        :param p The probability, at most 0.5, or an array of them.
+        :returns The constants a, b, c, alpha, vr, lr and lfm.
+        """
+
+        spq = np.sqrt(n * p * (1 - p))
+        b = 1.15 + 2.53 * spq
+        a = -0.0873 + 0.0248 * b + 0.01 * p
+        c = n * p + 0.5
+        alpha = (2.83 + 5.1 / b) * spq
+        vr = 0.92 - 4.2 / b
+        lr = np.log(p / (1 - p))
+
+        # log of the mass at the mode, up to the common factor
+        mode = np.floor((n + 1) * p)
+        lfm = -gammaln(mode + 1) - gammaln(n - mode + 1) + mode * lr
+        return a, b, c, alpha, vr, lr, lfm
+
+    def btrs_candidates(self, n, params, num_candidates):
+        """Proposes candidates of BTRS, either for one pair of parameters or for
+        one pair per candidate.
+
+        :param n The number of trials, or an array with the one of each candidate.
+        :param params The constants of btrs_params(), numbers or arrays alike.
+        :param num_candidates How many candidates should be proposed.
+        :returns The candidates and a mask of the accepted ones.
+        """
+
+        a, b, c, alpha, vr, lr, lfm = params
+
+        # two uniform ones
+        U = self.gen.random(num_candidates) - 0.5
+        V = self.gen.random(num_candidates)
+        us = 0.5 - np.abs(U)
+        k = np.floor((2 * a / us + b) * U + c)
+
+        # quick acceptance
+        accept = (us >= 0.07) & (V <= vr)
+
+        # acceptance check for the rest, comparing with f(k) / f(mode)
+        rest = ~accept & (k >= 0) & (k <= n)
+        kr = k[rest]
+        pick = lambda z: z[rest] if np.ndim(z) > 0 else z
+        lhs = np.log(V[rest] * pick(alpha) / (pick(a) / us[rest] ** 2 + pick(b)))
+        accept[rest] = lhs <= -gammaln(kr + 1) - gammaln(pick(n) - kr + 1) + kr * pick(lr) - pick(lfm)
+
+        return k, accept
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the mass Bin(n, p).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the probabilities.
         """
 
-        X = np.zeros(num_samples)
-        for _ in range(self.n):
-            X += self.BG.sample(num_samples)
+        n = self.n
+        p = self.p
+        return logbinom(n, x) + xlogy(x, p) + xlog1py(np.subtract(n, x), -p)
 
-        return X
+    def cdf(self, x):
+        """This method calculates the distribution function of Bin(n, p).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
 
-    def __density(self, x):
-        """This method calculates the mass Bin(n, p).
+        n = self.n
+        k = np.clip(np.floor(x), -1, n)
 
-        :param x Which value should be evaluated.
-        :returns The probability this element occurs.
+        # P(X <= k) = I_(1 - p)(n - k, k + 1) inside of the support
+        F = betainc(np.maximum(n - k, 1), np.maximum(k + 1, 1), 1 - self.p)
+        return np.where(k < 0, 0, np.where(k >= n, 1, F))
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Bin(n, p).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
         """
 
-        assert all([e >= 0 for e in x])
-        prev = m.factorial(self.n) / (m.factorial(x) * m.factorial(self.n - x))
-        return prev * np.power(self.p, x) * np.power(1 - self.p, np.subtract(self.n, x))
+        # the table is built for scalar parameters
+        assert self.batch_shape == ()
+        if self.ppf_table is None:
+            sd = m.sqrt(self.var())
+            k0 = max(0, m.floor(self.expectation() - 10 * sd - 20))
+            k1 = min(self.n, m.ceil(self.expectation() + 10 * sd + 20))
+            self.ppf_table = DiscreteInversion(self.cdf, 0, self.n, k0, k1)
+
+        return self.ppf_table.ppf(u)
+
+
+@lru_cache(maxsize=cache_size)
+def binomial_table(n, p):
+    """Creates the guide table of Bin(n, p), shared by all instances with these parameters.
+
+    :param n Which should be summed
+    :param p The probability, at most 0.5.
+    :returns The guide table.
+    """
+
+    # the table covers all but a negligible part of the tail
+    k = np.arange(1, min(n, int(n * p + 10 * m.sqrt(n * p) + 20)) + 1)
+    ratio = (n - k + 1) / k * (p / (1 - p))
+    pmf = np.exp(n * m.log1p(-p)) * np.cumprod(np.concatenate([[1], ratio]))
+    return GuideTable(np.cumsum(pmf))
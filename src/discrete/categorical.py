@@ -0,0 +1,167 @@
+import numpy as np
+
+from src.prob_distribution import ProbDist
+from src.spaces.spaces1d_leafs import DiscreteSpace
+
+
+class CategoricalDist(ProbDist):
+    """Finite Cat(p) distribution on {0, ..., K - 1}, sampled with Walker's alias method.
+    A batch of distributions is given by the rows of a matrix p, i.e. the last axis
+    holds the categories."""
+
+    def __init__(self, p, gen = None):
+        """Create Cat(p) distribution.
+
+        :param p The probability vector of the K categories, or an array of them in the last axis.
+        :param gen The uniform generator to sample from, None for the shared one.
+        """
+
+        # save params
+        p = np.asarray(p, dtype=np.float64)
+        assert p.ndim >= 1 and p.shape[-1] > 0
+        assert np.all(p >= 0) and np.all(np.isclose(np.sum(p, axis=-1), 1))
+        self.p = p / np.sum(p, axis=-1, keepdims=True)
+        self.K = p.shape[-1]
+
+        super().__init__(DiscreteSpace(0, self.K), gen, (p[..., 0],))
+
+        # one alias table, or the cumulative rows of a batch shifted by their index
+        if self.batch_shape == ():
+            self.prob, self.alias = self.alias_table(self.p)
+        else:
+            F = np.cumsum(self.p.reshape(-1, self.K), axis=1)
+            F[:, -1] = 1
+            self.rows = (F + np.arange(self.batch_size)[:, None]).ravel()
+
+    @staticmethod
+    def alias_table(p):
+        """Builds the alias table of Vose's method, all columns of a round at once.
+
+        Each column keeps its own category with prob and otherwise gives its
+        alias. In a round, the deficits of the small columns are laid out one
+        after another, as are the surpluses of the large ones. A small column
+        takes the large one whose surplus contains the start of its deficit as
+        alias. Large columns, which fall below one by that, are the small
+        columns of the next round.
+
+        :param p The probability vector.
+        :returns The probabilities and aliases of the columns.
+        """
+
+        K = len(p)
+        q = p * K
+        prob = np.ones(K)
+        alias = np.arange(K)
+
+        small = np.flatnonzero(q < 1)
+        large = np.flatnonzero(q >= 1)
+        while len(small) > 0 and len(large) > 0:
+
+            # match the deficits of the small columns to the surpluses
+            start = np.cumsum(1 - q[small]) - (1 - q[small])
+            ends = np.cumsum(q[large] - 1)
+            j = np.minimum(np.searchsorted(ends, start, side='right'), len(large) - 1)
+            prob[small] = q[small]
+            alias[small] = large[j]
+
+            # the large columns lose what they donated
+            q[large] -= np.bincount(j, weights=1 - q[small], minlength=len(large))
+            small = large[q[large] < 1]
+            large = large[q[large] >= 1]
+
+        # the remaining columns are full up to rounding
+        prob[small] = 1
+        return prob, alias
+
+    def expectation(self):
+        """Calculates the expectations for that distribution.
+
+        :returns The expectation of the distribution"""
+
+        return np.sum(np.arange(self.K) * self.p, axis=-1)
+
+    def var(self):
+        """Calculates the variance for that distribution.
+
+        :returns The variance of the distribution"""
+
+        return np.sum(np.arange(self.K) ** 2 * self.p, axis=-1) - self.expectation() ** 2
+
+    def sample(self, num_samples = 1, out = None, dtype = None):
+        """Generate random numbers from Cat(p).
+
+        :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
+        :returns Random numbers x ~ Cat(p).
+        """
+
+        out = self.buffer(num_samples, out, dtype)
+
+        # a batch by one sorted search over all rows
+        if self.batch_shape != ():
+            row = np.tile(np.arange(self.batch_size), num_samples)
+            X = np.searchsorted(self.rows, row + self.gen.random(len(row)), side='right') - row * self.K
+            return self.write(X.reshape(self.sample_shape(num_samples)).astype(np.float64), out)
+
+        # one uniform picks the column, one decides between it and its alias
+        i = (self.gen.random(num_samples) * self.K).astype(np.intp)
+        V = self.gen.random(num_samples)
+        return self.write(np.where(V < self.prob[i], i, self.alias[i]).astype(np.float64), out)
+
+    def _density(self, x, out = None):
+        """This method calculates the mass Cat(p).
+
+        :param x Which value should be evaluated.
+        :param out An array to write to, None for a new one.
+        :returns The probability this element occurs.
+        """
+
+        x = np.asarray(x, dtype=np.intp)
+        if self.batch_shape == ():
+            return np.take(self.p, x, out=out)
+
+        p = np.broadcast_to(self.p, np.broadcast_shapes(x.shape, self.batch_shape) + (self.K,))
+        return self.write(np.take_along_axis(p, np.broadcast_to(x, p.shape[:-1])[..., None], axis=-1)[..., 0], out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the mass Cat(p).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the probabilities.
+        """
+
+        with np.errstate(divide='ignore'):
+            return np.log(self._density(x))
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Cat(p).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        k = np.floor(x)
+        if self.batch_shape != ():
+
+            # the mass of the categories up to k
+            below = np.arange(self.K) <= np.expand_dims(k, -1)
+            return np.sum(np.where(below, self.p, 0), axis=-1)
+
+        F = np.cumsum(self.p)
+        return np.where(k < 0, 0, F[np.clip(k, 0, self.K - 1).astype(np.intp)])
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Cat(p).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        F = np.cumsum(self.p, axis=-1)
+        F[..., -1] = 1
+        if self.batch_shape == ():
+            return np.minimum(np.searchsorted(F, u, side='left'), self.K - 1).astype(np.float64)
+
+        # the number of categories with a cdf below u
+        return np.minimum(np.sum(F < np.expand_dims(u, -1), axis=-1), self.K - 1).astype(np.float64)
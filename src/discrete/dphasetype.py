@@ -1,18 +1,20 @@
+import math as m
 import numpy as np
 
-from src.continuous.uniform import UniformDist
 from src.prob_distribution import ProbDist
+from src.sampling.inversion import DiscreteInversion
 from src.spaces.spaces1d_leafs import DiscreteSpace
 
 
 class DPhaseTypeDist(ProbDist):
     """Simple DPH(alpha, A) distribution."""
 
-    def __init__(self, alpha, A):
+    def __init__(self, alpha, A, gen = None):
         """Create DPH(alpha, A) distribution.
 
         :param alpha probability vector 1xm
         :param A mxm matrix such that (I - A) is invertible.
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
@@ -22,51 +24,161 @@ class DPhaseTypeDist(ProbDist):
         self.A = np.array(A)
         self.m = np.shape(A)[1]
 
-        # create distribution for sampling
-        self.UG = UniformDist()
-        super().__init__(DiscreteSpace(1, np.inf))
+        # the cdf table of the quantile function, created on first use
+        self.ppf_table = None
+
+        super().__init__(DiscreteSpace(1, np.inf), gen)
+
+        # cumulative tables of the initial phase and the rows, the last column is absorption
+        m = self.m
+        self.start = np.cumsum(alpha)
+        self.start[-1] = 1
+        T = np.cumsum(np.hstack([self.A, 1 - self.A.sum(axis=1, keepdims=True)]), axis=1)
+        T[:, -1] = 1
+
+        # row i is shifted by i, so one sorted search covers all rows
+        self.rows = (T + np.arange(m)[:, None]).ravel()
+
+        # the exit probabilities and alpha N, with the fundamental matrix N = (I - A)^-1
+        self.exit = 1 - self.A.sum(axis=1)
+        self.moments = None
 
     def expectation(self):
         """Calculates the expectations for that distribution.
 
         :returns The expectation of the distribution"""
 
-        alpha = self.alpha
-        A = self.A
-        m = self.m
-
-        return alpha @ np.linalg.inv((np.eye(m) - A)) @ np.ones([m, 1])
+        alphaN, _ = self.get_moments()
+        return np.sum(alphaN)
 
     def var(self):
         """Calculates the variance for that distribution.
 
         :returns The variance of the distribution"""
 
-        alpha = self.alpha
-        A = self.A
-        m = self.m
-        exp = self.expectation()
+        alphaN, alphaN2 = self.get_moments()
+        exp = np.sum(alphaN)
+
+        # E[X (X - 1)] = 2 alpha A N^2 1 and A N = N - I
+        return 2 * (np.sum(alphaN2) - exp) + exp - exp ** 2
+
+    def get_moments(self):
+        """Solves with I - A once for the moments.
+
+        :returns The row vectors alpha N and alpha N^2.
+        """
+
+        if self.moments is None:
+            lu = np.eye(self.m) - self.A
+            alphaN = np.linalg.solve(lu.T, self.alpha[0])
+            self.moments = (alphaN, np.linalg.solve(lu.T, alphaN))
+
+        return self.moments
+
+    def powers(self, x):
+        """Calculates alpha A^k for all integers k in x, walking once through the
+        sorted distinct values. Small gaps are bridged with vector matrix products,
+        large ones with a matrix power.
+
+        :param x An array of non-negative integers.
+        :returns A (len(x), m) matrix with the row vector alpha A^k for each k.
+        """
+
+        keys, inverse = np.unique(np.asarray(x, dtype=np.int64), return_inverse=True)
+        rows = np.empty((len(keys), self.m))
+
+        v = self.alpha[0]
+        k = 0
+        for i, key in enumerate(keys):
+            gap = int(key) - k
+            if gap > self.m:
+                v = v @ np.linalg.matrix_power(self.A, gap)
+            else:
+                for _ in range(gap): v = v @ self.A
+            rows[i] = v
+            k = int(key)
 
-        return alpha @ A @ np.linalg.matrix_power(np.eye(m) - A, 2) @ np.ones([m, 1]) + exp - exp ** 2
+        return rows[inverse.ravel()]
 
-    def sample(self, num_samples = 1):
+    def cdf(self, x):
+        """This method calculates the distribution function P(X <= x).
+
+        :param x Which values should be evaluated, a number or an array of integers.
+        :returns The probabilities, which are 1 - alpha A^x 1.
+        """
+
+        # the powers only take finite values, the limits are 0 and 1
+        x = np.asarray(x, dtype=np.float64)
+        finite = np.isfinite(x)
+        F = 1 - self.powers(np.where(finite, np.maximum(x, 0), 0).ravel()).sum(axis=1)
+        F = np.where(x >= 1, F.reshape(x.shape), 0)
+        F = np.where(finite, F, np.greater(x, 0) * 1.0)
+        return np.where(np.isnan(x), np.nan, F)
+
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from DPH(alpha, A).
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ DPH(alpha, A).
         """
 
-        pass
+        out = self.buffer(num_samples, out, dtype)
+
+        m = self.m
+        X = np.empty(num_samples) if out is None else out
+
+        # all chains start in a phase drawn from alpha
+        active = np.arange(num_samples)
+        phase = np.searchsorted(self.start, self.gen.random(num_samples), side='right')
+        steps = 1
+
+        # move the remaining chains jointly, until all are absorbed
+        while len(active) > 0:
+            target = np.searchsorted(self.rows, phase + self.gen.random(len(active)), side='right') - phase * (m + 1)
+            absorbed = target == m
+            X[active[absorbed]] = steps
+            active = active[~absorbed]
+            phase = target[~absorbed]
+            steps += 1
+
+        return X
 
-    def __density(self, x):
+    def _density(self, x, out = None):
         """This method calculates the mass DPH(alpha, A).
 
         :param x Which value should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability this element occurs.
         """
 
-        alpha = self.alpha
-        A = self.A
-        m = self.m
+        # no mass at infinity
+        x = np.asarray(x, dtype=np.float64)
+        finite = np.isfinite(x)
+        f = (self.powers(np.where(finite, x, 1).ravel() - 1) @ self.exit).reshape(x.shape)
+        f = np.where(finite, f, 0)
+        return self.write(np.where(np.isnan(x), np.nan, f), out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the mass DPH(alpha, A).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the probabilities.
+        """
+
+        with np.errstate(divide='ignore'):
+            return np.log(self._density(x))
+
+    def ppf(self, u):
+        """This method calculates the quantile function of DPH(alpha, A).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        if self.ppf_table is None:
+            k1 = m.ceil(self.expectation() + 10 * m.sqrt(self.var()) + 20)
+            self.ppf_table = DiscreteInversion(self.cdf, 1, np.inf, 1, k1)
 
-        return alpha @ np.linalg.matrix_power(A, x - 1) * (np.eye(m) - A) @ np.ones([m, 1])
+        return self.ppf_table.ppf(u)
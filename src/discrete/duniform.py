@@ -1,7 +1,5 @@
-import math as m
 import numpy as np
 
-from src.continuous.uniform import UniformDist
 from src.prob_distribution import ProbDist
 from src.spaces.spaces1d_leafs import DiscreteSpace
 
@@ -9,20 +7,19 @@ from src.spaces.spaces1d_leafs import DiscreteSpace
 class DUniformDist(ProbDist):
     """Sample U(K) distribution."""
 
-    def __init__(self, a = 1, b = 3):
+    def __init__(self, a = 1, b = 3, gen = None):
         """Create U(K) distribution.
 
         :param rate The rate parameter.
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
-        assert b >= a
+        assert np.all(np.greater_equal(b, a))
         self.a = a
         self.b = b
 
-        # create distribution for sampling
-        self.UG = UniformDist()
-        super().__init__(DiscreteSpace(a, b+ 1))
+        super().__init__(DiscreteSpace(a, np.add(b, 1)), gen, (a, b))
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -43,23 +40,49 @@ class DUniformDist(ProbDist):
 
         return ((b - a) * (b - a + 2)) / 12
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from Poi(rate).
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ Poi(rate).
         """
 
-        U = self.UG.sample(num_samples)
-        X = np.floor()
-        return
+        out = self.buffer(num_samples, out, dtype)
 
-    def __density(self, x):
-        """This method calculates the mass Poi(rate).
+        U = self.uniforms(num_samples, out)
+        U *= self.b - self.a + 1
+        U += self.a
+        return self.write(np.floor(U, out=U), out)
 
-        :param x Which value should be evaluated.
-        :returns The probability this element occurs.
+    def _log_density(self, x):
+        """This method calculates the logarithm of the mass U(K).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the probabilities.
         """
 
-        z = np.power(self.rate, x) / m.factorial(x)
-        return z * np.exp(-self.rate)
+        return np.full(np.shape(x), -np.log(self.b - self.a + 1))
+
+    def cdf(self, x):
+        """This method calculates the distribution function of U(K).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        a = self.a
+        b = self.b
+        return np.clip((np.floor(x) - a + 1) / (b - a + 1), 0, 1)
+
+    def ppf(self, u):
+        """This method calculates the quantile function of U(K).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        a = self.a
+        b = self.b
+        return np.maximum(a + np.ceil(np.multiply(u, b - a + 1)) - 1, a)
@@ -1,29 +1,28 @@
 import numpy as np
 
-from src.continuous.uniform import UniformDist
 from src.prob_distribution import ProbDist
 from src.spaces.spaces1d_leafs import DiscreteSpace
+from src.special import xlog1py
 
 
 class GeometricDist(ProbDist):
     """Simple Geom(p) distribution."""
 
-    def __init__(self, n = 1, p = 0.5):
+    def __init__(self, n = 1, p = 0.5, gen = None):
         """Create Geom(p) distribution.
 
         :param n Which should be summed
         :param p Probability that random var is true
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
-        assert 0 <= p <= 1
+        assert np.all(np.greater_equal(p, 0)) and np.all(np.less_equal(p, 1))
         assert 1 <= n
         self.p = p
         self.n = n
 
-        # create distribution for sampling
-        self.UG = UniformDist()
-        super().__init__(DiscreteSpace(1, np.inf))
+        super().__init__(DiscreteSpace(1, np.inf), gen, (p,))
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -39,23 +38,61 @@ class GeometricDist(ProbDist):
 
         return (1 - self.p) / self.p ** 2
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from Geom(p).
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ Geom(p).
         """
 
-        U = self.UG.sample(num_samples)
-        X = np.floor(np.log(U) / np.log(1 - self.p))
-        return X
+        out = self.buffer(num_samples, out, dtype)
 
-    def __density(self, x):
-        """This method calculates the mass Geom(p).
+        # inversion in closed form, which is cheaper than any table lookup,
+        # the infinite logarithm of p == 1 gives ones
+        U = self.uniforms(num_samples, out)
+        np.negative(U, out=U)
+        np.log1p(U, out=U)
+        with np.errstate(divide='ignore'):
+            U /= np.log1p(np.negative(self.p))
 
-        :param x Which value should be evaluated.
-        :returns The probability this element occurs.
+        np.floor(U, out=U)
+        U += 1
+        return self.write(U, out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the mass Geom(p).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the probabilities.
+        """
+
+        return xlog1py(np.subtract(x, 1), -self.p) + np.log(self.p)
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Geom(p).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
         """
 
-        f = np.power(1 - self.p, x - 1) * self.p
-        return f
+        k = np.floor(x)
+        with np.errstate(divide='ignore'):
+            F = -np.expm1(np.maximum(k, 0) * np.log1p(-self.p))
+
+        return np.where(k < 1, 0, F)
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Geom(p).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        # the closed form, corrected where rounding crossed an integer
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k = np.maximum(np.ceil(np.log1p(np.negative(u)) / np.log1p(-self.p)), 1)
+
+        k = np.where(np.equal(self.p, 1), 1, k)
+        return np.where((k > 1) & (self.cdf(k - 1) >= u), k - 1, k)
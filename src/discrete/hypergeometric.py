@@ -1,20 +1,25 @@
 import math as m
 import numpy as np
 
-from src.continuous.uniform import UniformDist
+from functools import lru_cache
+
 from src.prob_distribution import ProbDist
+from src.sampling.inversion import GuideTable, cache_size
+from src.sampling.rejection import rejection_sample, rejection_sample_slots
 from src.spaces.spaces1d_leafs import DiscreteSpace
+from src.special import gammaln, logbinom
 
 
 class HyperGeometricDist(ProbDist):
     """Simple Hyp(n, r, N) distribution."""
 
-    def __init__(self, n = 20, r = 150, N = 300):
+    def __init__(self, n = 20, r = 150, N = 300, gen = None):
         """Create Hyp(n, r, N) distribution.
 
         :param n offset vars
         :param r binomaial offset
         :param N biggest number.
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
@@ -25,10 +30,13 @@ class HyperGeometricDist(ProbDist):
         # generate upper and lower bound
         lb = np.maximum(0, r + n - N)
         ub = np.minimum(n, r)
+        self.lb = lb
+        self.ub = ub
+
+        # the guide table of the inversion, created on first use
+        self.table = None
 
-        # create distribution for sampling
-        self.UG = UniformDist()
-        super().__init__(DiscreteSpace(lb, ub + 1))
+        super().__init__(DiscreteSpace(lb, ub + 1), gen, (n, r, N))
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -48,26 +56,236 @@ class HyperGeometricDist(ProbDist):
 
         return n * r / N * (1 - (r / N)) * (N - n) / (N - 1)
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from Hyp(n, r, N).
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
+        :returns Random numbers x ~ Hyp(n, r, N).
+        """
+
+        out = self.buffer(num_samples, out, dtype)
+
+        # one triple of parameters per random number, HRUA copes with all of them
+        if self.batch_shape != ():
+            n, r, N = self.slot_params(num_samples, self.n, self.r, self.N)
+            params = self.hrua_params(n, r, N)
+            X = rejection_sample_slots(lambda idx: self.hrua_candidates([z[idx] for z in params], len(idx)),
+                                       len(n), 0.6)
+            return self.write(self.hrua_map(X, n, r, N).reshape(self.sample_shape(num_samples)), out)
+
+        # both methods have costs independent of N and n
+        lo, hi = self.window()
+        X = self.rand_inversion(num_samples, lo, hi) \
+            if hi - lo < 1024 else \
+            self.rand_hrua(num_samples)
+
+        return self.write(X, out)
+
+    def window(self):
+        """All but a negligible part of the mass lies in this window.
+
+        :returns The smallest and the biggest value of the window.
+        """
+
+        sd = m.sqrt(self.var())
+        lo = int(max(self.lb, m.floor(self.expectation() - 10 * sd - 20)))
+        hi = int(min(self.ub, m.ceil(self.expectation() + 10 * sd + 20)))
+        return lo, hi
+
+    def get_table(self, lo, hi):
+        """Fetches the shared guide table of the scalar parameters, as python
+        numbers, since the cache needs hashable keys and 0-d arrays aren't.
+
+        :param lo The smallest value of the table.
+        :param hi The biggest value of the table.
+        :returns The guide table.
+        """
+
+        return hypergeometric_table(int(self.n), int(self.r), int(self.N), int(lo), int(hi))
+
+    def rand_inversion(self, num_samples, lo, hi):
+        """Creates random variables, if the support is small, by inversion with a
+        precomputed guide table of the cdf.
+
+        :param num_samples How many random numbers should be generated.
+        :param lo The smallest value of the table.
+        :param hi The biggest value of the table.
+        :returns Random numbers x ~ Hyp(n, r, N).
+        """
+
+        if self.table is None:
+            self.table = self.get_table(lo, hi)
+
+        return self.table.sample(self.gen, num_samples)
+
+    def rand_hrua(self, num_samples):
+        """Creates random variables, if the support is big.
+        Stadlober's ratio of uniforms method (HRUA) from [1] implemented underneath.
+
+        :param num_samples How many random numbers should be generated.
+        :returns Random numbers x ~ Hyp(n, r, N).
+
+        Refs: [1] https://doi.org/10.1016/0377-0427(90)90349-5.
+        """
+
+        params = self.hrua_params(self.n, self.r, self.N)
+        X = rejection_sample(lambda k: self.hrua_candidates(params, k), num_samples, 0.6)
+        return self.hrua_map(X, self.n, self.r, self.N)
+
+    @staticmethod
+    def hrua_params(n, r, N):
+        """Calculates the constants of HRUA, which works with the smaller sample
+        and the smaller group.
+
+        :param n The sample size, or an array of them.
+        :param r The size of the group, or an array of them.
+        :param N The size of the population, or an array of them.
+        :returns The constants sample, mingb, maxgb, a, h, g and b.
+        """
+
+        # work with the smaller sample and the smaller group
+        sample = np.minimum(n, N - n)
+        mingb = np.minimum(r, N - r)
+        maxgb = np.maximum(r, N - r)
+
+        # some pre settings
+        p = mingb / N
+        q = maxgb / N
+        a = sample * p + 0.5
+        c = np.sqrt((N - sample) * sample * p * q / (N - 1) + 0.5)
+        h = 1.7155277699214135 * c + 0.8989161620588988
+        mode = np.floor((sample + 1) * (mingb + 1) / (N + 2))
+        g = gammaln(mode + 1) + gammaln(mingb - mode + 1) \
+            + gammaln(sample - mode + 1) + gammaln(maxgb - sample + mode + 1)
+        b = np.minimum(np.minimum(sample, mingb) + 1, np.floor(a + 16 * c))
+        return sample, mingb, maxgb, a, h, g, b
+
+    def hrua_candidates(self, params, num_candidates):
+        """Proposes candidates of HRUA, either for one triple of parameters or
+        for one triple per candidate.
+
+        :param params The constants of hrua_params(), numbers or arrays alike.
+        :param num_candidates How many candidates should be proposed.
+        :returns The candidates and a mask of the accepted ones.
+        """
+
+        sample, mingb, maxgb, a, h, g, b = params
+
+        # two uniform ones
+        U = self.gen.random(num_candidates)
+        V = self.gen.random(num_candidates)
+        with np.errstate(divide='ignore'):
+            X = a + h * (V - 0.5) / U
+
+        # acceptance check for the ones inside the bounds
+        K = np.floor(X)
+        rest = (X >= 0) & (X < b)
+        Kr = K[rest]
+        Ur = U[rest]
+        pick = lambda z: z[rest] if np.ndim(z) > 0 else z
+        T = pick(g) - gammaln(Kr + 1) - gammaln(pick(mingb) - Kr + 1) \
+            - gammaln(pick(sample) - Kr + 1) - gammaln(pick(maxgb) - pick(sample) + Kr + 1)
+
+        accept = np.zeros(num_candidates, dtype=bool)
+        accept[rest] = (Ur * (4 - Ur) - 3 <= T) | ((Ur * (Ur - T) < 1) & (2 * np.log(Ur) <= T))
+        return K, accept
+
+    @staticmethod
+    def hrua_map(X, n, r, N):
+        """Maps the random numbers of HRUA back to the original parameters.
+
+        :param X The random numbers for the smaller sample and the smaller group.
+        :param n The sample size, or an array of them.
+        :param r The size of the group, or an array of them.
+        :param N The size of the population, or an array of them.
         :returns Random numbers x ~ Hyp(n, r, N).
         """
 
-        pass
+        sample = np.minimum(n, N - n)
+        X = np.where(r > N - r, sample - X, X)
+        return np.where(sample < n, r - X, X)
 
-    def __density(self, x):
-        """This method calculates the mass Hyp(n, r, N).
+    def _log_density(self, x):
+        """This method calculates the logarithm of the mass Hyp(n, r, N).
 
-        :param x Which value should be evaluated.
-        :returns The probability this element occurs.
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the probabilities.
         """
 
         r = self.r
         N = self.N
         n = self.n
+        return logbinom(r, x) + logbinom(N - r, np.subtract(n, x)) - logbinom(N, n)
+
+    def tables(self):
+        """Fetches the shared cdf tables over the full support, one for each
+        element of the parameters.
+
+        :returns Pairs of the index of the element and its guide table.
+        """
+
+        n, r, N = (np.broadcast_to(p, self.batch_shape) for p in (self.n, self.r, self.N))
+        for idx in np.ndindex(self.batch_shape):
+            lo = max(0, r[idx] + n[idx] - N[idx])
+            hi = min(n[idx], r[idx])
+            yield idx, hypergeometric_table(int(n[idx]), int(r[idx]), int(N[idx]), int(lo), int(hi))
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Hyp(n, r, N).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        x = np.asarray(x, dtype=np.float64)
+        F = np.empty(np.broadcast_shapes(x.shape, self.batch_shape))
+        x = np.broadcast_to(x, F.shape)
+
+        # the parameters of the last axes have their own table
+        for idx, table in self.tables():
+            k = np.floor(x[(Ellipsis,) + idx]) - table.offset
+            F[(Ellipsis,) + idx] = np.where(k < 0, 0, table.cdf[np.clip(k, 0, len(table.cdf) - 1).astype(np.intp)])
+
+        return F
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Hyp(n, r, N).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        u = np.asarray(u, dtype=np.float64)
+        X = np.empty(np.broadcast_shapes(u.shape, self.batch_shape))
+        u = np.broadcast_to(u, X.shape)
+
+        # the parameters of the last axes have their own table
+        for idx, table in self.tables():
+            v = u[(Ellipsis,) + idx]
+            k = np.minimum(np.searchsorted(table.cdf, v, side='left'), len(table.cdf) - 1)
+            X[(Ellipsis,) + idx] = table.offset + np.where(np.equal(v, 1), len(table.cdf) - 1, k)
+
+        return X
+
+
+@lru_cache(maxsize=cache_size)
+def hypergeometric_table(n, r, N, lo, hi):
+    """Creates the guide table of Hyp(n, r, N), shared by all instances with these parameters.
+
+    :param n offset vars
+    :param r binomaial offset
+    :param N biggest number.
+    :param lo The smallest value of the table.
+    :param hi The biggest value of the table.
+    :returns The guide table.
+    """
+
+    # the mass in log space, so that nothing overflows
+    k = np.arange(lo, hi + 1)
+    lpmf = logbinom(r, k) + logbinom(N - r, n - k) - logbinom(N, n)
 
-        t = m.factorial(r) / (m.factorial(x) * m.factorial(r - x))
-        t *= m.factorial(N - r) / (m.factorial(n - x) * m.factorial(N - r - n + x))
-        return t / (m.factorial(N) / (m.factorial(n) * m.factorial(N - n)))
+    # the rounding of the huge binomials shifts the total mass, e.g. by 1e-9
+    F = np.cumsum(np.exp(lpmf))
+    return GuideTable(F / F[-1], lo)
@@ -4,29 +4,38 @@ import numpy as np
 from src.continuous.gamma import GammaDist
 from src.discrete.poisson import PoissonDist
 from src.prob_distribution import ProbDist
+from src.sampling.inversion import DiscreteInversion
 from src.spaces.spaces1d_leafs import DiscreteSpace
+from src.special import betainc, gammaln, logfactorial, xlog1py, xlogy
 
 
 class NegBinDist(ProbDist):
     """Simple ngeative binomial distribution."""
 
-    def __init__(self, r = 10, p = 0.5):
+    # the quantile function is a table for scalar parameters
+    batch_ppf = False
+
+    def __init__(self, r = 10, p = 0.5, gen = None):
         """Create NegBin(r, p) distribution.
 
         :param r Which should be summed
         :param p Probability that random var is true
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
-        assert 0 <= p <= 1
-        assert 0 <= r
+        assert np.all(np.greater_equal(p, 0)) and np.all(np.less_equal(p, 1))
+        assert np.all(np.greater_equal(r, 0))
         self.r = r
         self.p = p
 
+        # the cdf table of the quantile function, created on first use
+        self.ppf_table = None
+
         # create distribution for sampling
-        self.GG = GammaDist(r, p / (1 - p))
-        self.PG = PoissonDist(0.1)
-        super().__init__(DiscreteSpace(0, np.inf))
+        super().__init__(DiscreteSpace(0, np.inf), gen, (r, p))
+        self.GG = GammaDist(r, np.divide(p, np.subtract(1, p)), gen=self.gen)
+        self.PG = PoissonDist(gen=self.gen)
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -46,30 +55,56 @@ class NegBinDist(ProbDist):
         p = self.p
         return r * (1 - p) / p ** 2
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from NegBin(r, p).
 
         :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
         :returns Random numbers x ~ NegBin(r, p).
         """
 
-        # a gamma generator and the result vector
-        L = self.GG.sample(num_samples)
-        X = np.empty(num_samples)
+        out = self.buffer(num_samples, out, dtype)
 
-        # fill it up
-        for k in range(len(X)):
-            self.PG.rate = L[k]
-            X[k] = self.PG.sample()
+        # a gamma mixture of poisson ones
+        L = self.GG.sample(num_samples)
+        return self.write(self.PG.sample_rates(L), out)
 
-    def __density(self, x):
-        """This method calculates the mass NegBin(r, p).
+    def _log_density(self, x):
+        """This method calculates the logarithm of the mass NegBin(r, p).
 
-        :param x Which value should be evaluated.
-        :returns The probability this element occurs.
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the probabilities.
         """
 
         r = self.r
         p = self.p
-        prev = m.gamma(r + x) / (m.gamma(r) * m.factorial(x))
-        return prev * p ** r * (1 - p) ** x
+        return gammaln(np.add(r, x)) - gammaln(r) - logfactorial(x) + xlogy(r, p) + xlog1py(x, -p)
+
+    def cdf(self, x):
+        """This method calculates the distribution function of NegBin(r, p).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        k = np.floor(x)
+        F = betainc(self.r, np.maximum(k, 0) + 1, self.p)
+        return np.where(k < 0, 0, F)
+
+    def ppf(self, u):
+        """This method calculates the quantile function of NegBin(r, p).
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        # the table is built for scalar parameters
+        assert self.batch_shape == ()
+        if self.ppf_table is None:
+            sd = m.sqrt(self.var())
+            k0 = max(0, m.floor(self.expectation() - 10 * sd - 20))
+            k1 = m.ceil(self.expectation() + 10 * sd + 20)
+            self.ppf_table = DiscreteInversion(self.cdf, 0, np.inf, k0, k1)
+
+        return self.ppf_table.ppf(u)
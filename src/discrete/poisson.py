@@ -1,27 +1,39 @@
 import math as m
 import numpy as np
 
-from src.continuous.uniform import UniformDist
+from functools import lru_cache
+
 from src.prob_distribution import ProbDist
+from src.sampling.inversion import DiscreteInversion, GuideTable, cache_size
+from src.sampling.rejection import rejection_sample, rejection_sample_slots
 from src.spaces.spaces1d_leafs import DiscreteSpace
+from src.special import gammaincc, gammaln, logfactorial, xlogy
 
 
 class PoissonDist(ProbDist):
     """Simple Poi(rate) distribution."""
 
-    def __init__(self, rate=1):
+    # the quantile function is a table for scalar parameters
+    batch_ppf = False
+
+    def __init__(self, rate=1, gen = None):
         """Create Poi(rate) distribution.
 
         :param rate The rate parameter.
+        :param gen The uniform generator to sample from, None for the shared one.
         """
 
         # save params
-        assert 0 < rate
+        assert np.all(np.greater(rate, 0))
         self.rate = rate
 
-        # create distribution for sampling
-        self.UG = UniformDist()
-        super().__init__(DiscreteSpace(0, np.inf))
+        # the guide table of the inversion, created on first use
+        self.table = None
+
+        # the cdf table of the quantile function, created on first use
+        self.ppf_table = None
+
+        super().__init__(DiscreteSpace(0, np.inf), gen, (rate,))
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -37,38 +49,180 @@ class PoissonDist(ProbDist):
 
         return self.rate
 
-    def sample(self, num_samples = 1):
+    def sample(self, num_samples = 1, out = None, dtype = None):
         """Generate random numbers from Poi(rate).
 
+        :param num_samples How many random numbers should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
+        :returns Random numbers x ~ Poi(rate).
+        """
+
+        out = self.buffer(num_samples, out, dtype)
+
+        # one rate per random number
+        if self.batch_shape != ():
+            rates, = self.slot_params(num_samples, self.rate)
+            return self.write(self.sample_rates(rates).reshape(self.sample_shape(num_samples)), out)
+
+        # both methods have constant expected costs per sample
+        X = self.rand_inversion(num_samples) \
+            if self.rate < 10 else \
+            self.rand_ptrs(num_samples)
+
+        return self.write(X, out)
+
+    def rand_inversion(self, num_samples):
+        """Creates random variables, if the rate is small, by inversion with a
+        precomputed guide table of the cdf.
+
         :param num_samples How many random numbers should be generated.
         :returns Random numbers x ~ Poi(rate).
         """
 
-        X = np.empty(num_samples)
-        for k in range(len(X)):
+        # the cache needs hashable keys, 0-d arrays aren't
+        if self.table is None:
+            self.table = poisson_table(float(self.rate))
+
+        return self.table.sample(self.gen, num_samples)
+
+    def rand_ptrs(self, num_samples):
+        """Creates random variables, if the rate is bigger or equal to 10.
+
+        :param num_samples How many random numbers should be generated.
+        :returns Random numbers x ~ Poi(rate).
+        """
+
+        return rejection_sample(lambda k: self.ptrs_candidates(self.rate, k), num_samples, 0.85)
+
+    def ptrs_candidates(self, rate, num_candidates):
+        """Proposes candidates of Hörmann's transformed rejection with squeeze (PTRS)
+        from [1], either for one rate or for one rate per candidate.
+
+        :param rate The rate, at least 10, or an array with the rate of each candidate.
+        :param num_candidates How many candidates should be proposed.
+        :returns The candidates and a mask of the accepted ones.
+
+        Refs: [1] https://doi.org/10.1016/0167-6687(93)90997-4.
+        """
+
+        # some pre settings
+        slam = np.sqrt(rate)
+        loglam = np.log(rate)
+        b = 0.931 + 2.53 * slam
+        a = -0.059 + 0.02483 * b
+        invalpha = 1.1239 + 1.1328 / (b - 3.4)
+        vr = 0.9277 - 3.6224 / (b - 2)
+
+        # two uniform ones
+        U = self.gen.random(num_candidates) - 0.5
+        V = self.gen.random(num_candidates)
+        us = 0.5 - np.abs(U)
+        k = np.floor((2 * a / us + b) * U + rate + 0.43)
+
+        # quick acceptance
+        accept = (us >= 0.07) & (V <= vr)
+
+        # acceptance check for the rest
+        rest = ~accept & (k >= 0) & ((us >= 0.013) | (V <= us))
+        kr = k[rest]
+        pick = lambda z: z[rest] if np.ndim(z) > 0 else z
+        lhs = np.log(V[rest] * pick(invalpha) / (pick(a) / us[rest] ** 2 + pick(b)))
+        accept[rest] = lhs <= -pick(rate) + kr * pick(loglam) - gammaln(kr + 1)
+
+        return k, accept
+
+    def sample_rates(self, rates):
+        """Generate one random number from Poi(rate) for each of the passed rates.
+
+        :param rates An array of non-negative rates.
+        :returns Random numbers x_i ~ Poi(rates_i).
+        """
+
+        rates = np.asarray(rates, dtype=np.float64)
+        X = np.empty(np.shape(rates))
 
-            # starting
-            n = 1
-            a = 1
-            Un = self.UG.sample()
-            a = a * Un
+        # small rates by a joint sequential search, large ones by PTRS
+        small = rates < 10
+        X[small] = self.rand_search(rates[small])
+        large = rates[~small]
+        X[~small] = rejection_sample_slots(lambda idx: self.ptrs_candidates(large[idx], len(idx)),
+                                           len(large), 0.85)
 
-            # iterate over
-            while a >= np.exp(-self.rate):
-                n = n + 1
-                Un = self.UG.sample()
-                a = a * Un
+        return X
 
-            X[k] = n - 1
+    def rand_search(self, rates):
+        """Creates random variables for small rates by inversion, advancing the
+        sequential search of all uniforms together.
+
+        :param rates An array of rates smaller than 10.
+        :returns Random numbers x_i ~ Poi(rates_i).
+        """
+
+        U = self.gen.random(len(rates))
+        X = np.zeros(len(rates))
+        p = np.exp(-rates)
+        F = p.copy()
+
+        # only the ones which did not exceed their uniform yet
+        active = np.flatnonzero(U >= F)
+        k = 0
+        while len(active) > 0:
+            k += 1
+            p[active] *= rates[active] / k
+            F[active] += p[active]
+            X[active] = k
+            active = active[(U[active] >= F[active]) & (p[active] > 0)]
 
         return X
 
-    def __density(self, x):
-        """This method calculates the mass Poi(rate).
+    def _log_density(self, x):
+        """This method calculates the logarithm of the mass Poi(rate).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the probabilities.
+        """
+
+        return xlogy(x, self.rate) - self.rate - logfactorial(x)
+
+    def cdf(self, x):
+        """This method calculates the distribution function of Poi(rate).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities P(X <= x).
+        """
+
+        k = np.floor(x)
+        F = gammaincc(np.maximum(k, 0) + 1, self.rate)
+        return np.where(k < 0, 0, F)
+
+    def ppf(self, u):
+        """This method calculates the quantile function of Poi(rate).
 
-        :param x Which value should be evaluated.
-        :returns The probability this element occurs.
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
         """
 
-        z = np.power(self.rate, x) / m.factorial(x)
-        return z * np.exp(-self.rate)
+        # the table is built for scalar parameters
+        assert self.batch_shape == ()
+        if self.ppf_table is None:
+            sd = m.sqrt(self.rate)
+            k0 = max(0, m.floor(self.rate - 10 * sd - 20))
+            k1 = m.ceil(self.rate + 10 * sd + 20)
+            self.ppf_table = DiscreteInversion(self.cdf, 0, np.inf, k0, k1)
+
+        return self.ppf_table.ppf(u)
+
+
+@lru_cache(maxsize=cache_size)
+def poisson_table(rate):
+    """Creates the guide table of Poi(rate), shared by all instances with that rate.
+
+    :param rate The rate parameter.
+    :returns The guide table.
+    """
+
+    # the table covers all but a negligible part of the tail
+    k = np.arange(1, int(rate + 10 * m.sqrt(rate) + 20))
+    pmf = np.exp(-rate) * np.cumprod(np.concatenate([[1], rate / k]))
+    return GuideTable(np.cumsum(pmf))
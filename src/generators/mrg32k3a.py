@@ -0,0 +1,411 @@
+import numpy as np
+import random
+
+# some fixed numbers for good stochastic performance.
+mx = 2 ** 32 - 209
+my = 2 ** 21 - 22853
+axt1 = 1403580
+axt2 = 810728
+ayt0 = 527612
+ayt2 = 1370589
+
+# companion matrices, the state is kept as (s0, s1, s2) with s0 the newest element
+Ax = [[0, axt1, axt2], [1, 0, 0], [0, 1, 0]]
+Ay = [[ayt0, 0, ayt2], [1, 0, 0], [0, 1, 0]]
+ax = Ax[0]
+ay = Ay[0]
+
+# how many positions of the stream are computed per step of the block engine
+block_size = 1024
+
+# the periods of both recurrences, which all but few seeds reach: the first
+# characteristic polynomial is irreducible but not primitive, the second modulus
+# is 3 * 691433 and its part modulo 3 becomes periodic after two steps
+period_x = (mx ** 3 - 1) // 2
+period_y = 159359864496
+
+# both are coprime, so the combined sequence repeats after about 2^132.2 draws
+period = period_x * period_y
+
+# distance between substreams and streams, which leaves num_streams disjoint
+# streams of 2^24 substreams each within the period
+substream_length = 2 ** 76
+stream_length = 2 ** 100
+num_streams = period // stream_length
+
+# the jump matrices to the next substream and stream, created on first use
+jump_cache = {}
+
+
+def mat_vec_mod(A, s, mod):
+    """Multiplies a 3x3 matrix with a state modulo mod.
+
+    :param A The matrix as nested lists.
+    :param s The state as a list.
+    :param mod The modulus of the recurrence.
+    :returns The new state as a list.
+    """
+
+    return [(r[0] * s[0] + r[1] * s[1] + r[2] * s[2]) % mod for r in A]
+
+
+def mat_mul_mod(A, B, mod):
+    """Multiplies two 3x3 matrices modulo mod.
+
+    :param A The left matrix as nested lists.
+    :param B The right matrix as nested lists.
+    :param mod The modulus of the recurrence.
+    :returns The product as nested lists.
+    """
+
+    return [[sum(A[i][k] * B[k][j] for k in range(3)) % mod for j in range(3)] for i in range(3)]
+
+
+def mat_pow_mod(A, e, mod):
+    """Calculates A^e modulo mod by repeated squaring, hence in O(log e).
+
+    :param A The matrix as nested lists.
+    :param e The non-negative exponent.
+    :param mod The modulus of the recurrence.
+    :returns The power as nested lists.
+    """
+
+    assert e >= 0
+
+    P = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    while e > 0:
+        if e & 1: P = mat_mul_mod(P, A, mod)
+        A = mat_mul_mod(A, A, mod)
+        e >>= 1
+
+    return P
+
+
+def jump_matrices(e):
+    """Calculates the matrices advancing both recurrences by e steps.
+
+    :param e How many steps should be skipped.
+    :returns The matrices for both recurrences.
+    """
+
+    # only the jumps to the next substream and stream are used over and over,
+    # caching any other distance would grow the cache forever
+    if e not in (substream_length, stream_length):
+        return mat_pow_mod(Ax, e, mx), mat_pow_mod(Ay, e, my)
+
+    if e not in jump_cache:
+        jump_cache[e] = (mat_pow_mod(Ax, e, mx), mat_pow_mod(Ay, e, my))
+
+    return jump_cache[e]
+
+
+def jump_multiple(length, k):
+    """Calculates the matrices advancing both recurrences by k times length steps,
+    as powers of the cached jump by length.
+
+    :param length The substream or stream length.
+    :param k How many of them should be skipped.
+    :returns The matrices for both recurrences.
+    """
+
+    Jx, Jy = jump_matrices(length)
+    return mat_pow_mod(Jx, k, mx), mat_pow_mod(Jy, k, my)
+
+
+def lookahead(a, mod, num):
+    """Calculates the coefficients of the next elements in terms of the current state.
+
+    :param a First row of the companion matrix.
+    :param mod The modulus of the recurrence.
+    :param num How many elements should be looked ahead.
+    :returns A (num, 3) matrix, where row i holds the coefficients of element i + 1.
+    """
+
+    # the coefficients follow the same recurrence as the elements itself
+    state = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    rows = []
+    for _ in range(num):
+        row = [sum(a[j] * state[j][i] for j in range(3)) % mod for i in range(3)]
+        state = [row] + state[:2]
+        rows.append(row)
+
+    return np.array(rows, dtype=np.int64)
+
+
+def mod_dot(S, C, mod):
+    """Evaluates S @ C.T modulo mod exactly.
+
+    :param S A (K, 3) matrix of states.
+    :param C A (B, 3) matrix of coefficients.
+    :param mod The modulus of the recurrence.
+    :returns A (K, B) matrix holding the elements.
+    """
+
+    # sums of products stay exact in double precision up to 2^53, which allows
+    # to use the fast floating point matrix product
+    S = S.astype(np.float64)
+
+    # small moduli fit directly
+    if mod < 2 ** 25:
+        return (S @ C.T.astype(np.float64)).astype(np.int64) % mod
+
+    # split the coefficients in 16 bit halves, so that each product fits in 48 bit
+    lo = (S @ (C & 0xFFFF).T.astype(np.float64)).astype(np.int64)
+    hi = (S @ (C >> 16).T.astype(np.float64)).astype(np.int64) % mod
+    return (hi * 65536 + lo) % mod
+
+
+class MRG32k3a:
+    """Block engine for the combined multiple recursive generator MRG32k3a.
+
+    The sequence is cut into streams which start 2^100 draws apart, each of
+    them is split into substreams which start 2^76 draws apart. Every jump is
+    done with powers of the companion matrices, so no numbers have to be
+    generated.
+
+    The second modulus 2^21 - 22853 = 3 * 691433 of this generator is not
+    prime, so the layout of RngStreams doesn't carry over. The first recurrence
+    has the period (mx^3 - 1) / 2, about 2^95.0, the second one 159359864496,
+    about 2^37.2, after its first two steps. The period of the combined
+    sequence is their product, about 2^132.2, which holds num_streams, about
+    2^32.2, disjoint streams.
+    """
+
+    # coefficient tables shared by all generators, created on first use
+    tables = None
+
+    def __init__(self, seed = None):
+        """Create the generator and seed it.
+
+        :param seed See seed().
+        """
+
+        self.seed(seed)
+
+    def seed(self, seed = None):
+        """Seeds the generator and makes the current position the start of its stream.
+
+        :param seed None to draw the state from python's random module, an integer
+        to derive it reproducibly or a sequence of the six state values x0, x1, x2,
+        y0, y1, y2.
+        """
+
+        if seed is None or isinstance(seed, (int, np.integer)):
+            rand = random if seed is None else random.Random(seed)
+            X = [rand.randint(1, mx - 1) for _ in range(3)]
+            Y = [rand.randint(1, my - 1) for _ in range(3)]
+        else:
+            X = [int(v) for v in seed[:3]]
+            Y = [int(v) for v in seed[3:]]
+
+        # the recurrences may not start in zero
+        assert len(X) == len(Y) == 3
+        assert all(0 <= v < mx for v in X) and any(X)
+        assert all(0 <= v < my for v in Y) and any(Y)
+
+        # starts of the current stream and substream
+        self.X = X
+        self.Y = Y
+        self.stream_start = (X, Y)
+        self.substream_start = (X, Y)
+
+    def get_state(self):
+        """Captures the complete state of the generator.
+
+        :returns The current state and the starts of the stream and substream.
+        """
+
+        return (list(self.X), list(self.Y)), self.stream_start, self.substream_start
+
+    def set_state(self, state):
+        """Restores a state captured by get_state().
+
+        :param state The state of the generator.
+        """
+
+        (X, Y), self.stream_start, self.substream_start = state
+        self.X = list(X)
+        self.Y = list(Y)
+
+    def copy(self):
+        """Creates an independent generator with the same state.
+
+        :returns The copied generator.
+        """
+
+        gen = MRG32k3a.__new__(MRG32k3a)
+        gen.__dict__.update(self.__dict__)
+        return gen
+
+    def advance(self, n):
+        """Moves the generator n steps ahead in O(log n).
+
+        :param n How many numbers should be skipped.
+        """
+
+        Jx, Jy = jump_matrices(n)
+        self.X = mat_vec_mod(Jx, self.X, mx)
+        self.Y = mat_vec_mod(Jy, self.Y, my)
+
+    def reset_stream(self):
+        """Moves the generator back to the start of its stream."""
+
+        self.X, self.Y = self.stream_start
+        self.substream_start = self.stream_start
+
+    def reset_substream(self):
+        """Moves the generator back to the start of its current substream."""
+
+        self.X, self.Y = self.substream_start
+
+    def next_substream(self):
+        """Moves the generator to the start of the next substream."""
+
+        Jx, Jy = jump_matrices(substream_length)
+        X, Y = self.substream_start
+        self.substream_start = (mat_vec_mod(Jx, X, mx), mat_vec_mod(Jy, Y, my))
+        self.reset_substream()
+
+    def stream(self, k):
+        """Creates a generator at the start of stream k, counted from the stream of
+        this generator. Distinct streams start 2^100 draws apart.
+
+        :param k The non-negative index of the stream, below num_streams.
+        :returns The new generator.
+        """
+
+        # further streams would wrap around the period onto the first ones
+        if not 0 <= k < num_streams:
+            raise ValueError('stream %d is not below the %d disjoint streams' % (k, num_streams))
+
+        Jx, Jy = jump_multiple(stream_length, k)
+        X, Y = self.stream_start
+
+        gen = self.copy()
+        gen.stream_start = (mat_vec_mod(Jx, X, mx), mat_vec_mod(Jy, Y, my))
+        gen.reset_stream()
+        return gen
+
+    def substream(self, j):
+        """Creates a generator at the start of substream j of the current stream.
+
+        :param j The non-negative index of the substream, below 2^24.
+        :returns The new generator.
+        """
+
+        # further substreams would run into the next stream
+        if not 0 <= j < stream_length // substream_length:
+            raise ValueError('substream %d is not within the stream' % j)
+
+        Jx, Jy = jump_multiple(substream_length, j)
+        X, Y = self.stream_start
+
+        gen = self.copy()
+        gen.substream_start = (mat_vec_mod(Jx, X, mx), mat_vec_mod(Jy, Y, my))
+        gen.reset_substream()
+        return gen
+
+    @classmethod
+    def get_tables(cls):
+        """Creates the coefficient tables of one block once.
+
+        :returns The tables for both recurrences.
+        """
+
+        if cls.tables is None:
+            cls.tables = (lookahead(ax, mx, block_size), lookahead(ay, my, block_size))
+
+        return cls.tables
+
+    def next_scalar(self):
+        """Advances both recurrences by a single step.
+
+        :returns The combined element in [0, 1).
+        """
+
+        # two MRG
+        x = (axt1 * self.X[1] + axt2 * self.X[2]) % mx
+        y = (ayt0 * self.Y[0] + ayt2 * self.Y[2]) % my
+
+        # update state
+        self.X = [x] + self.X[:2]
+        self.Y = [y] + self.Y[:2]
+
+        # combine
+        return (x - y + (mx if x <= y else 0)) / (mx + 1)
+
+    def random(self, num_samples = 1, out = None):
+        """Generate uniform numbers in [0, 1).
+
+        The stream is cut into blocks and all positions of a block are computed at
+        once from the state at its start, using the precomputed coefficient tables.
+        The output is identical to the one of the scalar recurrence.
+
+        :param num_samples How many random numbers should be generated.
+        :param out A flat array of length num_samples to write to, None for a new one.
+        :returns Random numbers from U(0, 1).
+        """
+
+        assert out is None or np.shape(out) == (num_samples,)
+        elements = np.empty(num_samples) if out is None else out
+
+        # tiny requests are cheaper in pure python
+        if num_samples < 8:
+            for k in range(num_samples):
+                elements[k] = self.next_scalar()
+
+            return elements
+
+        Cx, Cy = self.get_tables()
+        num_blocks = -(-num_samples // block_size)
+
+        # the states at the start of each block, jumping a whole block per step
+        Sx = np.empty((num_blocks, 3), dtype=np.int64)
+        Sy = np.empty((num_blocks, 3), dtype=np.int64)
+        Jx = Cx[-1:-4:-1].tolist()
+        Jy = Cy[-1:-4:-1].tolist()
+        X, Y = self.X, self.Y
+        for k in range(num_blocks):
+            Sx[k] = X
+            Sy[k] = Y
+            X = mat_vec_mod(Jx, X, mx)
+            Y = mat_vec_mod(Jy, Y, my)
+
+        # evaluate a bounded number of blocks at once
+        step = 256
+        for s in range(0, num_blocks, step):
+            x = mod_dot(Sx[s:s + step], Cx, mx).ravel()
+            y = mod_dot(Sy[s:s + step], Cy, my).ravel()
+
+            # combine
+            u = x - y
+            u[x <= y] += mx
+            lo = s * block_size
+            hi = min(lo + len(u), num_samples)
+            elements[lo:hi] = u[:hi - lo] / (mx + 1)
+
+        # the newest three elements form the new state
+        last = (num_samples - 1) % block_size
+        x = mod_dot(Sx[-1:], Cx[max(last - 2, 0):last + 1], mx).ravel().tolist()
+        y = mod_dot(Sy[-1:], Cy[max(last - 2, 0):last + 1], my).ravel().tolist()
+        self.X = (x[::-1] + Sx[-1].tolist())[:3]
+        self.Y = (y[::-1] + Sy[-1].tolist())[:3]
+
+        return elements
+
+
+# generator shared by all distributions which don't get their own
+shared = None
+
+
+def default_generator():
+    """Returns the shared generator, which is created on first use.
+
+    :returns The default generator.
+    """
+
+    global shared
+    if shared is None:
+        shared = MRG32k3a()
+
+    return shared
@@ -0,0 +1,304 @@
+import math as m
+import numpy as np
+import random
+
+# primitive polynomials and initial direction numbers of Joe and Kuo [1] for the
+# dimensions 2, 3, ..., as (degree s, coefficients a, m_1, ..., m_s)
+#
+# Refs: [1] https://doi.org/10.1137/070709359.
+sobol_table = [
+    (1, 0, [1]),
+    (2, 1, [1, 3]),
+    (3, 1, [1, 3, 1]),
+    (3, 2, [1, 1, 1]),
+    (4, 1, [1, 1, 3, 3]),
+    (4, 4, [1, 3, 5, 13]),
+    (5, 2, [1, 1, 5, 5, 17]),
+    (5, 4, [1, 1, 5, 5, 5]),
+    (5, 7, [1, 1, 7, 11, 19]),
+    (5, 11, [1, 1, 5, 1, 1]),
+    (5, 13, [1, 1, 1, 3, 11]),
+    (5, 14, [1, 3, 5, 5, 31]),
+    (6, 1, [1, 3, 3, 9, 7, 49]),
+    (6, 13, [1, 1, 1, 15, 21, 21]),
+    (6, 16, [1, 3, 1, 13, 27, 49]),
+    (6, 19, [1, 1, 1, 15, 7, 5]),
+    (6, 22, [1, 3, 1, 15, 13, 25]),
+    (6, 25, [1, 1, 5, 5, 19, 61]),
+    (7, 1, [1, 3, 7, 11, 23, 15, 103]),
+    (7, 4, [1, 3, 7, 13, 13, 15, 69]),
+]
+
+# the number of bits of a sobol point, so at most 2^bits points per randomization
+bits = 32
+
+
+class QMCSequence:
+    """Base of the low discrepancy sequences, which hand out their points like
+    the uniform generator MRG32k3a, so that they can replace it in samplers
+    which transform the uniforms by inversion.
+
+    The sequence has dim coordinates, one for each element of the parameters of
+    a distribution, i.e. dim = batch_size. A draw of the distribution takes one
+    point. Rejection samplers consume a varying number of uniforms per draw and
+    lose the low discrepancy.
+    """
+
+    def __init__(self, dim = 1, scramble = True, seed = None):
+        """Create the sequence and randomize it.
+
+        :param dim The number of coordinates of a point.
+        :param scramble False for the deterministic sequence.
+        :param seed None to draw the randomization from the system's entropy,
+        an integer to derive it reproducibly.
+        """
+
+        assert dim >= 1
+        self.dim = dim
+        self.scramble = scramble
+        self.rand = random.Random(seed)
+        self.index = 0
+        self.randomize()
+
+    def randomize(self):
+        """Draws the randomization of the sequence."""
+        pass
+
+    def points(self, index):
+        """Calculates points of the sequence.
+
+        :param index An array of indices.
+        :returns An array of shape (len(index), dim) with the points in (0, 1).
+        """
+        pass
+
+    def get_state(self):
+        """Captures the position in the sequence.
+
+        :returns The index of the next point.
+        """
+
+        return self.index
+
+    def set_state(self, state):
+        """Restores a position captured by get_state().
+
+        :param state The index of the next point.
+        """
+
+        self.index = state
+
+    def reset(self):
+        """Moves back to the first point."""
+
+        self.index = 0
+
+    def spawn(self, k):
+        """Creates independent randomizations of the same sequence, the replicates
+        of randomized quasi monte carlo.
+
+        :param k How many sequences should be created.
+        :returns A list of the new sequences.
+        """
+
+        assert self.scramble
+        return [type(self)(self.dim, True, self.rand.getrandbits(64)) for _ in range(k)]
+
+    def random(self, num_samples = 1, out = None):
+        """Hands out the coordinates of the next points one after another, so that
+        a flat request of num_samples * dim uniforms yields num_samples points.
+
+        :param num_samples How many numbers should be generated, a multiple of dim.
+        :param out A flat array of length num_samples to write to, None for a new one.
+        :returns Numbers from (0, 1).
+        """
+
+        assert num_samples % self.dim == 0
+        assert out is None or np.shape(out) == (num_samples,)
+        elements = np.empty(num_samples) if out is None else out
+
+        n = num_samples // self.dim
+        elements.reshape(n, self.dim)[...] = self.points(np.arange(self.index, self.index + n))
+        self.index += n
+
+        return elements
+
+
+class SobolSequence(QMCSequence):
+    """Sobol sequence [1] with the direction numbers of Joe and Kuo, scrambled by
+    a random linear matrix and a digital shift [2]. The first 2^m points of each
+    randomization are a (t, m, s)-net, so sample sizes should be powers of two.
+
+    Refs: [1] https://doi.org/10.1016/0041-5553(67)90144-9.
+          [2] https://doi.org/10.1006/jcom.1998.0487.
+    """
+
+    def __init__(self, dim = 1, scramble = True, seed = None):
+        """Create the sequence and randomize it.
+
+        :param dim The number of coordinates of a point, at most 21.
+        :param scramble False for the deterministic sequence.
+        :param seed None to draw the randomization from the system's entropy,
+        an integer to derive it reproducibly.
+        """
+
+        if dim > len(sobol_table) + 1:
+            raise ValueError('sobol points have at most %d coordinates, not %d' % (len(sobol_table) + 1, dim))
+
+        self.V = self.direction_numbers(dim)
+        super().__init__(dim, scramble, seed)
+
+    @staticmethod
+    def direction_numbers(dim):
+        """Calculates the direction numbers of the first dim coordinates.
+
+        :param dim The number of coordinates.
+        :returns An array of shape (dim, bits), the numbers for each bit of the index.
+        """
+
+        V = np.zeros((dim, bits), dtype=np.uint64)
+        V[0] = [1 << (bits - 1 - k) for k in range(bits)]
+
+        for j, (s, a, mk) in enumerate(sobol_table[:dim - 1], start=1):
+            v = [mk[k] << (bits - 1 - k) for k in range(s)]
+
+            # the recurrence of the primitive polynomial
+            for k in range(s, bits):
+                x = v[k - s] ^ (v[k - s] >> s)
+                for l in range(1, s):
+                    if (a >> (s - 1 - l)) & 1:
+                        x ^= v[k - l]
+                v.append(x)
+
+            V[j] = v
+
+        return V
+
+    def randomize(self):
+        """Multiplies the direction numbers with random lower triangular bit
+        matrices and draws the digital shifts."""
+
+        self.C = self.V.copy()
+        self.shift = np.zeros(self.dim, dtype=np.uint64)
+        if not self.scramble:
+            return
+
+        for j in range(self.dim):
+
+            # row r of the matrix yields bit bits - 1 - r, from the bit itself and the higher ones
+            C = np.zeros(bits, dtype=np.uint64)
+            for r in range(bits):
+                row = (1 << (bits - 1 - r)) | (self.rand.getrandbits(bits) & ~((1 << (bits - r)) - 1))
+                parity = self.V[j] & np.uint64(row & ((1 << bits) - 1))
+                for s in (16, 8, 4, 2, 1):
+                    parity ^= parity >> np.uint64(s)
+
+                C |= (parity & np.uint64(1)) << np.uint64(bits - 1 - r)
+
+            self.C[j] = C
+            self.shift[j] = self.rand.getrandbits(bits)
+
+    def points(self, index):
+        """Calculates points of the sequence.
+
+        :param index An array of indices below 2^32.
+        :returns An array of shape (len(index), dim) with the points in (0, 1).
+        """
+
+        index = np.asarray(index, dtype=np.uint64)
+        assert len(index) == 0 or index[-1] < 2 ** bits
+
+        # the xor of the direction numbers of all set bits
+        X = np.broadcast_to(self.shift, (len(index), self.dim)).copy()
+        for k in range(bits):
+            set_bit = ((index >> np.uint64(k)) & np.uint64(1)).astype(bool)
+            X[set_bit] ^= self.C[:, k]
+
+        # the centers of the cells avoid 0
+        return (X + 0.5) / 2 ** bits
+
+
+class HaltonSequence(QMCSequence):
+    """Halton sequence [1], the radical inverses of the index in the first dim
+    primes as bases, scrambled by random permutations of the digits [2].
+
+    Refs: [1] https://doi.org/10.1007/BF01386213.
+          [2] https://doi.org/10.1016/0021-9991(76)90035-4.
+    """
+
+    def randomize(self):
+        """Draws one permutation of the digits per digit and dimension."""
+
+        self.bases = primes(self.dim)
+
+        # as many digits as a double resolves
+        self.digits = [int(52 / m.log2(b)) for b in self.bases]
+        self.perms = []
+        for b, K in zip(self.bases, self.digits):
+            perm = np.tile(np.arange(b), (K, 1))
+            if self.scramble:
+                for row in perm: self.rand.shuffle(row)
+            self.perms.append(perm)
+
+    def points(self, index):
+        """Calculates points of the sequence.
+
+        :param index An array of indices.
+        :returns An array of shape (len(index), dim) with the points in (0, 1).
+        """
+
+        index = np.asarray(index, dtype=np.int64)
+        X = np.empty((len(index), self.dim))
+
+        for j, (b, K, perm) in enumerate(zip(self.bases, self.digits, self.perms)):
+            rest = index.copy()
+            x = np.zeros(len(index))
+            scale = 1.0
+            for k in range(K):
+                scale /= b
+                x += perm[k, rest % b] * scale
+                rest //= b
+
+            # the centers of the cells avoid 0
+            X[:, j] = x + scale / 2
+
+        return np.minimum(X, np.nextafter(1, 0))
+
+
+def primes(n):
+    """Finds the first n primes.
+
+    :param n How many primes should be found.
+    :returns A list of the primes.
+    """
+
+    found = []
+    k = 2
+    while len(found) < n:
+        if all(k % p for p in found if p * p <= k):
+            found.append(k)
+        k += 1
+
+    return found
+
+
+def rqmc_mean(make_dist, num_samples, gens, f = None):
+    """Estimates E[f(X)] by randomized quasi monte carlo. Each randomization
+    yields an independent estimate, their spread gives the standard error.
+
+    :param make_dist Creates the distribution of X, sampling from the passed generator.
+    :param num_samples How many random numbers each replicate uses, a power of two for sobol.
+    :param gens The independently randomized sequences, see QMCSequence.spawn().
+    :param f The integrand, None for the identity.
+    :returns The estimate and its standard error.
+    """
+
+    assert len(gens) >= 2
+
+    estimates = []
+    for gen in gens:
+        X = make_dist(gen).sample(num_samples)
+        estimates.append(np.mean(X if f is None else f(X), axis=0))
+
+    estimates = np.array(estimates)
+    return np.mean(estimates, axis=0), np.std(estimates, axis=0, ddof=1) / m.sqrt(len(gens))
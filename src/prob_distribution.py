@@ -1,14 +1,164 @@
-from src.probs.spaces.spaces1d_leafs import *
+from src.generators.mrg32k3a import default_generator
+from src.spaces.spaces1d_leafs import *
 
 
 class ProbDist:
     """Interface for distributions."""
 
-    def __init__(self, space):
-        """Remember the space to check later on if inputs are valid."""
+    # False if ppf() takes scalar parameters only
+    batch_ppf = True
+
+    def __init__(self, space, gen = None, params = ()):
+        """Remember the space to check later on if inputs are valid.
+
+        :param space The domain of the samples.
+        :param gen The uniform generator to sample from, None for the shared one.
+        :param params The parameters, numbers or arrays broadcast against each other.
+        """
 
         assert isinstance(space, Space)
         self.space = space
+        self.gen = default_generator() if gen is None else gen
+
+        # one random number per element of the broadcast parameters
+        self.batch_shape = np.broadcast_shapes(*[np.shape(p) for p in params])
+        self.batch_size = int(np.prod(self.batch_shape))
+
+    def sample_shape(self, num_samples):
+        """The shape of num_samples draws, each of them holds one random number
+        per element of the parameters.
+
+        :param num_samples How many draws should be generated.
+        :returns The tuple (num_samples,) + batch_shape.
+        """
+
+        return (num_samples,) + self.batch_shape
+
+    def buffer(self, num_samples, out = None, dtype = None):
+        """Creates the output buffer of sample(), if a dtype asks for one, and
+        checks that the type of the buffer can hold the random numbers.
+
+        :param num_samples How many draws should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64.
+        :returns out, a new array of that type, or None to let the sampler allocate.
+        """
+
+        if out is not None:
+            self.check_dtype(out.dtype)
+            return out
+
+        if dtype is None:
+            return None
+
+        self.check_dtype(dtype)
+        return np.empty(self.sample_shape(num_samples), dtype=dtype)
+
+    def holds(self, dtype):
+        """Checks if a type can hold all random numbers of the distribution.
+        Continuous distributions need a floating type, discrete ones take floating
+        types or integer types which cover the support.
+
+        :param dtype The type.
+        :returns True if the type can hold them.
+        """
+
+        dtype = np.dtype(dtype)
+        if np.issubdtype(dtype, np.floating):
+            return True
+
+        if not isinstance(self.space, DiscreteSpace):
+            return False
+
+        # an unbounded support is cut at the biggest int64
+        lo, hi = np.min(self.space.s), min(np.max(self.space.e) - 1, np.iinfo(np.int64).max)
+        if dtype == np.bool_:
+            return lo >= 0 and hi <= 1
+
+        return np.issubdtype(dtype, np.integer) and np.iinfo(dtype).min <= lo and hi <= np.iinfo(dtype).max
+
+    def check_dtype(self, dtype):
+        """Raises an error, if a type can't hold all random numbers of the distribution.
+
+        :param dtype The type.
+        """
+
+        if self.holds(dtype):
+            return
+
+        name = type(self).__name__
+        if not isinstance(self.space, DiscreteSpace):
+            raise TypeError('%s needs a floating output type, not %s' % (name, np.dtype(dtype)))
+
+        raise TypeError('%s can\'t hold the support [%s, %s) of %s'
+                        % (np.dtype(dtype), np.min(self.space.s), np.max(self.space.e), name))
+
+    def compact_dtype(self):
+        """The smallest integer type, which holds the whole support of a discrete
+        distribution, as dtype of sample().
+
+        :returns int8, int16, int32 or int64 for an unbounded support.
+        """
+
+        assert isinstance(self.space, DiscreteSpace)
+        for dtype in (np.int8, np.int16, np.int32):
+            if self.holds(dtype):
+                return np.dtype(dtype)
+
+        self.check_dtype(np.int64)
+        return np.dtype(np.int64)
+
+    def uniforms(self, num_samples, out = None):
+        """Generate uniform random numbers for num_samples draws.
+
+        :param num_samples How many draws should be generated.
+        :param out An array of shape sample_shape(num_samples) to write to, None
+        for a new one. Integer arrays can't hold uniforms and get a new one, too.
+        :returns An array of shape sample_shape(num_samples).
+        """
+
+        shape = self.sample_shape(num_samples)
+        if out is None or not np.issubdtype(out.dtype, np.floating):
+            return self.gen.random(num_samples * self.batch_size).reshape(shape)
+
+        # a contiguous buffer is filled directly
+        assert out.shape == shape
+        if out.flags.c_contiguous:
+            self.gen.random(out.size, out=out.reshape(-1))
+        else:
+            out[...] = self.gen.random(out.size).reshape(shape)
+
+        # in single precision, uniforms close to one round up to it
+        if out.dtype != np.float64:
+            one = out.dtype.type(1)
+            np.minimum(out, np.nextafter(one, 0, dtype=out.dtype), out=out)
+
+        return out
+
+    def write(self, X, out):
+        """Moves results to an output buffer, as the ones of sample() and density().
+
+        :param X The results.
+        :param out The output buffer of the same shape, None to keep X.
+        :returns The buffer holding the results.
+        """
+
+        if out is None or X is out:
+            return X
+
+        out[...] = X
+        return out
+
+    def slot_params(self, num_samples, *params):
+        """Spreads the parameters to the flattened random numbers of num_samples
+        draws, so that samplers with per slot parameters need no loops.
+
+        :param num_samples How many draws should be generated.
+        :param params The parameters, numbers or arrays.
+        :returns A flat array per parameter, in the order of sample_shape(num_samples).
+        """
+
+        return [np.tile(np.broadcast_to(p, self.batch_shape).ravel(), num_samples) for p in params]
 
     def expectation(self):
         """Calculates the expectations for that distribution.
@@ -22,28 +172,101 @@ class ProbDist:
         :returns The variance of the distribution"""
         pass
 
-    def sample(self, num_samples=1):
+    def cdf(self, x):
+        """This method calculates the distribution function P(X <= x).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The probabilities.
+        """
+        pass
+
+    def ppf(self, u):
+        """This method calculates the quantile function, the inverse of the cdf.
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The smallest x with cdf(x) >= u.
+        """
+        pass
+
+    def sample(self, num_samples=1, out = None, dtype = None):
         """Generate random numbers from Dist().
 
         :param num_samples How many random numbers should be generated.
-        :returns Random numbers x ~ Dist().
+        :param out An array of shape sample_shape(num_samples) to write to, None for a new one.
+        :param dtype The type of a new output array, None for float64. Continuous
+        distributions support float32, discrete ones compact_dtype() or any integer type.
+        :returns Random numbers x ~ Dist(), of shape sample_shape(num_samples).
         """
         pass
 
-    def __density(self, x):
-        """This method calculates the density Dist(x).
+    def iter_samples(self, total, chunk_size = 2 ** 16, dtype = np.float64):
+        """Generate random numbers chunk by chunk, so that the memory stays bounded
+        by the chunk size, no matter how many random numbers are drawn.
+
+        All chunks are views of one buffer, which the next chunk overwrites, so
+        a chunk has to be copied to keep it.
+
+        :param total How many random numbers should be generated.
+        :param chunk_size How many random numbers a chunk holds, the last one may hold less.
+        :param dtype The type of the buffer.
+        :returns A generator of arrays of shape sample_shape(k) with k <= chunk_size.
+        """
+
+        assert total >= 0 and chunk_size > 0
+
+        buffer = np.empty(self.sample_shape(min(chunk_size, total)), dtype=dtype)
+        for start in range(0, total, chunk_size):
+            k = min(chunk_size, total - start)
+            yield self.sample(k, out=buffer[:k])
+
+    def _density(self, x, out = None):
+        """This method calculates the density Dist(x), by default from its logarithm.
 
         :param x Which value should be evaluated.
+        :param out An array to write to, None for a new one.
         :returns The probability that this element occurs.
         """
+
+        return np.exp(self._log_density(x), out=out)
+
+    def _log_density(self, x):
+        """This method calculates the logarithm of the density Dist(x).
+
+        :param x Which values should be evaluated, a number or an array.
+        :returns The logarithms of the densities.
+        """
         pass
 
-    def density(self, x):
+    def density(self, x, check = True, out = None):
         """This method calculates the density Dist(x).
 
         :param x Which value should be evaluated.
+        :param check False skips the check of the space, for hot loops over valid points.
+        :param out An array of the broadcast shape of x and the parameters to write to, None for a new one.
         :returns The probability that this element occurs.
         """
 
-        assert np.all(self.space.contains(x))
-        return self.__density(x)
+        assert not check or np.all(self.space.contains(x))
+        return self._density(x, out)
+
+    def logpdf(self, x, check = True):
+        """This method calculates the logarithm of the density Dist(x).
+
+        :param x Which values should be evaluated, a number or an array.
+        :param check False skips the check of the space, for hot loops over valid points.
+        :returns The logarithms of the densities.
+        """
+
+        assert not check or np.all(self.space.contains(x))
+        return self._log_density(x)
+
+    def logpmf(self, x, check = True):
+        """This method calculates the logarithm of the mass Dist(x), the same as
+        logpdf() under the name used for discrete distributions.
+
+        :param x Which values should be evaluated, a number or an array.
+        :param check False skips the check of the space, for hot loops over valid points.
+        :returns The logarithms of the probabilities.
+        """
+
+        return self.logpdf(x, check)
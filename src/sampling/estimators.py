@@ -0,0 +1,72 @@
+import numpy as np
+
+
+def mc_estimate(dist, f, num_samples, antithetic = False, control = False):
+    """Estimates E[f(X)] for X ~ dist by monte carlo, optionally with variance
+    reduction.
+
+    Antithetic sampling evaluates f at the pairs ppf(U) and ppf(1 - U), which
+    are negatively correlated, and averages each pair. The control variate is X
+    itself, whose expectation the distribution knows exactly: the estimate is
+    the mean of f(X) - beta (X - E[X]) with the beta of least variance, fitted
+    from the samples. Both can be combined, then the control acts on the
+    averages of the pairs.
+
+    The variance reduction factor compares the variance of the estimate with
+    the one of plain monte carlo with the same number of evaluations of f, so
+    plain monte carlo needs that factor times as many evaluations to reach the
+    same standard error.
+
+    :param dist The distribution of X, a batch gives one estimate per element.
+    :param f The vectorized integrand, applied elementwise to arrays of random numbers.
+    :param num_samples How many draws, or pairs of draws with antithetic sampling, are used.
+    :param antithetic True to sample antithetic pairs by the quantile function.
+    :param control True to use X as control variate, which needs a finite expectation().
+    :returns The estimate, its standard error and the variance reduction factor.
+    """
+
+    assert num_samples >= 3
+
+    name = type(dist).__name__
+    if antithetic and dist.batch_shape != () and not dist.batch_ppf:
+        raise ValueError('antithetic sampling needs ppf(), which %s provides for scalar parameters only' % name)
+
+    mean = dist.expectation() if control else None
+    if control and (mean is None or not np.all(np.isfinite(mean))):
+        raise ValueError('%s has no finite expectation to use as control variate' % name)
+
+    if antithetic:
+        U = dist.uniforms(num_samples)
+        X, Z = dist.ppf(U), dist.ppf(1 - U)
+        FX, FZ = f(X), f(Z)
+
+        # the pairs are the independent samples
+        Y = (FX + FZ) / 2
+        C = (X + Z) / 2
+        plain = np.var(np.concatenate([FX, FZ]), axis=0, ddof=1) / (2 * num_samples)
+    else:
+        C = dist.sample(num_samples)
+        Y = f(C)
+        plain = np.var(Y, axis=0, ddof=1) / num_samples
+
+    ddof = 1
+    if control:
+        # the least squares slope of f(X) over X. The denominator is the sample
+        # variance rather than the exact var(), because it matches the sample
+        # covariance: their ratio removes exactly the part of f(X), which is
+        # linear in the samples, while the exact variance would add the noise
+        # of the covariance to beta. The pair averages have no known variance.
+        D = C - mean
+        var = np.var(D, axis=0)
+        cov = np.mean((Y - np.mean(Y, axis=0)) * (D - np.mean(D, axis=0)), axis=0)
+        beta = cov / np.where(var > 0, var, 1)
+        Y = Y - beta * D
+        ddof = 2
+
+    estimate = np.mean(Y, axis=0)
+    se = np.sqrt(np.var(Y, axis=0, ddof=ddof) / num_samples)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = plain / se ** 2
+
+    return estimate, se, factor
@@ -0,0 +1,130 @@
+import numpy as np
+import os
+import pickle
+import queue
+import threading
+
+from src.sampling.parallel import find_generators
+
+
+def export_samples(dist, path, num_samples, chunk_size = 2 ** 20, resume = True, dtype = np.float64):
+    """Writes random numbers from dist chunk by chunk into a .npy file, which
+    may be larger than the memory.
+
+    A background thread writes each chunk to the memory mapped file, while the
+    next one is generated. After a chunk is flushed, the states of all generators
+    of dist are saved next to the file, so that an interrupted export continues
+    with the first incomplete chunk and yields the same file as an uninterrupted
+    one. The progress file is removed when the export is complete.
+
+    :param dist The distribution to sample from.
+    :param path The path of the .npy file.
+    :param num_samples How many random numbers should be generated.
+    :param chunk_size How many random numbers are generated per chunk.
+    :param resume False starts over, even if a progress file exists.
+    :param dtype The type of the stored random numbers, see ProbDist.sample().
+    :returns The file as a read only memory map.
+    """
+
+    assert num_samples >= 0 and chunk_size > 0
+
+    shape = dist.sample_shape(num_samples)
+    dtype = np.dtype(dtype)
+    progress = path + '.progress'
+    generators = find_generators(dist)
+
+    # continue where an interrupted export with the same layout stopped
+    done = 0
+    saved = load_progress(progress) if resume else None
+    if saved is not None and saved['shape'] == shape and saved['chunk_size'] == chunk_size \
+            and saved.get('dtype') == dtype and os.path.exists(path):
+        done = saved['done']
+        for gen, state in zip(generators, saved['states']):
+            gen.set_state(state)
+
+        out = np.lib.format.open_memmap(path, mode='r+')
+    else:
+        out = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+
+    # at most two chunks wait for the writer
+    tasks = queue.Queue(maxsize=2)
+    errors = []
+    writer = threading.Thread(target=write_chunks, args=(out, progress, shape, chunk_size, tasks, errors))
+    writer.start()
+
+    try:
+        for lo in range(done, num_samples, chunk_size):
+            X = dist.sample(min(chunk_size, num_samples - lo), dtype=dtype)
+            tasks.put((lo, X, [gen.get_state() for gen in generators]))
+            if errors: break
+    finally:
+        tasks.put(None)
+        writer.join()
+
+    if errors:
+        raise errors[0]
+
+    del out
+    if os.path.exists(progress):
+        os.remove(progress)
+
+    return np.load(path, mmap_mode='r')
+
+
+def write_chunks(out, progress, shape, chunk_size, tasks, errors):
+    """Writes the chunks of the queue until it yields None, the body of the
+    writer thread of export_samples().
+
+    :param out The memory mapped file.
+    :param progress The path of the progress file.
+    :param shape The shape of the whole file.
+    :param chunk_size How many random numbers are generated per chunk.
+    :param tasks A queue of the start, the random numbers and the generator states of the chunks.
+    :param errors A list, which receives the exception that stopped the writer.
+    """
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+
+        # after a failure, only drain the queue, so that the producer never blocks
+        if errors:
+            continue
+
+        try:
+            lo, X, states = task
+            out[lo:lo + len(X)] = X
+            out.flush()
+            save_progress(progress, {'shape': shape, 'chunk_size': chunk_size, 'dtype': out.dtype,
+                                     'done': lo + len(X), 'states': states})
+        except Exception as e:
+            errors.append(e)
+
+
+def load_progress(progress):
+    """Loads the progress of an interrupted export.
+
+    :param progress The path of the progress file.
+    :returns The saved progress, None if there is none.
+    """
+
+    if not os.path.exists(progress):
+        return None
+
+    with open(progress, 'rb') as f:
+        return pickle.load(f)
+
+
+def save_progress(progress, data):
+    """Saves the progress of an export, replacing the old one atomically.
+
+    :param progress The path of the progress file.
+    :param data The shape, the chunk size, the type, the number of written random numbers and the generator states.
+    """
+
+    tmp = progress + '.tmp'
+    with open(tmp, 'wb') as f:
+        pickle.dump(data, f)
+
+    os.replace(tmp, progress)
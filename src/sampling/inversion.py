@@ -0,0 +1,301 @@
+import numpy as np
+
+# how many tables each distribution family keeps for reuse
+cache_size = 64
+
+
+class GuideTable:
+    """Inversion of a finite cdf with the guide table of Chen and Asau [1].
+
+    The guide table points from each of M equally sized subintervals of [0, 1)
+    to the first value, whose cdf exceeds the start of the subinterval. With M
+    equal to the number of values, a lookup needs less than two comparisons on
+    average.
+
+    Refs: [1] https://doi.org/10.1016/0377-2217(74)90044-2.
+    """
+
+    def __init__(self, cdf, offset = 0):
+        """Create the guide table.
+
+        :param cdf The cdf at the values offset, offset + 1, ..., the tail beyond
+        is assigned to the last value.
+        :param offset The smallest value.
+        """
+
+        cdf = np.array(cdf, dtype=np.float64)
+        cdf[-1] = 1
+
+        self.cdf = cdf
+        self.offset = offset
+        self.guide = np.searchsorted(cdf, np.arange(len(cdf)) / len(cdf), side='right')
+
+    def sample(self, gen, num_samples):
+        """Generate random numbers by inversion.
+
+        :param gen The uniform generator to sample from.
+        :param num_samples How many random numbers should be generated.
+        :returns The random numbers.
+        """
+
+        cdf = self.cdf
+        U = gen.random(num_samples)
+        X = self.guide[(U * len(cdf)).astype(np.intp)]
+
+        # a short sequential search from the guided start
+        active = np.flatnonzero(cdf[X] <= U)
+        while len(active) > 0:
+            X[active] += 1
+            active = active[cdf[X[active]] <= U[active]]
+
+        return self.offset + X.astype(np.float64)
+
+
+class InterpolationTable:
+    """Numerical inversion of a continuous cdf, similar to the method of
+    Hörmann and Leydold [1].
+
+    The quantile function is interpolated by cubic Hermite polynomials, which
+    use the density for the derivatives. The intervals are halved until the
+    u-error |cdf(x) - u| at the midpoints of all intervals is at most tol.
+    Queries beyond the table, i.e. in tails with a mass below tol, are solved
+    by bisection.
+
+    Refs: [1] https://doi.org/10.1145/945511.945517.
+    """
+
+    def __init__(self, cdf, pdf, a, b, x0, scale, tol = 1e-10):
+        """Create the table.
+
+        :param cdf The vectorized distribution function.
+        :param pdf The vectorized density.
+        :param a The lower bound of the support.
+        :param b The upper bound of the support.
+        :param x0 A point in the center of the distribution.
+        :param scale The rough width of the distribution.
+        :param tol The maximum u-error.
+        """
+
+        self.cdf = cdf
+        self.pdf = pdf
+        self.a = a
+        self.b = b
+        self.x0 = x0
+        self.scale = scale
+        self.tol = tol
+
+        # the range, beyond which only the tails with a mass below tol remain
+        lo, hi = self.bisect(np.array([tol, 1 - tol]), np.array([a, x0]), np.array([x0, b]))
+
+        # halve the intervals until the interpolation is accurate enough
+        X = np.linspace(lo, hi, 65)
+        U = cdf(X)
+        M = self.slopes(X, pdf(X))
+        for _ in range(1100):
+            bad = np.flatnonzero(self.error(X, U, M) > tol)
+            x = (X[bad] + X[bad + 1]) / 2
+
+            # near a pole of the density, until the intervals can't be halved anymore
+            inner = (x > X[bad]) & (x < X[bad + 1])
+            bad, x = bad[inner], x[inner]
+            if len(bad) == 0:
+                break
+
+            X = np.insert(X, bad + 1, x)
+            U = np.insert(U, bad + 1, cdf(x))
+            M = np.insert(M, bad + 1, self.slopes(x, pdf(x)))
+
+        self.X = X
+        self.U = U
+        self.M = M
+
+    @staticmethod
+    def slopes(x, f):
+        """Calculates the derivatives of the quantile function.
+
+        :param x The points.
+        :param f The density at the points.
+        :returns The derivatives 1 / f, nan where the density vanishes.
+        """
+
+        with np.errstate(divide='ignore'):
+            m = 1 / f
+
+        m[~np.isfinite(m)] = np.nan
+        return m
+
+    @staticmethod
+    def hermite(t, x0, x1, h, m0, m1):
+        """Evaluates the interpolation of the quantile function in its intervals.
+
+        :param t The relative positions in the intervals.
+        :param x0 The quantiles at the start of the intervals.
+        :param x1 The quantiles at the end of the intervals.
+        :param h The masses of the intervals.
+        :param m0 The derivatives at the start of the intervals.
+        :param m1 The derivatives at the end of the intervals.
+        :returns The interpolated quantiles, within the intervals.
+        """
+
+        # where the density vanishes, the secant is used
+        secant = (x1 - x0) / np.where(h > 0, h, 1)
+        m0 = np.where(np.isnan(m0), secant, m0)
+        m1 = np.where(np.isnan(m1), secant, m1)
+
+        s = 1 - t
+        x = (1 + 2 * t) * s * s * x0 + t * s * s * h * m0 + t * t * (3 - 2 * t) * x1 - t * t * s * h * m1
+        return np.clip(x, x0, x1)
+
+    def error(self, X, U, M):
+        """Calculates the u-error at the midpoints of all intervals.
+
+        :param X The quantiles at the boundaries.
+        :param U The probabilities at the boundaries.
+        :param M The derivatives at the boundaries.
+        :returns The u-errors of the intervals.
+        """
+
+        h = U[1:] - U[:-1]
+        x = self.hermite(0.5, X[:-1], X[1:], h, M[:-1], M[1:])
+        return np.where(h > self.tol, np.abs(self.cdf(x) - (U[:-1] + h / 2)), 0)
+
+    def ppf(self, u):
+        """Calculates the quantiles.
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        shape = np.shape(u)
+        u = np.asarray(u, dtype=np.float64).ravel()
+        X, U, M = self.X, self.U, self.M
+
+        # interpolate in the intervals
+        i = np.clip(np.searchsorted(U, u, side='right') - 1, 0, len(U) - 2)
+        h = U[i + 1] - U[i]
+        t = np.clip((u - U[i]) / np.where(h > 0, h, 1), 0, 1)
+        x = self.hermite(t, X[i], X[i + 1], h, M[i], M[i + 1])
+
+        # the tails by bisection
+        left = (u < U[0]) & (u > 0)
+        right = (u > U[-1]) & (u < 1)
+        x[left] = self.bisect(u[left], self.a, X[0])
+        x[right] = self.bisect(u[right], X[-1], self.b)
+
+        x[u == 0] = self.a
+        x[u == 1] = self.b
+        return x.reshape(shape)
+
+    def bisect(self, u, lo, hi):
+        """Solves cdf(x) = u in the intervals [lo, hi] by bisection, until the
+        intervals can't be halved anymore.
+
+        :param u The probabilities.
+        :param lo The lower bounds, may be infinite.
+        :param hi The upper bounds, may be infinite.
+        :returns The quantiles.
+        """
+
+        # make infinite bounds finite
+        lo = np.where(np.isfinite(lo), lo, np.minimum(hi, self.x0) - self.scale) * np.ones(len(u))
+        hi = np.where(np.isfinite(hi), hi, np.maximum(lo, self.x0) + self.scale) * np.ones(len(u))
+        for _ in range(1100):
+            out = self.cdf(lo) > u
+            if not np.any(out): break
+            lo[out] -= hi[out] - lo[out]
+        for _ in range(1100):
+            out = self.cdf(hi) < u
+            if not np.any(out): break
+            hi[out] += hi[out] - lo[out]
+
+        active = np.arange(len(u))
+        for _ in range(1100):
+            x = (lo[active] + hi[active]) / 2
+            inner = (x > lo[active]) & (x < hi[active])
+            below = self.cdf(x) < u[active]
+            lo[active] = np.where(below, x, lo[active])
+            hi[active] = np.where(below, hi[active], x)
+            active = active[inner]
+            if len(active) == 0: break
+
+        return (lo + hi) / 2
+
+
+class DiscreteInversion:
+    """Numerical inversion of a discrete cdf on the integers, with a table of the
+    cdf over the central window. Queries outside of the window are solved by
+    bisection over the integers.
+    """
+
+    def __init__(self, cdf, lo, hi, k0, k1):
+        """Create the table.
+
+        :param cdf The vectorized distribution function.
+        :param lo The smallest value of the support.
+        :param hi The biggest value of the support, may be infinite.
+        :param k0 The smallest value of the table, at least lo.
+        :param k1 The biggest value of the table, at most hi.
+        """
+
+        self.cdf = cdf
+        self.lo = lo
+        self.hi = hi
+        self.k0 = k0
+        self.k1 = k1
+        self.F = cdf(np.arange(k0, k1 + 1))
+        self.below = cdf(k0 - 1) if k0 > lo else 0
+
+    def ppf(self, u):
+        """Calculates the quantiles, the smallest k with cdf(k) >= u.
+
+        :param u The probabilities in [0, 1], a number or an array.
+        :returns The quantiles.
+        """
+
+        shape = np.shape(u)
+        u = np.asarray(u, dtype=np.float64).ravel()
+        k = self.k0 + np.searchsorted(self.F, u, side='left').astype(np.float64)
+
+        # outside of the window
+        left = (u <= self.below) & (u > 0)
+        right = k > self.k1
+        k[left] = self.search(u[left], self.lo, self.k0 - 1)
+        k[right] = self.search(u[right], self.k1 + 1, self.hi)
+
+        k[u == 0] = self.lo
+        k[u == 1] = self.hi
+        return k.reshape(shape)
+
+    def search(self, u, lo, hi):
+        """Searches the smallest k in [lo, hi] with cdf(k) >= u, where cdf(hi) >= u holds.
+
+        :param u The probabilities.
+        :param lo The lower bound.
+        :param hi The upper bound, may be infinite.
+        :returns The quantiles.
+        """
+
+        L = np.full(len(u), float(lo))
+        H = np.full(len(u), float(hi))
+
+        # make an infinite upper bound finite
+        if not np.isfinite(hi):
+            H[:] = lo + self.k1 - self.k0 + 1
+            for _ in range(64):
+                out = self.cdf(H) < u
+                if not np.any(out): break
+                L[out] = H[out] + 1
+                H[out] += H[out] - self.k0 + 1
+
+            H[self.cdf(H) < u] = np.inf
+            L[np.isinf(H)] = np.inf
+
+        active = np.flatnonzero(L < H)
+        while len(active) > 0:
+            M = np.floor((L[active] + H[active]) / 2)
+            ok = self.cdf(M) >= u[active]
+            H[active] = np.where(ok, M, H[active])
+            L[active] = np.where(ok, L[active], M + 1)
+            active = active[L[active] < H[active]]
+
+        return H
@@ -0,0 +1,121 @@
+import numpy as np
+import pickle
+
+from concurrent.futures import ProcessPoolExecutor
+
+from src.generators.mrg32k3a import MRG32k3a
+from src.generators.qmc import QMCSequence
+
+# the distribution each worker process samples from
+worker_dist = None
+
+
+def find_generators(obj, found = None, visited = None):
+    """Collects all generators an object samples from, in a fixed order.
+
+    :param obj The object, usually a distribution.
+    :returns A list of the distinct generators.
+    """
+
+    if found is None:
+        found = []
+        visited = set()
+
+    # each object only once
+    if id(obj) in visited:
+        return found
+    visited.add(id(obj))
+
+    if isinstance(obj, (MRG32k3a, QMCSequence)):
+        found.append(obj)
+    elif isinstance(obj, (list, tuple)):
+        for e in obj: find_generators(e, found, visited)
+    elif hasattr(obj, '__dict__'):
+        for e in vars(obj).values(): find_generators(e, found, visited)
+
+    return found
+
+
+def init_worker(data):
+    """Unpacks the distribution once per worker process.
+
+    :param data The pickled distribution.
+    """
+
+    global worker_dist
+    worker_dist = pickle.loads(data)
+
+
+def sample_chunk(task):
+    """Samples one chunk, with each generator placed at the substream or the points of the chunk.
+
+    :param task The size of the chunk and the states of the generators.
+    :returns The samples of the chunk.
+    """
+
+    num_samples, states = task
+    for gen, state in zip(find_generators(worker_dist), states):
+        gen.set_state(state)
+
+    return worker_dist.sample(num_samples)
+
+
+def parallel_sample(dist, num_samples, workers = None, chunk_size = 2 ** 18):
+    """Generate random numbers from dist with a pool of processes.
+
+    The request is cut into chunks of chunk_size and every chunk draws from its
+    own substream of each generator. A low discrepancy sequence continues at the
+    first point of the chunk instead, which yields the same points as serial
+    sampling for the inversion samplers. The result only depends on the state of
+    dist and chunk_size, so it is the same for any number of workers. Afterwards
+    all generators of dist are moved to a fresh substream, the sequences behind
+    the points of all chunks.
+
+    :param dist The distribution to sample from.
+    :param num_samples How many random numbers should be generated.
+    :param workers How many processes should be used, None for all cores.
+    :param chunk_size How many random numbers are generated per chunk.
+    :returns Random numbers x ~ dist.
+    """
+
+    assert num_samples >= 0 and chunk_size > 0
+
+    # give each chunk the next substream of every generator, or its points of a sequence
+    generators = find_generators(dist)
+    tasks = []
+    for lo in range(0, num_samples, chunk_size):
+        states = []
+        for gen in generators:
+            if isinstance(gen, QMCSequence):
+                states.append(gen.index + lo)
+            else:
+                gen.next_substream()
+                states.append(gen.get_state())
+
+        tasks.append((min(chunk_size, num_samples - lo), states))
+
+    # further draws of dist shall not overlap with the chunks
+    for gen in generators:
+        if isinstance(gen, QMCSequence):
+            gen.index += num_samples
+        else:
+            gen.next_substream()
+
+    if len(tasks) == 0:
+        return np.empty(dist.sample_shape(0))
+
+    # fan out, single workers stay in process
+    data = pickle.dumps(dist)
+    if workers == 1 or len(tasks) == 1:
+        global worker_dist
+        init_worker(data)
+        try:
+            chunks = [sample_chunk(task) for task in tasks]
+        finally:
+            # don't keep the copy alive in this process
+            worker_dist = None
+    else:
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(data,)) as pool:
+            chunks = list(pool.map(sample_chunk, tasks))
+
+    return np.concatenate(chunks)
@@ -0,0 +1,78 @@
+import numpy as np
+
+
+def rejection_sample(propose, num_samples, rate = 0.5):
+    """Generate random numbers with a batched acceptance rejection method.
+
+    Candidates are proposed in blocks sized from the expected acceptance rate,
+    the accepted ones are compacted into the result and only the shortfall is
+    proposed again. The rate is refined with the observed acceptance.
+
+    :param propose Maps a number of candidates to the candidates and a mask of the accepted ones.
+    :param num_samples How many random numbers should be generated.
+    :param rate The expected acceptance rate of the proposals.
+    :returns The accepted random numbers.
+    """
+
+    assert 0 < rate <= 1
+
+    elements = np.empty(num_samples)
+    filled = 0
+    proposed = 0
+    accepted = 0
+
+    while filled < num_samples:
+
+        # a bit more than needed, so that one block usually suffices
+        need = num_samples - filled
+        size = int(need / rate * 1.05) + 16
+
+        # compact the accepted ones
+        X, accept = propose(size)
+        X = X[accept]
+        take = min(len(X), need)
+        elements[filled:filled + take] = X[:take]
+        filled += take
+
+        # refine the rate
+        proposed += size
+        accepted += len(X)
+        rate = max(accepted / proposed, 1e-3)
+
+    return elements
+
+
+def rejection_sample_slots(propose, num_samples, rate = 0.5):
+    """Generate random numbers with a batched acceptance rejection method, where
+    each random number has its own parameters.
+
+    Every pending slot gets the same number of candidates per round, one if the
+    acceptance rate is above one half. A slot takes its first accepted candidate
+    and only the slots without one are proposed again.
+
+    :param propose Maps the slots of the candidates to the candidates and a mask of the accepted ones.
+    :param num_samples How many random numbers should be generated.
+    :param rate The expected acceptance rate of the proposals.
+    :returns The accepted random numbers, one per slot.
+    """
+
+    assert 0 < rate <= 1
+
+    elements = np.empty(num_samples)
+    pending = np.arange(num_samples)
+    reps = max(int(1 / rate), 1)
+
+    while len(pending) > 0:
+
+        # candidate j of each slot lies in row j
+        X, accept = propose(np.tile(pending, reps))
+        accept = accept.reshape(reps, len(pending))
+
+        # take the first accepted candidate of each slot
+        first = np.argmax(accept, axis=0)
+        found = accept[first, np.arange(len(pending))]
+        chosen = first * len(pending) + np.arange(len(pending))
+        elements[pending[found]] = X[chosen[found]]
+        pending = pending[~found]
+
+    return elements
@@ -7,24 +7,22 @@ class Space:
     def __init__(self, check):
         """Defines a space, by having a check lambda.
 
-        :param check A lambda verifying if the element is in the space.
+        :param check A lambda verifying elementwise on arrays if the elements are in the space.
         """
 
-        self.check = np.vectorize(check)
+        self.check = check
 
     def contains(self, x):
-        """This method checks whether the space contains the list of samples.
+        """This method checks whether the space contains the samples.
 
-        :param x The list of points.
-        :returns True, if all elements inside.
+        :param x A point, a list, a set or an array of points, arrays are not copied.
+        :returns An array with True for all elements inside.
         """
 
         if isinstance(x, set):
             x = list(x)
-        elif not isinstance(x, list):
-            x = [x]
 
-        return self.check(x)
+        return self.check(np.asarray(x))
 
     def cut(self, space):
         """Check if the current space intersects with the passed space.
@@ -50,11 +48,15 @@ class ContinuousSpace(Space):
         self.b = b
         self.open_brackets = open_brackets
 
-        # make check lambda
-        fn = np.greater if open_brackets else np.greater_equal
+    def check(self, x):
+        """Checks elementwise if the points lie inside the interval.
 
-        def f(x): return np.logical_and(fn(x, a), fn(b, x))
-        super().__init__(f)
+        :param x An array of points.
+        :returns An array with True for all elements inside.
+        """
+
+        fn = np.greater if self.open_brackets else np.greater_equal
+        return np.logical_and(fn(x, self.a), fn(self.b, x))
 
     def cut(self, space):
         """Check if the current space intersects with the passed space.
@@ -88,9 +90,14 @@ class DiscreteSpace(Space):
         self.s = s
         self.e = e
 
-        # create lambda and pass to super
-        def f(x): return np.logical_and(np.greater_equal(x, s), np.greater(e, x))
-        super().__init__(f)
+    def check(self, x):
+        """Checks elementwise if the points lie between the indices.
+
+        :param x An array of points.
+        :returns An array with True for all elements inside.
+        """
+
+        return np.logical_and(np.greater_equal(x, self.s), np.greater(self.e, x))
 
     def cut(self, space):
         """Check if the current space intersects with the passed space.
@@ -121,10 +128,16 @@ class NullSpace(Space):
 
     def __init__(self):
         """Simply reject all training inputs."""
-        # make check lambda
-        f = lambda x: False
-        check = np.vectorize(f)
-        super().__init__(check)
+        pass
+
+    def check(self, x):
+        """Rejects all points.
+
+        :param x An array of points.
+        :returns An array of False.
+        """
+
+        return np.zeros(np.shape(x), dtype=bool)
 
     def cut(self, space):
         """Empty set cut with any space is empty.
@@ -0,0 +1,330 @@
+import numpy as np
+
+# coefficients of the Lanczos approximation with g = 7
+lanczos_g = 7
+lanczos_p = np.array([0.99999999999980993, 676.5203681218851, -1259.1392167224028,
+                      771.32342877765313, -176.61502916214059, 12.507343278686905,
+                      -0.13857109526572012, 9.9843695780195716e-6, 1.5056327351493116e-7])
+
+
+def gammaln(x):
+    """Calculates log(gamma(x)) elementwise for positive x with the Lanczos approximation.
+
+    :param x The points, a number or an array.
+    :returns The logarithm of the gamma function.
+    """
+
+    x = np.asarray(x, dtype=np.float64)
+
+    # the approximation holds for x >= 0.5, smaller ones use gamma(x) = gamma(x + 1) / x
+    small = x < 0.5
+    z = np.where(small, x, x - 1)
+
+    a = np.full(np.shape(z), lanczos_p[0])
+    for i in range(1, len(lanczos_p)):
+        a += lanczos_p[i] / (z + i)
+
+    t = z + lanczos_g + 0.5
+    r = 0.5 * np.log(2 * np.pi) + (z + 0.5) * np.log(t) - t + np.log(a)
+    return np.where(small, r - np.log(np.where(small, x, 1)), r)
+
+
+# log(k!) for small k, created on first use
+factorial_table = None
+
+
+def logfactorial(k):
+    """Calculates log(k!) elementwise, small k are looked up in a table.
+
+    :param k The non-negative integers, a number or an array.
+    :returns The logarithm of the factorial, inf for negative k.
+    """
+
+    global factorial_table
+    if factorial_table is None:
+        factorial_table = gammaln(np.arange(1, 2 ** 16 + 1))
+        factorial_table[:2] = 0
+
+    k = np.asarray(k, dtype=np.float64)
+    small = (k >= 0) & (k < len(factorial_table))
+    if np.all(small):
+        return factorial_table[k.astype(np.intp)]
+
+    # big ones by the approximation, negative ones have no mass
+    r = np.full(np.shape(k), np.inf)
+    r[small] = factorial_table[k[small].astype(np.intp)]
+    big = k >= len(factorial_table)
+    r[big] = gammaln(k[big] + 1)
+    return r
+
+
+def logbinom(n, k):
+    """Calculates the logarithm of the binomial coefficient n over k elementwise.
+
+    :param n The non-negative integers on top.
+    :param k The integers at the bottom.
+    :returns The logarithm of the coefficient, -inf outside 0 <= k <= n.
+    """
+
+    return logfactorial(n) - logfactorial(k) - logfactorial(np.subtract(n, k))
+
+
+def xlogy(x, y):
+    """Calculates x * log(y) elementwise, which is 0 for x = 0.
+
+    :param x The factors.
+    :param y The arguments of the logarithm.
+    :returns The products.
+    """
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(np.equal(x, 0), 0.0, np.multiply(x, np.log(y)))
+
+
+def xlog1py(x, y):
+    """Calculates x * log(1 + y) elementwise, which is 0 for x = 0.
+
+    :param x The factors.
+    :param y The arguments of the logarithm.
+    :returns The products.
+    """
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(np.equal(x, 0), 0.0, np.multiply(x, np.log1p(y)))
+
+
+# relative accuracy and iteration limit of the series and continued fractions
+eps = 1e-16
+max_iterations = 100000
+
+
+def lgammainc(a, x):
+    """Calculates the logarithms of the regularized incomplete gamma functions
+    P(a, x) and Q(a, x) = 1 - P(a, x) elementwise for a > 0 and x >= 0.
+
+    The one which is not close to 1 is evaluated directly, by the series for
+    x < a + 1 and by Lentz's continued fraction otherwise, see [1]. The other
+    one follows from it.
+
+    :param a The shape parameters, a number or an array.
+    :param x The points, a number or an array.
+    :returns The logarithms of P(a, x) and Q(a, x).
+
+    Refs: [1] Numerical Recipes, Chapter 6.2.
+    """
+
+    a, x = np.broadcast_arrays(np.asarray(a, dtype=np.float64), np.asarray(x, dtype=np.float64))
+    shape = a.shape
+    a = a.ravel()
+    x = x.ravel()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        front = xlogy(a, x) - x - gammaln(a)
+
+    # the series of P, where the front factor has an additional 1 / a
+    lP = np.full(len(a), -np.inf)
+    series = np.flatnonzero((x < a + 1) & (x > 0))
+    s = np.ones(len(series))
+    term = np.ones(len(series))
+    active = np.arange(len(series))
+    ai = a[series]
+    xi = x[series]
+    n = 0
+    while len(active) > 0 and n < max_iterations:
+        n += 1
+        term[active] *= xi[active] / (ai[active] + n)
+        s[active] += term[active]
+        active = active[term[active] > s[active] * eps]
+    lP[series] = front[series] - np.log(a[series]) + np.log(s)
+
+    # the continued fraction of Q
+    lQ = np.zeros(len(a))
+    frac = np.flatnonzero((x >= a + 1) & (x < np.inf))
+    ai = a[frac]
+    xi = x[frac]
+    b = xi + 1 - ai
+    c = np.full(len(frac), 1 / 1e-300)
+    d = 1 / b
+    h = d.copy()
+    active = np.arange(len(frac))
+    n = 0
+    while len(active) > 0 and n < max_iterations:
+        n += 1
+        an = -n * (n - ai[active])
+        b[active] += 2
+        dn = an * d[active] + b[active]
+        dn[np.abs(dn) < 1e-300] = 1e-300
+        cn = b[active] + an / c[active]
+        cn[np.abs(cn) < 1e-300] = 1e-300
+        d[active] = 1 / dn
+        c[active] = cn
+        delta = d[active] * cn
+        h[active] *= delta
+        active = active[np.abs(delta - 1) > eps]
+    lQ[frac] = front[frac] + np.log(h)
+
+    # the complements
+    with np.errstate(divide='ignore'):
+        direct = np.zeros(len(a), dtype=bool)
+        direct[series] = True
+        lQ[series] = np.log(-np.expm1(lP[series]))
+        lP[frac] = np.log(-np.expm1(lQ[frac]))
+        lQ[x == 0] = 0
+        lP[x == np.inf] = 0
+        lQ[x == np.inf] = -np.inf
+
+    return lP.reshape(shape), lQ.reshape(shape)
+
+
+def gammainc(a, x):
+    """Calculates the regularized lower incomplete gamma function P(a, x) elementwise.
+
+    :param a The shape parameters, a number or an array.
+    :param x The non-negative points, a number or an array.
+    :returns The values of P(a, x).
+    """
+
+    return np.exp(lgammainc(a, x)[0])
+
+
+def gammaincc(a, x):
+    """Calculates the regularized upper incomplete gamma function Q(a, x) elementwise.
+
+    :param a The shape parameters, a number or an array.
+    :param x The non-negative points, a number or an array.
+    :returns The values of Q(a, x).
+    """
+
+    return np.exp(lgammainc(a, x)[1])
+
+
+def betainc(a, b, x):
+    """Calculates the regularized incomplete beta function I_x(a, b) elementwise
+    with Lentz's continued fraction from [1]. Beyond the mean the symmetry
+    I_x(a, b) = 1 - I_(1 - x)(b, a) is used, which converges quickly.
+
+    :param a The first shape parameters, a number or an array.
+    :param b The second shape parameters, a number or an array.
+    :param x The points in [0, 1], a number or an array.
+    :returns The values of I_x(a, b).
+
+    Refs: [1] Numerical Recipes, Chapter 6.4.
+    """
+
+    a, b, x = np.broadcast_arrays(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64),
+                                  np.asarray(x, dtype=np.float64))
+    shape = a.shape
+    a = a.ravel()
+    b = b.ravel()
+    x = x.ravel()
+
+    # swap, so that the fraction converges fast
+    swap = x > (a + 1) / (a + b + 2)
+    a, b = np.where(swap, b, a), np.where(swap, a, b)
+    x = np.where(swap, 1 - x, x)
+
+    with np.errstate(divide='ignore'):
+        front = xlogy(a, x) + xlog1py(b, -x) - gammaln(a) - gammaln(b) + gammaln(a + b) - np.log(a)
+
+    # the continued fraction
+    qab = a + b
+    c = np.ones(len(a))
+    d = 1 - qab * x / (a + 1)
+    d[np.abs(d) < 1e-300] = 1e-300
+    d = 1 / d
+    h = d.copy()
+    active = np.flatnonzero(x > 0)
+    n = 0
+    while len(active) > 0 and n < max_iterations:
+        n += 1
+        aa, bb, xa, ca, da = a[active], b[active], x[active], c[active], d[active]
+
+        # the even step
+        m2 = 2 * n
+        coef = n * (bb - n) * xa / ((aa + m2 - 1) * (aa + m2))
+        da = 1 + coef * da
+        da[np.abs(da) < 1e-300] = 1e-300
+        ca = 1 + coef / ca
+        ca[np.abs(ca) < 1e-300] = 1e-300
+        da = 1 / da
+        h[active] *= da * ca
+
+        # the odd step
+        coef = -(aa + n) * (aa + bb + n) * xa / ((aa + m2) * (aa + m2 + 1))
+        da = 1 + coef * da
+        da[np.abs(da) < 1e-300] = 1e-300
+        ca = 1 + coef / ca
+        ca[np.abs(ca) < 1e-300] = 1e-300
+        da = 1 / da
+        delta = da * ca
+        h[active] *= delta
+
+        c[active] = ca
+        d[active] = da
+        active = active[np.abs(delta - 1) > eps]
+
+    I = np.exp(front) * h
+    return np.where(swap, 1 - I, I).reshape(shape)
+
+
+def erfc(x):
+    """Calculates the complementary error function elementwise, by erfc(x) = Q(1/2, x^2)
+    for positive x.
+
+    :param x The points, a number or an array.
+    :returns The values of erfc(x).
+    """
+
+    x = np.asarray(x, dtype=np.float64)
+    q = np.exp(lgammainc(0.5, np.square(x))[1])
+    return np.where(x >= 0, q, 2 - q)
+
+
+def ndtr(x):
+    """Calculates the distribution function of the standard normal distribution elementwise.
+
+    :param x The points, a number or an array.
+    :returns The probabilities P(Z <= x).
+    """
+
+    return 0.5 * erfc(-np.asarray(x, dtype=np.float64) / np.sqrt(2))
+
+
+# coefficients of Acklam's rational approximations of the normal quantile
+acklam_a = [-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+            1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00]
+acklam_b = [-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+            6.680131188771972e+01, -1.328068155692189e+01]
+acklam_c = [-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+            -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00]
+acklam_d = [7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+            3.754408661907416e+00]
+
+
+def ndtri(p):
+    """Calculates the quantile function of the standard normal distribution elementwise.
+    Acklam's approximation with a relative error of 1.15e-9 is refined by one step
+    of Halley's method to full precision.
+
+    :param p The probabilities in [0, 1], a number or an array.
+    :returns The quantiles.
+    """
+
+    p = np.asarray(p, dtype=np.float64)
+    q = np.minimum(p, 1 - p)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+
+        # the quantile of the lower tail probability q, in the central region or the tail
+        r = np.square(q - 0.5)
+        central = (q - 0.5) * np.polyval(acklam_a, r) / np.polyval(acklam_b + [1], r)
+        t = np.sqrt(-2 * np.log(q))
+        tail = np.polyval(acklam_c, t) / np.polyval(acklam_d + [1], t)
+        x = np.where(q < 0.02425, tail, central)
+
+        # one step of Halley's method
+        e = ndtr(x) - q
+        u = e * np.sqrt(2 * np.pi) * np.exp(0.5 * np.square(x))
+        x = np.where(q > 0, x - u / (1 + 0.5 * x * u), -np.inf)
+
+    return np.where(p > 0.5, -x, x)
@@ -0,0 +1,86 @@
+import numpy as np
+
+from scipy import stats
+
+# the significance level of the tests, the samples come from fixed seeds
+alpha = 1e-3
+
+
+def assert_fits_cdf(X, cdf):
+    """Checks continuous random numbers with the Kolmogorov-Smirnov test.
+
+    :param X The random numbers, a flat array.
+    :param cdf The distribution function they should follow.
+    """
+
+    assert stats.kstest(X, cdf).pvalue > alpha
+
+
+def assert_fits_pmf(X, pmf, lo = 0):
+    """Checks discrete random numbers with the chi-square test. Neighbouring
+    values are pooled until each cell expects at least five draws, the values
+    above the largest draw join the last cell.
+
+    :param X The random numbers, a flat array.
+    :param pmf The mass function they should follow.
+    :param lo The smallest value of the support.
+    """
+
+    X = np.asarray(X)
+    assert np.all(X == np.round(X)) and np.all(X >= lo)
+
+    values = np.arange(lo, X.max() + 1)
+    expected = len(X) * pmf(values)
+    expected[-1] += len(X) - np.sum(expected)
+    observed = np.bincount((X - lo).astype(np.int64), minlength=len(values))
+
+    # pool the cells from the left
+    cells = [[0.0, 0]]
+    for e, o in zip(expected, observed):
+        if cells[-1][0] >= 5: cells.append([0.0, 0])
+        cells[-1][0] += e
+        cells[-1][1] += o
+
+    if len(cells) > 1 and cells[-1][0] < 5:
+        e, o = cells.pop()
+        cells[-1][0] += e
+        cells[-1][1] += o
+
+    expected, observed = np.array(cells).T
+    assert len(cells) > 1
+    assert stats.chisquare(observed, expected).pvalue > alpha
+
+
+def slot(f, idx):
+    """Restricts a function of a batch of distributions to one element of the
+    parameters.
+
+    :param f The function, e.g. the cdf, which broadcasts against the parameters.
+    :param idx The index of the element in the batch shape.
+    :returns The function of that element alone for flat arrays.
+    """
+
+    return lambda x: f(np.reshape(x, (-1,) + (1,) * len(idx)))[(slice(None),) + idx]
+
+
+def assert_batch_fits_cdf(dist, X):
+    """Checks the continuous random numbers of each element of a batch.
+
+    :param dist The distribution with array parameters.
+    :param X Its random numbers of shape sample_shape(num_samples).
+    """
+
+    for idx in np.ndindex(dist.batch_shape):
+        assert_fits_cdf(X[(slice(None),) + idx], slot(dist.cdf, idx))
+
+
+def assert_batch_fits_pmf(dist, X, lo = 0):
+    """Checks the discrete random numbers of each element of a batch.
+
+    :param dist The distribution with array parameters.
+    :param X Its random numbers of shape sample_shape(num_samples).
+    :param lo The smallest value of the supports.
+    """
+
+    for idx in np.ndindex(dist.batch_shape):
+        assert_fits_pmf(X[(slice(None),) + idx], slot(lambda x: dist.density(x, check=False), idx), lo)
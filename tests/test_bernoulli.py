@@ -0,0 +1,25 @@
+import numpy as np
+
+from src.discrete.bernoulli import BernDist
+from src.generators.mrg32k3a import MRG32k3a
+
+
+def test_packed_equals_sample():
+    """The packed draws unpack to the ones of sample(), also across chunks,
+    which don't fill whole bytes at the end."""
+
+    X = BernDist(0.3, MRG32k3a(3)).sample(1003)
+    P = BernDist(0.3, MRG32k3a(3)).sample_packed(1003, chunk_size=100)
+    assert P.dtype == np.uint8 and P.shape == (126,)
+    assert np.array_equal(np.unpackbits(P, count=1003), X)
+
+
+def test_compact_dtype():
+    """Integer buffers take the draws of the uniforms unchanged."""
+
+    dist = BernDist(0.3, MRG32k3a(3))
+    assert dist.compact_dtype() == np.int8
+
+    X = BernDist(0.3, MRG32k3a(3)).sample(100)
+    Y = dist.sample(100, dtype=dist.compact_dtype())
+    assert Y.dtype == np.int8 and np.array_equal(X, Y)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from src.discrete.binominal import BinDist
+from src.generators.mrg32k3a import MRG32k3a
+from tests.goodness_of_fit import assert_batch_fits_pmf, assert_fits_pmf
+
+
+def test_inversion():
+    """Small means sample by table inversion, p above one half by symmetry."""
+
+    for n, p in ((1, 0.3), (20, 0.1), (50, 0.95)):
+        dist = BinDist(n, p, MRG32k3a(1))
+        assert_fits_pmf(dist.sample(20000), dist.density)
+
+
+def test_btrs():
+    """Means from 10 on sample by transformed rejection."""
+
+    for n, p in ((40, 0.25), (1000, 0.5), (10 ** 6, 0.9)):
+        dist = BinDist(n, p, MRG32k3a(2))
+        assert_fits_pmf(dist.sample(20000), dist.density)
+
+
+def test_batches():
+    """Array parameters mix the joint sequential search and BTRS."""
+
+    dist = BinDist(np.array([1, 20, 50, 40, 1000]), np.array([[0.3], [0.9]]), MRG32k3a(3))
+    assert_batch_fits_pmf(dist, dist.sample(10000))
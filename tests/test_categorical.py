@@ -0,0 +1,42 @@
+import numpy as np
+
+from src.discrete.categorical import CategoricalDist
+from src.generators.mrg32k3a import MRG32k3a
+from tests.goodness_of_fit import assert_batch_fits_pmf, assert_fits_pmf
+
+
+def probabilities():
+    """Probability vectors with one category, with zeros and with many skewed categories.
+
+    :returns A list of the vectors.
+    """
+
+    skewed = np.random.default_rng(1).dirichlet(np.full(1000, 0.3))
+    return [np.array([1.0]), np.array([0.0, 0.5, 0.0, 0.25, 0.25]), skewed / np.sum(skewed)]
+
+
+def test_alias_table():
+    """The columns of the table hold exactly the mass of p."""
+
+    for p in probabilities():
+        prob, alias = CategoricalDist.alias_table(p)
+        mass = (prob + np.bincount(alias, weights=1 - prob, minlength=len(p))) / len(p)
+        assert np.all((prob >= 0) & (prob <= 1))
+        assert np.allclose(mass, p, rtol=0, atol=1e-12)
+
+
+def test_sample():
+    """The alias lookups give Cat(p)."""
+
+    assert np.all(CategoricalDist([1.0], MRG32k3a(1)).sample(100) == 0)
+    for p in probabilities()[1:]:
+        dist = CategoricalDist(p, MRG32k3a(1))
+        assert_fits_pmf(dist.sample(20000), dist.density)
+
+
+def test_batches():
+    """Rows of probabilities are sampled by one sorted search."""
+
+    p = np.array([[0.0, 0.5, 0.0, 0.25, 0.25], [0.2, 0.2, 0.2, 0.2, 0.2], [0.05, 0.05, 0.1, 0.1, 0.7]])
+    dist = CategoricalDist(p, MRG32k3a(2))
+    assert_batch_fits_pmf(dist, dist.sample(10000))
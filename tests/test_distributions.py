@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from src.continuous.beta import BetaDist
+from src.continuous.cauchy import CauchyDist
+from src.continuous.exponential import ExpDist
+from src.continuous.fisher_snedecor import FDist
+from src.continuous.frechet import FrechetDist
+from src.continuous.gamma import GammaDist
+from src.continuous.gumbel import GumbelDist
+from src.continuous.laplace import LaplaceDist
+from src.continuous.log_normal import LogNormalDist
+from src.continuous.logistic import LogisticDist
+from src.continuous.normal import NormalDist
+from src.continuous.pareto import ParetoDist
+from src.continuous.students import StudentsTDist
+from src.continuous.uniform import UniformDist
+from src.continuous.wald import WaldDist
+from src.continuous.weibull import WeibullDist
+from src.discrete.bernoulli import BernDist
+from src.discrete.binominal import BinDist
+from src.discrete.duniform import DUniformDist
+from src.discrete.geometric import GeometricDist
+from src.discrete.hypergeometric import HyperGeometricDist
+from src.discrete.negativebinominal import NegBinDist
+from src.discrete.poisson import PoissonDist
+from src.generators.mrg32k3a import MRG32k3a
+from tests.goodness_of_fit import assert_fits_cdf, assert_fits_pmf
+
+continuous = [lambda gen: BetaDist(2, 3, gen), lambda gen: CauchyDist(1, 2, gen), lambda gen: ExpDist(3, gen),
+              lambda gen: FDist(5, 9, gen), lambda gen: FrechetDist(5, 1, 3, gen), lambda gen: GammaDist(2.5, 3, gen),
+              lambda gen: GumbelDist(1, 2, gen), lambda gen: LaplaceDist(1, 2, gen), lambda gen: LogNormalDist(0.3, 0.5, gen),
+              lambda gen: LogisticDist(1, 2, gen), lambda gen: NormalDist(1, 4, gen), lambda gen: ParetoDist(5, 3, gen),
+              lambda gen: StudentsTDist(5, 1, 2, gen), lambda gen: UniformDist(1, 3, gen), lambda gen: WaldDist(1, 2, gen),
+              lambda gen: WeibullDist(1.5, 1, 2, gen)]
+
+# the discrete families with the smallest value of their support
+discrete = [(lambda gen: BernDist(0.3, gen), 0), (lambda gen: BinDist(20, 0.3, gen), 0),
+            (lambda gen: DUniformDist(1, 6, gen), 1), (lambda gen: GeometricDist(1, 0.3, gen), 1),
+            (lambda gen: HyperGeometricDist(20, 150, 300, gen), 0), (lambda gen: NegBinDist(10, 0.5, gen), 0),
+            (lambda gen: PoissonDist(4, gen), 0)]
+
+
+@pytest.mark.parametrize('make_dist', continuous)
+def test_continuous_sampler_follows_cdf(make_dist):
+    """The sampler, the cdf and the ppf of each family use the same parameters."""
+
+    dist = make_dist(MRG32k3a(1))
+    assert_fits_cdf(dist.sample(20000), dist.cdf)
+
+    u = np.linspace(0.01, 0.99, 99)
+    assert np.allclose(dist.cdf(dist.ppf(u)), u, rtol=0, atol=1e-8)
+
+
+@pytest.mark.parametrize('make_dist, lo', discrete)
+def test_discrete_sampler_follows_pmf(make_dist, lo):
+    """The sampler, the mass and the cdf of each family use the same parameters."""
+
+    dist = make_dist(MRG32k3a(1))
+    X = dist.sample(20000)
+    assert_fits_pmf(X, dist.density, lo)
+
+    x = np.arange(lo, X.max() + 1)
+    assert np.allclose(np.cumsum(dist.density(x)), dist.cdf(x), rtol=0, atol=1e-10)
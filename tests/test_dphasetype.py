@@ -0,0 +1,36 @@
+import numpy as np
+
+from src.discrete.dphasetype import DPhaseTypeDist
+from src.generators.mrg32k3a import MRG32k3a
+from tests.goodness_of_fit import assert_fits_pmf
+
+alpha = [0.5, 0.25, 0.25]
+A = [[0.5, 0.2, 0.1], [0.1, 0.7, 0.1], [0.0, 0.3, 0.2]]
+
+
+def pmf(x):
+    """The mass alpha A^(x - 1) t of the chain above, with t the exit probabilities.
+
+    :param x An array of values from 1 on.
+    :returns The probabilities.
+    """
+
+    t = 1 - np.sum(A, axis=1)
+    return np.array([np.asarray(alpha) @ np.linalg.matrix_power(A, int(k) - 1) @ t for k in x])
+
+
+def test_chains():
+    """The jointly moved chains are absorbed after DPH(alpha, A) steps."""
+
+    dist = DPhaseTypeDist(alpha, A, MRG32k3a(1))
+    assert_fits_pmf(dist.sample(20000), dist.density, lo=1)
+
+
+def test_cdf():
+    """The cdf sums the mass up, with the limits 0 and 1 at the infinities."""
+
+    dist = DPhaseTypeDist(alpha, A)
+    x = np.array([-np.inf, 0, 1, 2, 7, 40, np.inf])
+    F = np.concatenate([[0, 0], np.cumsum(pmf(np.arange(1, 41)))[[0, 1, 6, 39]], [1]])
+    assert np.allclose(dist.cdf(x), F)
+    assert np.isnan(dist.cdf(np.nan))
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from src.continuous.cauchy import CauchyDist
+from src.continuous.exponential import ExpDist
+from src.continuous.normal import NormalDist
+from src.continuous.pareto import ParetoDist
+from src.discrete.hypergeometric import HyperGeometricDist
+from src.discrete.poisson import PoissonDist
+from src.generators.mrg32k3a import MRG32k3a
+from src.sampling.estimators import mc_estimate
+
+
+def test_plain_estimate():
+    """Without variance reduction the factor is one and the standard error the
+    one of the sample mean."""
+
+    estimate, se, factor = mc_estimate(ExpDist(2, MRG32k3a(1)), lambda x: x, 10000)
+    assert abs(estimate - 0.5) < 4 * se
+    assert abs(se - 0.5 / 100) < 5e-4
+    assert np.isclose(factor, 1)
+
+
+@pytest.mark.parametrize('dist', [ExpDist(1, MRG32k3a(2)),
+                                  NormalDist(1, 4, MRG32k3a(2)),
+                                  HyperGeometricDist(np.array([10, 20]), 150, 300, MRG32k3a(2))])
+def test_antithetic_reduces_variance(dist):
+    """The pairs of a monotone integrand are negatively correlated, also for
+    batches through the vectorized quantile function."""
+
+    f = lambda x: x ** 3
+    estimate, se, factor = mc_estimate(dist, f, 5000, antithetic=True)
+    assert np.all(factor > 1)
+    assert np.all(np.isfinite(se))
+
+
+def test_control_removes_linear_part():
+    """If f(X) = X, the control variate cancels all of the variance and the
+    estimate is the exact expectation."""
+
+    dist = NormalDist(np.array([2, -1]), 3, MRG32k3a(4))
+    for antithetic in (False, True):
+        estimate, se, factor = mc_estimate(dist, lambda x: x, 1000, antithetic, control=True)
+        assert np.allclose(estimate, [2, -1])
+        assert np.all(se < 1e-10)
+
+
+def test_control_reduces_variance():
+    """A smooth integrand is mostly linear in X."""
+
+    estimate, se, factor = mc_estimate(ExpDist(1, MRG32k3a(5)), np.sqrt, 10000, control=True)
+    assert factor > 2
+    assert abs(estimate - np.sqrt(np.pi) / 2) < 4 * se
+
+
+def test_guards():
+    """Antithetic batches need a vectorized ppf, the control variate a finite
+    expectation."""
+
+    with pytest.raises(ValueError):
+        mc_estimate(PoissonDist(np.array([1, 2]), MRG32k3a(6)), lambda x: x, 100, antithetic=True)
+    with pytest.raises(ValueError):
+        mc_estimate(CauchyDist(0, 1, MRG32k3a(6)), np.tanh, 100, control=True)
+    with np.errstate(divide='ignore'), pytest.raises(ValueError):
+        mc_estimate(ParetoDist(np.array([1.0, 3.0]), 1, MRG32k3a(6)), np.log, 100, control=True)
@@ -0,0 +1,59 @@
+import numpy as np
+import os
+import pytest
+
+from src.continuous.exponential import ExpDist
+from src.continuous.normal import NormalDist
+from src.generators.mrg32k3a import MRG32k3a
+from src.generators.qmc import SobolSequence
+from src.sampling.export import export_samples
+
+
+def interrupt_after(dist, num_chunks):
+    """Lets the sampler of dist fail after a number of chunks, like a killed export.
+
+    :param dist The distribution, whose sample() is replaced.
+    :param num_chunks How many chunks succeed.
+    """
+
+    sample = dist.sample
+    calls = []
+
+    def failing(num_samples, out = None, dtype = None):
+        calls.append(num_samples)
+        if len(calls) > num_chunks:
+            raise KeyboardInterrupt
+
+        return sample(num_samples, out, dtype)
+
+    dist.sample = failing
+
+
+@pytest.mark.parametrize('make_dist', [lambda: NormalDist(0, 1, MRG32k3a(5)),
+                                       lambda: ExpDist(2, SobolSequence(seed=5))])
+def test_resumed_export_equals_uninterrupted(tmp_path, make_dist):
+    """An export, which continues after an interruption, writes the same file.
+    The resumed export starts from another position, so only the saved
+    generator states can reproduce the rest."""
+
+    full = export_samples(make_dist(), str(tmp_path / 'full.npy'), 10003, chunk_size=1000)
+
+    path = str(tmp_path / 'resumed.npy')
+    dist = make_dist()
+    interrupt_after(dist, 4)
+    with pytest.raises(KeyboardInterrupt):
+        export_samples(dist, path, 10003, chunk_size=1000)
+    assert os.path.exists(path + '.progress')
+
+    dist = make_dist()
+    dist.gen.random(7)
+    resumed = export_samples(dist, path, 10003, chunk_size=1000)
+    assert np.array_equal(resumed, full)
+    assert not os.path.exists(path + '.progress')
+
+
+def test_export_dtype(tmp_path):
+    """The file holds the requested type."""
+
+    X = export_samples(NormalDist(0, 1, MRG32k3a(5)), str(tmp_path / 'x.npy'), 100, chunk_size=30, dtype=np.float32)
+    assert X.dtype == np.float32 and X.shape == (100,)
@@ -0,0 +1,15 @@
+import numpy as np
+
+from src.discrete.geometric import GeometricDist
+from src.generators.mrg32k3a import MRG32k3a
+from tests.goodness_of_fit import assert_fits_pmf
+
+
+def test_sample():
+    """The closed form inversion gives Geom(p) on {1, 2, ...}."""
+
+    for p in (0.02, 0.5, 0.9):
+        dist = GeometricDist(1, p, MRG32k3a(1))
+        assert_fits_pmf(dist.sample(20000), dist.density, lo=1)
+
+    assert np.all(GeometricDist(1, 1).sample(10) == 1)
@@ -0,0 +1,40 @@
+import numpy as np
+
+from src.discrete.hypergeometric import HyperGeometricDist
+from src.generators.mrg32k3a import MRG32k3a
+from tests.goodness_of_fit import assert_batch_fits_pmf, assert_fits_pmf
+
+
+def test_inversion():
+    """Small supports sample by table inversion."""
+
+    for n, r, N in ((20, 150, 300), (5, 3, 10), (900, 100, 1000)):
+        dist = HyperGeometricDist(n, r, N, MRG32k3a(1))
+        assert_fits_pmf(dist.sample(20000), dist.density, dist.lb)
+
+
+def test_hrua():
+    """Big supports sample by ratio of uniforms, in all cases of the symmetries."""
+
+    for n, r, N in ((3 * 10 ** 5, 4 * 10 ** 5, 10 ** 6), (7 * 10 ** 5, 6 * 10 ** 5, 10 ** 6)):
+        dist = HyperGeometricDist(n, r, N, MRG32k3a(2))
+        assert_fits_pmf(dist.sample(20000), dist.density, dist.lb)
+
+
+def test_batches():
+    """Array parameters sample by HRUA with the parameters of each slot, the
+    cdf and the ppf use one table per slot."""
+
+    dist = HyperGeometricDist(np.array([20, 3 * 10 ** 5]), np.array([[150], [6 * 10 ** 5]]), 10 ** 6, MRG32k3a(3))
+    assert_batch_fits_pmf(dist, dist.sample(10000))
+
+    dist = HyperGeometricDist(np.array([20, 40]), np.array([[150], [60]]), 300)
+    x = np.arange(0, 41)[:, None, None]
+    for idx in np.ndindex(dist.batch_shape):
+        scalar = HyperGeometricDist(*(int(np.broadcast_to(p, dist.batch_shape)[idx]) for p in (dist.n, dist.r, dist.N)))
+        assert np.allclose(dist.cdf(x)[(Ellipsis,) + idx], scalar.cdf(x[:, 0, 0]), rtol=0, atol=1e-12)
+
+    u = np.array([0.01, 0.3, 0.5, 0.99])[:, None, None]
+    X = dist.ppf(u)
+    assert np.all(dist.cdf(X) >= u) and np.all(dist.cdf(X - 1) < u)
+    assert np.array_equal(dist.ppf(1), dist.ub)
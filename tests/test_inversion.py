@@ -0,0 +1,35 @@
+import numpy as np
+
+from src.discrete.binominal import BinDist
+from src.discrete.hypergeometric import HyperGeometricDist
+from src.discrete.poisson import PoissonDist
+from src.generators.mrg32k3a import MRG32k3a
+from src.sampling.inversion import GuideTable
+from tests.goodness_of_fit import assert_fits_pmf
+
+
+def test_guide_table():
+    """The guided search inverts the cdf, also across values without mass."""
+
+    p = np.array([0.1, 0.0, 0.0, 0.45, 0.05, 0.3, 0.0, 0.1])
+    table = GuideTable(np.cumsum(p), offset=2)
+    X = table.sample(MRG32k3a(1), 20000)
+    assert_fits_pmf(X, lambda x: p[x.astype(np.intp) - 2], lo=2)
+
+
+def test_distributions():
+    """Poisson, binomial and hypergeometric tables give their distributions."""
+
+    for dist in (PoissonDist(4.5, MRG32k3a(2)), BinDist(30, 0.2, MRG32k3a(3)), HyperGeometricDist(40, 150, 300, MRG32k3a(4))):
+        assert_fits_pmf(dist.sample(20000), dist.density)
+
+
+def test_tables_are_shared():
+    """Instances with the same parameters reuse the cached table, also for 0-d
+    array parameters."""
+
+    dist = PoissonDist(np.array(4.5))
+    dist.sample(10)
+    other = PoissonDist(4.5)
+    other.sample(10)
+    assert dist.table is other.table
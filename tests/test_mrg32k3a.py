@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from src.generators.mrg32k3a import MRG32k3a, block_size, num_streams, period, period_x, period_y, stream_length
+
+
+def scalar_stream(gen, num_samples):
+    """Draws numbers one by one with the plain recurrence.
+
+    :param gen The generator, which is advanced.
+    :param num_samples How many numbers should be drawn.
+    :returns The numbers as a list.
+    """
+
+    return [gen.next_scalar() for _ in range(num_samples)]
+
+
+def test_block_engine_matches_scalar_recurrence():
+    """The block engine yields exactly the numbers of the scalar recurrence, for
+    requests within a block, across block borders and below the python cutoff."""
+
+    gen = MRG32k3a(12345)
+    ref = gen.copy()
+    for num_samples in (1, 7, 8, block_size - 1, block_size, block_size + 1, 3 * block_size + 5):
+        assert gen.random(num_samples).tolist() == scalar_stream(ref, num_samples)
+        assert (gen.X, gen.Y) == (ref.X, ref.Y)
+
+
+def test_block_engine_fills_out():
+    """A passed buffer receives the same numbers as a new array."""
+
+    gen = MRG32k3a(7)
+    ref = gen.copy()
+    out = np.empty(2 * block_size + 3)
+    assert gen.random(len(out), out=out) is out
+    assert out.tolist() == scalar_stream(ref, len(out))
+
+
+def test_advance_skips_numbers():
+    """advance(n) lands where drawing n numbers lands."""
+
+    gen = MRG32k3a(99)
+    ref = gen.copy()
+    gen.advance(5000)
+    ref.random(5000)
+    assert (gen.X, gen.Y) == (ref.X, ref.Y)
+
+
+def test_period():
+    """Both recurrences return to their state after their periods, which are
+    coprime, and the second one only after its first two steps."""
+
+    gen = MRG32k3a(5)
+    gen.advance(2)
+    start = (gen.X, gen.Y)
+
+    for n, same in ((period, (True, True)), (period_x, (True, False)), (period_y, (False, True))):
+        jumped = gen.copy()
+        jumped.advance(n)
+        assert (jumped.X == start[0], jumped.Y == start[1]) == same
+
+
+def test_streams_are_disjoint():
+    """The streams below num_streams start at distinct states, each one follows
+    the previous one and the next index is rejected, because it would wrap."""
+
+    gen = MRG32k3a(5)
+    starts = {}
+    for k in (0, 1, 2, num_streams - 2, num_streams - 1):
+        stream = gen.stream(k)
+        starts[k] = (tuple(stream.X), tuple(stream.Y))
+
+    assert len(set(starts.values())) == len(starts)
+    for k in (1, 2, num_streams - 1):
+        stream = gen.stream(k - 1)
+        stream.advance(stream_length)
+        assert (tuple(stream.X), tuple(stream.Y)) == starts[k]
+
+    with pytest.raises(ValueError):
+        gen.stream(num_streams)
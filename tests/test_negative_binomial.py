@@ -0,0 +1,31 @@
+import numpy as np
+
+from src.discrete.negativebinominal import NegBinDist
+from src.discrete.poisson import PoissonDist
+from src.generators.mrg32k3a import MRG32k3a
+from tests.goodness_of_fit import assert_batch_fits_pmf, assert_fits_pmf
+
+
+def test_mixture():
+    """The gamma mixture of Poisson ones gives NegBin(r, p), with the rates
+    below and above the PTRS cutoff."""
+
+    for r, p in ((0.5, 0.3), (10, 0.5), (200, 0.2)):
+        dist = NegBinDist(r, p, MRG32k3a(1))
+        assert_fits_pmf(dist.sample(20000), dist.density)
+
+
+def test_sample_rates():
+    """Each element follows the Poisson distribution of its own rate."""
+
+    rates = np.tile([0.5, 8, 30], 10000)
+    X = PoissonDist(gen=MRG32k3a(2)).sample_rates(rates)
+    for rate in (0.5, 8, 30):
+        assert_fits_pmf(X[rates == rate], PoissonDist(rate).density)
+
+
+def test_batches():
+    """Array parameters mix gamma batches with Poisson rates of each slot."""
+
+    dist = NegBinDist(np.array([0.5, 10, 200]), np.array([[0.3], [0.5]]), MRG32k3a(3))
+    assert_batch_fits_pmf(dist, dist.sample(10000))
@@ -0,0 +1,48 @@
+import copy
+import numpy as np
+
+from src.continuous.exponential import ExpDist
+from src.generators.qmc import SobolSequence
+from src.sampling import parallel
+from src.sampling.parallel import parallel_sample
+
+
+def test_parallel_sample_independent_of_workers():
+    """The result only depends on the generator state and the chunk size."""
+
+    dist = ExpDist(2)
+    results = [parallel_sample(copy.deepcopy(dist), 1000, workers, chunk_size=128) for workers in (1, 2, 3)]
+
+    assert results[0].shape == (1000,)
+    for X in results[1:]:
+        assert np.array_equal(X, results[0])
+
+
+def test_parallel_sample_moves_generator_on():
+    """Further draws don't repeat the chunks."""
+
+    dist = ExpDist(2)
+    X = parallel_sample(dist, 300, 1, chunk_size=100)
+    Y = parallel_sample(dist, 300, 1, chunk_size=100)
+    assert not np.any(np.isin(Y, X))
+
+
+def test_parallel_sample_in_process():
+    """Sampling in process leaves no copy of the distribution behind, and an
+    empty request gives an empty result."""
+
+    assert parallel_sample(ExpDist(2), 10, 1, chunk_size=4).shape == (10,)
+    assert parallel.worker_dist is None
+    assert parallel_sample(ExpDist(2), 0).shape == (0,)
+    assert parallel_sample(ExpDist(np.array([1, 2])), 0).shape == (0, 2)
+
+
+def test_parallel_sample_qmc_matches_serial():
+    """A sequence continues at the first point of each chunk, so an inversion
+    sampler gives the serial points for any number of workers."""
+
+    serial = ExpDist(2, SobolSequence(seed=1)).sample(1000)
+    for workers in (1, 3):
+        dist = ExpDist(2, SobolSequence(seed=1))
+        assert np.array_equal(parallel_sample(dist, 1000, workers, chunk_size=128), serial)
+        assert dist.gen.index == 1000
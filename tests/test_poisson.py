@@ -0,0 +1,28 @@
+import numpy as np
+
+from src.discrete.poisson import PoissonDist
+from src.generators.mrg32k3a import MRG32k3a
+from tests.goodness_of_fit import assert_batch_fits_pmf, assert_fits_pmf
+
+
+def test_inversion():
+    """Small rates sample by table inversion."""
+
+    for rate in (0.2, 3, 9.5):
+        dist = PoissonDist(rate, MRG32k3a(1))
+        assert_fits_pmf(dist.sample(20000), dist.density)
+
+
+def test_ptrs():
+    """Rates from 10 on sample by transformed rejection."""
+
+    for rate in (10, 57.3, 1e4):
+        dist = PoissonDist(rate, MRG32k3a(2))
+        assert_fits_pmf(dist.sample(20000), dist.density)
+
+
+def test_batches():
+    """Array rates mix the joint sequential search and PTRS."""
+
+    dist = PoissonDist(np.array([0.2, 3, 9.5, 10, 57.3, 1e4]), MRG32k3a(3))
+    assert_batch_fits_pmf(dist, dist.sample(10000))
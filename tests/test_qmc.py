@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from src.continuous.exponential import ExpDist
+from src.generators.mrg32k3a import MRG32k3a
+from src.generators.qmc import HaltonSequence, SobolSequence, rqmc_mean, sobol_table
+
+# the first points of the three dimensional sobol sequence of Joe and Kuo, after
+# the origin, in their gray code order
+joe_kuo = [
+    [0.5, 0.5, 0.5],
+    [0.75, 0.25, 0.25],
+    [0.25, 0.75, 0.75],
+    [0.375, 0.375, 0.625],
+    [0.875, 0.875, 0.125],
+    [0.625, 0.125, 0.875],
+    [0.125, 0.625, 0.375],
+    [0.1875, 0.3125, 0.9375],
+    [0.6875, 0.8125, 0.4375],
+]
+
+
+def test_sobol_matches_joe_kuo():
+    """The unscrambled points are the centers of the cells of the reference
+    points. The sequence runs in the natural order of the index, the reference
+    in the gray code order."""
+
+    gen = SobolSequence(3, scramble=False)
+    index = np.arange(1, len(joe_kuo) + 1)
+    X = gen.points(index ^ (index >> 1))
+    assert np.array_equal(np.floor(X * 2 ** 32) / 2 ** 32, joe_kuo)
+
+
+@pytest.mark.parametrize('make_gen', [SobolSequence, HaltonSequence])
+def test_points_in_unit_interval(make_gen):
+    """The scrambled coordinates lie in (0, 1)."""
+
+    X = make_gen(5, seed=1).random(5 * 2 ** 14)
+    assert np.all(X > 0) and np.all(X < 1)
+
+
+@pytest.mark.parametrize('m', [4, 8, 11])
+def test_sobol_stratifies(m):
+    """The first 2^m scrambled points of the first two coordinates form a
+    (0, m, 2)-net, every dyadic box of volume 2^-m holds exactly one point."""
+
+    X = SobolSequence(2, seed=3).random(2 * 2 ** m).reshape(-1, 2)
+    for k in range(m + 1):
+        boxes = np.floor(X[:, 0] * 2 ** k) * 2 ** (m - k) + np.floor(X[:, 1] * 2 ** (m - k))
+        assert np.array_equal(np.sort(boxes), np.arange(2 ** m))
+
+
+def test_halton_stratifies():
+    """The first b^k scrambled points hold one point in each interval of length
+    b^-k of the coordinate with base b."""
+
+    X = HaltonSequence(3, seed=3).random(3 * 5 ** 4).reshape(-1, 3)
+    for j, b in enumerate((2, 3, 5)):
+        k = int(np.log(5 ** 4) / np.log(b))
+        cells = np.floor(X[:b ** k, j] * b ** k)
+        assert np.array_equal(np.sort(cells), np.arange(b ** k))
+
+
+@pytest.mark.parametrize('make_gen', [SobolSequence, HaltonSequence])
+def test_seed_reproduces(make_gen):
+    """The same seed gives the same randomization, another seed another one,
+    and so do the spawned sequences."""
+
+    X = make_gen(3, seed=11).random(300)
+    assert np.array_equal(make_gen(3, seed=11).random(300), X)
+    assert not np.array_equal(make_gen(3, seed=12).random(300), X)
+
+    spawned = [gen.random(300) for gen in make_gen(3, seed=11).spawn(2)]
+    assert np.array_equal(spawned[0], make_gen(3, seed=11).spawn(1)[0].random(300))
+    assert not np.array_equal(spawned[0], spawned[1])
+
+
+def test_sobol_dimension_limit():
+    """The table holds the direction numbers of 21 coordinates."""
+
+    assert SobolSequence(len(sobol_table) + 1).dim == 21
+    with pytest.raises(ValueError):
+        SobolSequence(len(sobol_table) + 2)
+
+
+def test_rqmc_beats_monte_carlo():
+    """For a smooth integrand the replicates of randomized quasi monte carlo
+    estimate E[sin(X)] = 1/2, X ~ Exp(1), far more precisely than plain monte
+    carlo with the same number of draws."""
+
+    f = np.sin
+    gens = SobolSequence(seed=5).spawn(16)
+    mean, se = rqmc_mean(lambda gen: ExpDist(1, gen), 2 ** 12, gens, f)
+
+    Y = f(ExpDist(1, MRG32k3a(5)).sample(16 * 2 ** 12))
+    se_mc = np.std(Y, ddof=1) / np.sqrt(len(Y))
+
+    assert abs(mean - 0.5) < 5 * se
+    assert se < se_mc / 10
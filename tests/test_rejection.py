@@ -0,0 +1,57 @@
+import numpy as np
+
+from src.continuous.gamma import GammaDist
+from src.continuous.normal import NormalDist
+from src.continuous.students import StudentsTDist
+from src.generators.mrg32k3a import MRG32k3a
+from src.sampling.rejection import rejection_sample
+from tests.goodness_of_fit import assert_batch_fits_cdf, assert_fits_cdf
+
+
+def test_rejection_sample_fills_request():
+    """The engine returns exactly the requested number of accepted candidates,
+    even if the expected rate is far too optimistic."""
+
+    gen = MRG32k3a(1)
+
+    def propose(num_candidates):
+        U = gen.random(num_candidates)
+        return U, U < 0.01
+
+    X = rejection_sample(propose, 1000, 1)
+    assert X.shape == (1000,) and X.max() < 0.01
+
+
+def test_normal():
+    """The exponential proposal gives N(mean, var)."""
+
+    dist = NormalDist(1, 4, MRG32k3a(1), 'rejection')
+    assert_fits_cdf(dist.sample(20000), dist.cdf)
+
+
+def test_gamma():
+    """Marsaglia-Tsang for shapes of at least one and Best below one."""
+
+    for shape in (0.3, 1, 4.5):
+        dist = GammaDist(shape, 2, MRG32k3a(2))
+        assert_fits_cdf(dist.sample(20000), dist.cdf)
+
+
+def test_students_t():
+    """The polar proposal gives t(v, loc, scale)."""
+
+    for v in (1, 3.5, 30):
+        dist = StudentsTDist(v, 1, 2, MRG32k3a(3))
+        assert_fits_cdf(dist.sample(20000), dist.cdf)
+
+
+def test_batches():
+    """Array parameters run through rejection_sample_slots, with their own
+    parameters for each candidate."""
+
+    dists = [NormalDist(np.array([0, 1]), np.array([1, 4]), MRG32k3a(4), 'rejection'),
+             GammaDist(np.array([[0.3], [1], [4.5]]), np.array([1, 2]), MRG32k3a(5)),
+             StudentsTDist(np.array([1, 3.5, 30]), 1, np.array([[1], [2]]), MRG32k3a(6))]
+
+    for dist in dists:
+        assert_batch_fits_cdf(dist, dist.sample(10000))
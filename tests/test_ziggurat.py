@@ -0,0 +1,38 @@
+import numpy as np
+
+from src.continuous.exponential import ExpDist
+from src.continuous.normal import NormalDist
+from src.continuous.ziggurat import exp_tail, exp_ziggurat, normal_tail, normal_ziggurat
+from src.generators.mrg32k3a import MRG32k3a
+from tests.goodness_of_fit import assert_batch_fits_cdf, assert_fits_cdf
+
+
+def test_normal():
+    """The layers, wedges and tails together give N(mean, var)."""
+
+    dist = NormalDist(1, 4, MRG32k3a(1), 'ziggurat')
+    assert_fits_cdf(dist.sample(50000), dist.cdf)
+
+
+def test_exponential():
+    """The layers, wedges and the tail together give Exp(rate)."""
+
+    dist = ExpDist(2, MRG32k3a(2), 'ziggurat')
+    assert_fits_cdf(dist.sample(50000), dist.cdf)
+
+
+def test_tails():
+    """The tails are rarely hit, so they are checked on their own against the
+    distributions conditioned on exceeding r."""
+
+    for dist, zig, tail in ((NormalDist(), normal_ziggurat(), normal_tail), (ExpDist(), exp_ziggurat(), exp_tail)):
+        X = tail(MRG32k3a(3), 20000)
+        assert_fits_cdf(X, lambda x: (dist.cdf(x) - dist.cdf(zig.r)) / (1 - dist.cdf(zig.r)))
+
+
+def test_batches():
+    """Array parameters transform one standard draw per element."""
+
+    for dist in (NormalDist(np.array([0, 1]), np.array([[1], [4]]), MRG32k3a(5), 'ziggurat'),
+                 ExpDist(np.array([0.5, 2]), MRG32k3a(6), 'ziggurat')):
+        assert_batch_fits_cdf(dist, dist.sample(10000))